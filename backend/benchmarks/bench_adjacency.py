@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Adjacency Index Micro-Benchmark
+===============================
+
+Compares the old linear edge scan against the adjacency index built by
+CareerData for a course -> careers lookup, as the edge count grows from
+today's graph (~207 edges) to 100k synthetic edges.
+
+Usage:
+    python benchmarks/bench_adjacency.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data_loader import CareerData  # noqa: E402
+
+EDGE_COUNTS = [207, 1_000, 10_000, 100_000]
+
+
+def linear_course_to_careers(loader: CareerData, course_id: str):
+    """The pre-index implementation: one pass over every edge per call."""
+    result = []
+    for e in loader.edges:
+        if e.get('from') == course_id and e.get('type') == 'course_to_career':
+            node = loader.nodes.get(e.get('to'))
+            if node:
+                result.append(node)
+    return result
+
+
+def grow_edges(loader: CareerData, target: int):
+    """Pad the real edge list with synthetic course -> career edges."""
+    edges = list(loader.edges)
+    i = 0
+    while len(edges) < target:
+        course_id = f'course:synthetic_{i // 8}'
+        edges.append({'id': f'bench{i}', 'from': course_id, 'to': f'career:synthetic_{i}', 'type': 'course_to_career'})
+        i += 1
+    loader.edges = edges[:target]
+    loader._index_edges()
+
+
+def time_per_call(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    loader = CareerData()
+    course_id = 'course:engineering_btech'
+    print(f"{'edges':>8} | {'linear scan (us)':>17} | {'index (us)':>10} | {'speedup':>8}")
+    print('-' * 54)
+    for count in EDGE_COUNTS:
+        grow_edges(loader, count)
+        number = max(10, 200_000 // count)
+        assert linear_course_to_careers(loader, course_id) == loader.course_to_careers(course_id)
+        linear = time_per_call(lambda: linear_course_to_careers(loader, course_id), number)
+        indexed = time_per_call(lambda: loader.course_to_careers(course_id), 20_000)
+        print(f'{count:>8} | {linear:>17.2f} | {indexed:>10.3f} | {linear / indexed:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
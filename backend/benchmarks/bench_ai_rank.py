@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+/ai/rank Heuristic Benchmark
+============================
+
+Time to score and rank a candidate list with the nested-loop heuristic
+/ai/rank used before (candidate x skill x interest substring checks) versus
+ranking.heuristic_rank, which matches each distinct name or skill term
+against the interests once and sums the matches with array operations.
+Both must return identical rankings.
+
+Candidates look like the real ones: a career name from a pool of names and
+3-8 skills from a pool of skill tags; the profile has 8 interests.
+
+Usage:
+    python benchmarks/bench_ai_rank.py [--candidates 10 1000 100000] [--interests 8]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ranking import heuristic_rank  # noqa: E402
+
+WORDS = ['software', 'data', 'civil', 'mechanical', 'medical', 'legal', 'design', 'finance', 'research',
+         'teaching', 'marketing', 'electrical', 'aerospace', 'nursing', 'banking', 'media']
+
+
+def loop_rank(user, candidates):
+    """The heuristic as /ai/rank ran it before ranking.py."""
+    interests = set((user.get('interests') or []))
+    seen = {}
+    for c in candidates:
+        seen.setdefault(c['career_id'], c)
+    ranked = []
+    for c in seen.values():
+        score = 0
+        name = (c.get('career_name') or '').lower()
+        for it in interests:
+            if it.lower() in name:
+                score += 3
+        for s in c.get('skills', []):
+            for it in interests:
+                if it.lower() in s.lower():
+                    score += 2
+        if score > 0:
+            ranked.append({'career_id': c['career_id'], 'career_name': c['career_name'], 'score': score,
+                           'reason': f"Matches your interests in {', '.join(interests)}"})
+    if not ranked:
+        for c in list(seen.values())[:5]:
+            ranked.append({'career_id': c['career_id'], 'career_name': c['career_name'], 'score': 0,
+                           'reason': "General career path available to you"})
+    ranked.sort(key=lambda x: -x['score'])
+    return {'ranked': ranked[:15]}
+
+
+def synthetic_candidates(n: int, rng: random.Random):
+    names = [f'{rng.choice(WORDS).title()} {rng.choice(["Engineer", "Analyst", "Scientist", "Officer"])} {i}'
+             for i in range(max(10, n // 4))]
+    skills = [f'skill:{rng.choice(WORDS)}_{i}' for i in range(2000)]
+    return [{'career_id': f'career:synthetic_{i}', 'career_name': rng.choice(names),
+             'skills': rng.sample(skills, rng.randint(3, 8))} for i in range(n)]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candidates', type=int, nargs='+', default=[10, 1_000, 100_000])
+    parser.add_argument('--interests', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    user = {'interests': rng.sample(WORDS, args.interests)}
+    print(f"{'candidates':>10} | {'loops (ms)':>10} | {'vectorised (ms)':>15} | {'speedup':>7}")
+    print('-' * 52)
+    for n in args.candidates:
+        candidates = synthetic_candidates(n, rng)
+        repeat = 3 if n > 10_000 else 20
+        loop_ms, expected = timed(lambda: loop_rank(user, candidates), repeat)
+        fast_ms, got = timed(lambda: heuristic_rank(user, candidates), repeat)
+        assert got == expected
+        print(f'{n:>10} | {loop_ms:>10.2f} | {fast_ms:>15.2f} | {loop_ms / fast_ms:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+/ai/rank/batch Benchmark
+========================
+
+Time to rank one shared candidate set for a whole class of profiles: calling
+ranking.heuristic_rank once per profile (what a client looping over /ai/rank
+costs the server) versus ranking.rank_batch, which scores profiles x
+candidates in one pass per chunk, in-process and over a process pool. All must
+return identical rankings. Also reports the peak memory of streaming the batch
+(tracemalloc, in-process), which stays flat as the class grows.
+
+Profiles have 3-8 interests from the same tag pool as the candidates.
+
+Usage:
+    python benchmarks/bench_ai_rank_batch.py [--profiles 100 1000 5000] [--candidates 1000] [--workers 4]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ranking import batch_pool, heuristic_rank, rank_batch  # noqa: E402
+from bench_ai_rank import WORDS, synthetic_candidates  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def streamed_peak(profiles, candidates) -> float:
+    """Peak MiB allocated while consuming rank_batch line by line."""
+    tracemalloc.start()
+    for _ in rank_batch(profiles, candidates):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profiles', type=int, nargs='+', default=[100, 1_000, 5_000])
+    parser.add_argument('--candidates', type=int, default=1_000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    candidates = synthetic_candidates(args.candidates, rng)
+    print(f'{args.candidates} candidates, {os.cpu_count()} CPU(s)')
+    print(f"{'profiles':>8} | {'per profile (ms)':>16} | {'batch (ms)':>10} | "
+          f"{f'batch x{args.workers} procs (ms)':>22} | {'speedup':>7} | {'stream peak (MiB)':>17}")
+    print('-' * 96)
+    # one pool for every run, as the server keeps one; its workers are spawned before the first timing
+    pool = batch_pool(args.workers)
+    list(rank_batch([{'interests': []}], candidates, pool))
+    for n in args.profiles:
+        profiles = [{'interests': rng.sample(WORDS, rng.randint(3, 8))} for _ in range(n)]
+        single_ms, expected = timed(lambda: [heuristic_rank(p, candidates) for p in profiles])
+        batch_ms, got = timed(lambda: list(rank_batch(profiles, candidates)))
+        assert got == expected
+        pool_ms, got = timed(lambda: list(rank_batch(profiles, candidates, pool)))
+        assert got == expected
+        print(f'{n:>8} | {single_ms:>16.1f} | {batch_ms:>10.1f} | {pool_ms:>22.1f} | '
+              f'{single_ms / batch_ms:>6.1f}x | {streamed_peak(profiles, candidates):>17.1f}')
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Career Similarity Benchmark
+===========================
+
+Builds the similarity index for a synthetic dataset (10k careers by
+default) and reports the one-off build time, the size of the precomputed
+top-k arrays and the per-request lookup cost of /career/{id}/similar. For
+comparison it times a pure-Python scan that scores one career against
+every other career on demand.
+
+Usage:
+    python benchmarks/bench_career_similarity.py [--careers 10000] [--top-k 10]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def scan_similar(index, career_id, k):
+    """Score one career against all others in Python (cosine), as an on-demand endpoint would."""
+    from career_similarity import FEATURE_WEIGHTS
+
+    own = set(index.features[index.position[career_id]])
+    own_norm = sum(FEATURE_WEIGHTS[g] ** 2 for g, _ in own) ** 0.5
+    scores = []
+    for other_id, features in zip(index.career_ids, index.features):
+        if other_id == career_id or not features:
+            continue
+        dot = sum(FEATURE_WEIGHTS[g] ** 2 for g, v in features if (g, v) in own)
+        if dot:
+            norm = sum(FEATURE_WEIGHTS[g] ** 2 for g, _ in features) ** 0.5
+            scores.append((dot / (own_norm * norm), other_id))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--careers', type=int, default=10_000)
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+
+    from data_loader import CareerData
+    from career_similarity import SimilarityIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # synthetic_data writes ~60% of its nodes as careers
+        base = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.careers * 5 // 3)
+        loader = CareerData(base)
+        start = time.perf_counter()
+        index = SimilarityIndex(loader, top_k=args.top_k)
+        build = time.perf_counter() - start
+
+    n = len(index.career_ids)
+    arrays = sum(a.nbytes for ids, scores in index.top.values() for a in (ids, scores))
+    rng = random.Random(7)
+    sample = [rng.choice(index.career_ids) for _ in range(200)]
+    lookup = timeit.timeit(lambda: [index.similar(c, limit=5) for c in sample], number=5) / (5 * len(sample))
+    scan = timeit.timeit(lambda: [scan_similar(index, c, 5) for c in sample[:20]], number=1) / 20
+
+    print(f'{n} careers, top {args.top_k} per career and metric')
+    print(f'index build:            {build:8.2f} s')
+    print(f'top-k arrays:           {arrays / 1024 / 1024:8.2f} MB')
+    print(f'indexed lookup:         {lookup * 1e6:8.1f} us/request')
+    print(f'on-demand Python scan:  {scan * 1e6:8.1f} us/request')
+
+
+if __name__ == '__main__':
+    main()
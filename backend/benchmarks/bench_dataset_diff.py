@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Dataset Diff Benchmark
+======================
+
+Cost of diffing two loads of a synthetic dataset where a few careers were
+edited, against a full deep compare of every node and edge. Hashing happens
+once per load (and is reused by every later diff against that load); the
+diff itself only compares the changed items field by field.
+
+Usage:
+    python benchmarks/bench_dataset_diff.py [--nodes 10000 100000] [--changed 0 10 1000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def edit_careers(base: str, count: int) -> None:
+    for i in range(count):
+        path = os.path.join(base, 'careers', f'synthetic_{i}.json')
+        with open(path, encoding='utf-8') as f:
+            node = json.load(f)
+        node['display_name'] += ' (edited)'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(node, f)
+
+
+def deep_compare(old, new):
+    nodes = {n for n in set(old.nodes) | set(new.nodes) if old.nodes.get(n) != new.nodes.get(n)}
+    edges = [a for a, b in zip(old.edges, new.edges) if a != b]
+    return nodes, edges
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--changed', type=int, nargs='+', default=[0, 10, 1000])
+    args = parser.parse_args()
+
+    from data_loader import CareerData
+    from dataset_diff import diff_datasets
+
+    print(f"{'nodes':>7} | {'changed':>7} | {'hash load (ms)':>14} | {'diff (ms)':>9} | {'deep compare (ms)':>17}")
+    print('-' * 68)
+    for n in args.nodes:
+        for changed in args.changed:
+            with tempfile.TemporaryDirectory() as tmp:
+                base = os.path.join(tmp, 'career-data')
+                write_synthetic_dataset(base, n, seed=7)
+                old = CareerData(base, data_version=None)
+                old.content_hashes
+                edit_careers(base, changed)
+                new = CareerData(base, data_version=None)
+                hash_ms, _ = timed(lambda: new.content_hashes)
+                diff_ms, changes = timed(lambda: diff_datasets(old, new))
+                deep_ms, (nodes, _) = timed(lambda: deep_compare(old, new))
+                assert len(changes['nodes']['changed']) == len(nodes) == changed
+                print(f'{n:>7} | {changed:>7} | {hash_ms:>14.1f} | {diff_ms:>9.2f} | {deep_ms:>17.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Lazy Node Loading Benchmark
+===========================
+
+Compares resident memory (tracemalloc) and startup time of eager CareerData
+against lazy mode on a synthetic tree, after serving a working set of
+random career lookups. Startup times include tracemalloc overhead.
+
+Usage:
+    python benchmarks/bench_lazy_nodes.py [--nodes 50000] [--working-set 1000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data_loader import CareerData  # noqa: E402
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def measure(label: str, make_loader, career_ids, working_set: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    loader = make_loader()
+    startup = time.perf_counter() - start
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(working_set * 5):
+        loader.nodes.get(rng.choice(career_ids[:working_set]))
+    lookups = (time.perf_counter() - start) / (working_set * 5) * 1e6
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<24} | {startup * 1000:>12.0f} | {current / 2**20:>13.1f} | {lookups:>12.2f}')
+    return loader
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=50_000)
+    parser.add_argument('--working-set', type=int, default=1_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.nodes)
+        career_ids = [n for n in CareerData(base).nodes if n.startswith('career:')]
+        print(f'{args.nodes} nodes, working set {args.working_set} careers')
+        print(f"{'mode':<24} | {'startup (ms)':>12} | {'resident (MB)':>13} | {'lookup (us)':>12}")
+        print('-' * 72)
+        measure('eager', lambda: CareerData(base), career_ids, args.working_set)
+        measure('lazy (manifest build)', lambda: CareerData(base, lazy=True, lazy_cache_size=2048),
+                career_ids, args.working_set)
+        measure('lazy (cached manifest)', lambda: CareerData(base, lazy=True, lazy_cache_size=2048),
+                career_ids, args.working_set)
+
+
+if __name__ == '__main__':
+    main()
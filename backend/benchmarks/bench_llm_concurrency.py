@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+LLM-backed Endpoint Load Test
+=============================
+
+Throughput of /ai/rank under concurrent requests when every request waits on
+the LLM, against a local OpenAI-compatible stub that answers after a fixed
+delay. Compares the async endpoint on the shared keep-alive client (llm_client.py)
+with the previous shape: a sync endpoint calling requests.post, which holds
+one of the server's threadpool workers (40 by default) for the whole wait and
+opens a new connection per call.
+
+The app is driven in-process through httpx's ASGI transport and the stub runs
+in a separate process; the LLM cache is off so every request reaches the stub.
+
+Usage:
+    python benchmarks/bench_llm_concurrency.py [--latency 1.0] [--requests 400] [--concurrency 10 50 200]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class SlowOpenAI(BaseHTTPRequestHandler):
+    """Chat completions stub that answers every request after `latency` seconds."""
+    protocol_version = 'HTTP/1.1'
+    # headers and body go out as separate writes; without this, delayed ACKs add ~40 ms to reused connections
+    disable_nagle_algorithm = True
+    latency = 0.2
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(self.latency)
+        content = json.dumps({'ranked': [{'career_id': 'career:x', 'career_name': 'X', 'score': 1, 'reason': 'stub'}]})
+        reply = json.dumps({'choices': [{'message': {'content': content}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def serve_stub(latency: float, ports) -> None:
+    """Run the stub in its own process, so it does not compete with the app for the GIL."""
+    SlowOpenAI.latency = latency
+    server = StubServer(('127.0.0.1', 0), SlowOpenAI)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def legacy_app():
+    """/ai/rank as it was: a sync route making a blocking requests.post per call."""
+    import requests
+    from fastapi import FastAPI
+    import main
+    from ranking import extract_candidates, resolve_paths
+
+    app = FastAPI()
+
+    @app.post('/ai/rank')
+    def ai_rank(req: main.RankRequest):
+        paths, _ = resolve_paths(main.loader, req.variant_ids)
+        candidates = extract_candidates(paths)
+        payload = {'model': 'gpt-4o-mini', 'messages': [
+            {'role': 'system', 'content': 'rank'},
+            {'role': 'user', 'content': json.dumps(candidates, ensure_ascii=False)}]}
+        resp = requests.post(os.environ['OPENAI_BASE_URL'] + '/chat/completions', json=payload,
+                             headers={'Authorization': 'Bearer bench'}, timeout=15)
+        resp.raise_for_status()
+        return json.loads(resp.json()['choices'][0]['message']['content'])
+
+    return app
+
+
+async def load(app, total: int, concurrency: int, llm=None):
+    import httpx
+
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(client, i):
+        async with gate:
+            start = time.perf_counter()
+            resp = await client.post('/ai/rank', json={'user_profile': {'interests': [f'i{i}']},
+                                                       'variant_ids': ['mpc']})
+            assert resp.status_code == 200 and resp.json()['ranked'][0]['reason'] == 'stub', resp.text
+            latencies.append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+    if llm is not None:
+        await llm.aclose()  # the lifespan's job in a server; each run is on a new event loop
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=1.0, help='stub LLM delay in seconds')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 200])
+    args = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    stub = multiprocessing.Process(target=serve_stub, args=(args.latency, ports), daemon=True)
+    stub.start()
+    os.environ['OPENAI_API_KEY'] = 'bench'
+    os.environ['OPENAI_BASE_URL'] = f'http://127.0.0.1:{ports.get()}/v1'
+
+    import main
+    main.llm_cache = None  # every request goes to the stub
+    main.LLM_RANK_BUDGET_SECONDS = 120  # measure throughput, not the heuristic fallback
+    apps = {'sync + requests': legacy_app(), 'async + pool': main.app}
+
+    print(f'stub latency {args.latency * 1000:.0f} ms, {args.requests} requests per run')
+    print(f"{'endpoint':<16} | {'concurrency':>11} | {'req/s':>7} | {'p50 (ms)':>8} | {'p95 (ms)':>8}")
+    print('-' * 63)
+    for concurrency in args.concurrency:
+        for name, app in apps.items():
+            llm = main.llm_client if app is main.app else None
+            rps, p50, p95 = asyncio.run(load(app, args.requests, concurrency, llm))
+            print(f'{name:<16} | {concurrency:>11} | {rps:>7.1f} | {p50 * 1000:>8.0f} | {p95 * 1000:>8.0f}')
+    stub.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Node Model Memory Benchmark
+===========================
+
+Compares the memory (tracemalloc) retained by the node map when nodes are
+kept as raw parsed dicts versus slotted NodeRecords, on synthetic trees of
+1k, 10k and 100k nodes. Both variants parse the same files; nested values
+(attributes, roadmap, ...) are identical, so the difference is the cost of
+the top-level containers.
+
+Usage:
+    python benchmarks/bench_node_models.py [--sizes 1000 10000 100000]
+"""
+
+import os
+import sys
+import gc
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data_loader import CareerData, CLASS_LEVELS_FILE, EDGES_FILE, RULES_FILE, read_json_files  # noqa: E402
+from node_models import make_node  # noqa: E402
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def node_items(paths):
+    for data in read_json_files(paths):
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict) and item.get('id'):
+                yield item
+
+
+def measure(paths, as_records: bool) -> int:
+    gc.collect()
+    tracemalloc.start()
+    if as_records:
+        nodes = {item['id']: make_node(item) for item in node_items(paths)}
+    else:
+        nodes = {item['id']: item for item in node_items(paths)}
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert nodes
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} | {'dicts (MB)':>10} | {'records (MB)':>12} | {'saved':>6} | {'bytes/node saved':>16}")
+    print('-' * 66)
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), size)
+            skip = {CLASS_LEVELS_FILE, EDGES_FILE, RULES_FILE}
+            paths = [os.path.join(base, *rel.split('/'))
+                     for rel in CareerData(base, lazy=True).source_files() if rel not in skip]
+            dicts = measure(paths, as_records=False)
+            records = measure(paths, as_records=True)
+            print(f'{size:>8} | {dicts / 2**20:>10.1f} | {records / 2**20:>12.1f} | '
+                  f'{(1 - records / dicts) * 100:>5.1f}% | {(dicts - records) / size:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
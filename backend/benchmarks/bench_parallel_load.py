@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Parallel Load Benchmark
+=======================
+
+Times CareerData.load_all with serial parsing against thread and process
+pools on a synthetic tree with one file per career, and checks that every
+mode produces the same nodes in the same order.
+
+Usage:
+    python benchmarks/bench_parallel_load.py [--nodes 20000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data_loader import CareerData  # noqa: E402
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+MODES = [
+    ('serial', 0, 'thread'),
+    ('threads x4', 4, 'thread'),
+    ('threads x8', 8, 'thread'),
+    ('processes x4', 4, 'process'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.nodes)
+        reference = CareerData(base)
+        print(f'{args.nodes} nodes, {len(reference.source_files())} files, {os.cpu_count()} CPUs')
+        print(f"{'mode':<14} | {'load (ms)':>9} | {'vs serial':>9}")
+        print('-' * 38)
+        serial = None
+        for label, workers, executor in MODES:
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                loader = CareerData(base, load_workers=workers, load_executor=executor)
+                times.append(time.perf_counter() - start)
+            assert list(loader.nodes) == list(reference.nodes) and loader.nodes == reference.nodes
+            best = min(times)
+            serial = serial or best
+            print(f'{label:<14} | {best * 1000:>9.1f} | {serial / best:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Reachability Benchmark
+======================
+
+Answers the same reachability questions with the precomputed bitsets and
+with a naive BFS per question over the rule-filtered adjacency, on a
+synthetic dataset (100k nodes by default):
+
+    * careers reachable from both of two stream variants
+    * stream variants that can still reach a career
+    * courses between a variant and a career
+
+Also reports the one-off index build time and the size of the stored sets.
+
+Usage:
+    python benchmarks/bench_reachability.py [--nodes 100000] [--queries 200]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def bfs(loader, start, forward=True):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        if forward:
+            nxt = [e['to'] for e in loader.edges_from(node, allowed_only=True)]
+        else:
+            nxt = [e['from'] for e in loader.edges_to(node) if loader._is_transition_allowed(e['from'], node)]
+        for n in nxt:
+            if n not in seen:
+                seen.add(n)
+                stack.append(n)
+    return seen
+
+
+def naive(loader, reachable_from, can_reach, kind):
+    result = None
+    for node in reachable_from:
+        found = bfs(loader, node)
+        result = found if result is None else result & found
+    for node in can_reach:
+        found = bfs(loader, node, forward=False)
+        result = found if result is None else result & found
+    return sorted(n for n in result if n.startswith(f'{kind}:'))
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*q) for q in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    from data_loader import CareerData
+    from reachability import ReachabilityIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loader = CareerData(write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.nodes))
+    start = time.perf_counter()
+    index = ReachabilityIndex(loader)
+    build = time.perf_counter() - start
+    size = sum(sys.getsizeof(s) for s in index.forward + index.backward) + sum(
+        sys.getsizeof(s) for s in index.kinds.values())
+
+    rng = random.Random(7)
+    variants = [n for n in index.ids if n.startswith('variant:')]
+    careers = [n for n in index.ids if n.startswith('career:')]
+    workloads = {
+        'careers from 2 variants': [(rng.sample(variants, 2), [], 'career') for _ in range(args.queries)],
+        'variants reaching career': [([], [rng.choice(careers)], 'variant') for _ in range(args.queries)],
+        'courses variant->career': [([rng.choice(variants)], [rng.choice(careers)], 'course')
+                                    for _ in range(args.queries)],
+    }
+
+    def bitset(reachable_from, can_reach, kind):
+        return sorted(index.decode(index.query(reachable_from, can_reach, 'all', kind)))
+
+    print(f'{len(index.ids)} nodes, {len(loader.edges)} edges; index build {build:.2f} s, '
+          f'stored sets {size / 1024 / 1024:.1f} MB')
+    print(f"{'query':<26} | {'naive BFS (ms)':>14} | {'bitsets (ms)':>12} | {'speedup':>8}")
+    print('-' * 70)
+    for name, queries in workloads.items():
+        t_naive, expected = timed(lambda *q: naive(loader, *q), queries)
+        t_bits, got = timed(bitset, queries)
+        assert got == expected
+        print(f'{name:<26} | {t_naive * 1e3:>14.3f} | {t_bits * 1e3:>12.3f} | {t_naive / t_bits:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Shared Dataset Benchmark
+========================
+
+Memory per worker versus worker count, for workers that each load their
+own copy of the data (from the compiled snapshot) and for workers that
+attach to the shared mmap image. Workers are spawned as fresh interpreters
+(like uvicorn --workers), load the data, serve a working set of node
+lookups and /paths builds, and then report memory from
+/proc/self/smaps_rollup (Linux only). All workers are measured together.
+
+RSS counts shared pages in every worker that touches them. PSS divides
+each shared page between the workers mapping it, and the sum of PSS over
+all workers is the real footprint. USS (private) is what each extra
+worker adds.
+
+Usage:
+    python benchmarks/bench_shared_dataset.py [--nodes 50000] [--workers 1 2 4 8]
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def memory_kb():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def worker(base, mode, image, snapshot, loaded, done, results):
+    from data_loader import CareerData
+
+    if mode == 'shared':
+        loader = CareerData(base, shared_image=image)
+    else:
+        loader = CareerData(base, snapshot_path=snapshot)
+    rng = random.Random(os.getpid())
+    careers = [n for n in loader.reverse_adjacency if n.startswith('career:')]
+    variants = [n for n in loader.adjacency if n.startswith('variant:')]
+    for _ in range(2000):
+        loader.nodes.get(rng.choice(careers))
+    for vid in rng.sample(variants, min(5, len(variants))):
+        loader.get_paths_for_variant(vid)
+    loaded.wait()  # measure only once every worker is resident
+    results.put(memory_kb())
+    done.wait()
+
+
+def run(base, mode, image, snapshot, n_workers):
+    ctx = mp.get_context('spawn')
+    loaded, done = ctx.Barrier(n_workers), ctx.Barrier(n_workers + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(base, mode, image, snapshot, loaded, done, results))
+             for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    stats = [results.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    mb = 1024
+    print(f'{mode:<8} | {n_workers:>7} | {sum(s["rss"] for s in stats) / n_workers / mb:>16.1f} | '
+          f'{sum(s["uss"] for s in stats) / n_workers / mb:>16.1f} | {sum(s["pss"] for s in stats) / mb:>14.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    from data_loader import CareerData
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.nodes)
+        snapshot = os.path.join(tmp, 'data.snapshot')
+        image = os.path.join(tmp, 'data.shm')
+        CareerData(base).write_snapshot(snapshot)
+        CareerData(base, shared_image=image)  # compile the image once, as the first worker would
+
+        print(f'{args.nodes} nodes')
+        print(f"{'mode':<8} | {'workers':>7} | {'RSS/worker (MB)':>16} | {'USS/worker (MB)':>16} | "
+              f"{'total PSS (MB)':>14}")
+        print('-' * 74)
+        for mode in ('copy', 'shared'):
+            for n in args.workers:
+                run(base, mode, image, snapshot, n)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Singleflight Burst Benchmark
+============================
+
+Upstream work under a duplicate-heavy burst, such as a class running
+onboarding together: many identical requests arrive before the first one has
+been answered, so the LLM cache is still cold for all of them.
+
+- /ai/rank and /chatbot/ask: concurrent requests over a few distinct
+  profiles/questions against a local OpenAI-compatible stub with a fixed delay.
+  Counts the stub's chat completion calls.
+- The same /ai/rank bodies as blocking POSTs from a 40-thread pool, coalesced
+  with the threaded SingleFlight (the variant sync endpoints use). There is
+  no cache here, so each wave of 40 threads makes its own calls.
+
+Each is run with coalescing replaced by a pass-through and with singleflight.
+
+Usage:
+    python benchmarks/bench_singleflight.py [--requests 200] [--distinct 1 5 20] [--latency 0.3]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class CountingOpenAI(BaseHTTPRequestHandler):
+    """Chat completions stub: answers after `latency` seconds and counts calls."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.3
+    calls = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        with self.lock:
+            type(self).calls += 1
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(self.latency)
+        content = json.dumps({'ranked': [{'career_id': 'career:x', 'career_name': 'X', 'score': 1, 'reason': 'stub'}]})
+        reply = json.dumps({'choices': [{'message': {'content': content}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class PassThrough:
+    """No coalescing: every caller runs its own computation."""
+
+    async def _run(self, fn):
+        return await fn()
+
+    def do(self, key, fn):
+        result = fn()
+        return self._run(lambda: result) if asyncio.iscoroutine(result) else result
+
+    def get_stats(self):
+        return {}
+
+
+async def burst(app, requests, llm):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post(path, json=body) for path, body in requests))
+        elapsed = time.perf_counter() - start
+    await llm.aclose()
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+
+def llm_run(main, requests, coalesce: bool):
+    from llm_cache import LLMCache
+    from llm_client import LLMClient
+
+    main.llm_cache = LLMCache(path=None)  # cold, memory only
+    main.llm_client = LLMClient(main.OPENAI_BASE_URL, max_concurrency=1000)
+    if not coalesce:
+        main.llm_client.flight = PassThrough()
+    CountingOpenAI.calls = 0
+    elapsed = asyncio.run(burst(main.app, requests, main.llm_client))
+    return CountingOpenAI.calls, elapsed
+
+
+def thread_run(requests, coalesce: bool):
+    """Blocking POSTs from a 40-thread pool (the server's threadpool size), coalesced with SingleFlight."""
+    import requests as http
+    from llm_cache import canonical_hash
+    from singleflight import SingleFlight
+
+    flight = SingleFlight() if coalesce else PassThrough()
+    url = os.environ['OPENAI_BASE_URL'] + '/chat/completions'
+
+    def call(body):
+        return flight.do(canonical_hash(body), lambda: http.post(url, json=body, timeout=120).json())
+
+    CountingOpenAI.calls = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(40) as pool:
+        list(pool.map(call, [body for _, body in requests]))
+    return CountingOpenAI.calls, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--distinct', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--latency', type=float, default=0.3, help='stub LLM delay in seconds')
+    args = parser.parse_args()
+
+    CountingOpenAI.latency = args.latency
+    server = StubServer(('127.0.0.1', 0), CountingOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['OPENAI_API_KEY'] = 'bench'
+    os.environ['OPENAI_BASE_URL'] = f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+    import main as app_main
+    app_main.LLM_RANK_BUDGET_SECONDS = app_main.LLM_CHAT_BUDGET_SECONDS = 120
+
+    print(f"{'workload':<24} | {'distinct':>8} | {'requests':>8} | {'mode':<12} | {'upstream':>8} | {'wall (ms)':>9}")
+    print('-' * 86)
+    for distinct in args.distinct:
+        rank = [('/ai/rank', {'user_profile': {'interests': [f'interest {i % distinct}']}, 'variant_ids': ['mpc']})
+                for i in range(args.requests)]
+        # careers whose overview the chatbot sends for a rewrite
+        careers = ['doctor', 'pharmacist', 'dentist', 'engineer'][:distinct]
+        chat = [('/chatbot/ask', {'question': f'Give me an overview of {careers[i % len(careers)]} career'})
+                for i in range(args.requests)]
+        runs = [('/ai/rank', distinct, rank, lambda r, c: llm_run(app_main, r, c)),
+                ('/chatbot/ask (rewrite)', len(careers), chat, lambda r, c: llm_run(app_main, r, c)),
+                ('rank bodies (threads)', distinct, rank, thread_run)]
+        for name, unique, requests, run in runs:
+            for coalesce in (False, True):
+                calls, elapsed = run(requests, coalesce)
+                print(f"{name:<24} | {unique:>8} | {len(requests):>8} | {'singleflight' if coalesce else 'none':<12} | "
+                      f"{calls:>8} | {elapsed * 1000:>9.0f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
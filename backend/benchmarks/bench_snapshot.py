@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Startup Snapshot Benchmark
+==========================
+
+Reports CareerData startup time parsing the JSON tree versus reading the
+compiled snapshot, for today's career-data/ and a synthetic 50k-node tree.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--nodes 50000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data_loader import BASE, CareerData  # noqa: E402
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(label: str, base: str, snapshot_path: str):
+    loader = CareerData(base)
+    loader.write_snapshot(snapshot_path)
+    assert CareerData(base, snapshot_path=snapshot_path).loaded_from_snapshot
+    json_time = best_of(lambda: CareerData(base))
+    snap_time = best_of(lambda: CareerData(base, snapshot_path=snapshot_path))
+    size_kb = os.path.getsize(snapshot_path) / 1024
+    print(f'{label:<22} | {len(loader.nodes):>7} | {json_time * 1000:>9.1f} | {snap_time * 1000:>13.1f} | '
+          f'{json_time / snap_time:>6.1f}x | {size_kb:>9.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'dataset':<22} | {'nodes':>7} | {'JSON (ms)':>9} | {'snapshot (ms)':>13} | {'gain':>7} | {'size (KB)':>9}")
+    print('-' * 82)
+    with tempfile.TemporaryDirectory() as tmp:
+        report('career-data/', BASE, os.path.join(tmp, 'today.snapshot'))
+        synthetic = write_synthetic_dataset(os.path.join(tmp, 'synthetic'), args.nodes)
+        report(f'synthetic {args.nodes // 1000}k', synthetic, os.path.join(tmp, 'synthetic.snapshot'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Subgraph Endpoint Benchmark
+===========================
+
+Payload size and server-side encoding time of the monolithic /graph
+response versus /graph/subgraph views, as the dataset grows. /graph is
+encoded the way FastAPI does it (jsonable_encoder, then json.dumps); the
+subgraph views run the streaming encoder to completion.
+
+Views:
+    chart     root=education:class_10, depth 2, id/type/display_name
+              (education, streams and variants)
+    variant   root=<a variant>, depth 2, types course,career, id/type/display_name
+
+Usage:
+    python benchmarks/bench_subgraph.py [--nodes 1000 10000 100000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.synthetic_data import write_synthetic_dataset  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    payload = fn()
+    return time.perf_counter() - start, len(payload.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from data_loader import CareerData
+    from subgraph import iter_subgraph_json
+
+    print(f"{'nodes':>7} | {'view':<8} | {'payload (KB)':>12} | {'encode (ms)':>11}")
+    print('-' * 50)
+    for n in args.nodes:
+        with tempfile.TemporaryDirectory() as tmp:
+            loader = CareerData(write_synthetic_dataset(os.path.join(tmp, 'synthetic'), n))
+        variant = next(v for v in loader.adjacency if v.startswith('variant:'))
+        views = {
+            '/graph': lambda: json.dumps(jsonable_encoder({'nodes': loader.nodes, 'edges': list(loader.edges)})),
+            'chart': lambda: ''.join(iter_subgraph_json(loader, 'education:class_10', 2)),
+            'variant': lambda: ''.join(iter_subgraph_json(loader, variant, 2, {'course', 'career'})),
+        }
+        for name, fn in views.items():
+            seconds, size = timed(fn)
+            print(f'{n:>7} | {name:<8} | {size / 1024:>12.1f} | {seconds * 1e3:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
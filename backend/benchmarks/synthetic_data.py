@@ -0,0 +1,103 @@
+"""
+Synthetic career-data/ trees for the loader benchmarks.
+
+Node shapes mirror the real files (careers with attributes, skills, roadmap;
+courses with eligible variants and entry exams) so parse and memory costs are
+representative. Careers and exams are written one file per node, courses as
+a single courses.json list.
+"""
+
+import os
+import json
+import random
+import shutil
+from typing import Dict
+
+from data_loader import BASE
+
+STREAMS = ['science', 'commerce', 'arts', 'vocational']
+
+
+def _write(path: str, data) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def career_node(i: int, rng: random.Random, n_courses: int, n_variants: int) -> Dict:
+    return {
+        'id': f'career:synthetic_{i}',
+        'type': 'career',
+        'display_name': f'Synthetic Career {i}',
+        'attributes': {
+            'course_ids': [f'course:synthetic_{rng.randrange(n_courses)}' for _ in range(2)],
+            'career_type': rng.choice(['Private', 'Government', 'Self-employed']),
+            'nature': rng.choice(['Technical', 'Medical', 'Creative', 'Business']),
+            'stream_paths': [f'variant:synthetic_{rng.randrange(n_variants)}'],
+            'nba_attributes': {'has_exam': True, 'has_degree': True, 'exam_types': ['jee']},
+        },
+        'skills': [f'skill:skill_{rng.randrange(200)}' for _ in range(3)],
+        'metadata': {'source': ['synthetic'], 'last_reviewed': '2026-01-14', 'version': 1},
+        'why_path': f'Synthetic Career {i} typically follows related degree courses.',
+        'roadmap': {
+            'short_term': 'Choose the right stream and prepare for entrance exams',
+            'mid_term': 'Complete the degree (typically 3-4 years)',
+            'long_term': 'Gain experience and specialise',
+        },
+        'short_description': 'A synthetic career used for load benchmarks.',
+    }
+
+
+def write_synthetic_dataset(base: str, n_nodes: int, seed: int = 7) -> str:
+    """Create a career-data tree with roughly `n_nodes` nodes under `base`."""
+    rng = random.Random(seed)
+    if os.path.exists(base):
+        shutil.rmtree(base)
+    n_variants = max(4, n_nodes // 2000)
+    n_courses = max(10, n_nodes * 3 // 10)
+    n_exams = max(5, n_nodes // 10)
+    n_careers = max(10, n_nodes - n_courses - n_exams - n_variants - len(STREAMS))
+
+    _write(os.path.join(base, 'class_10.json'), {
+        'id': 'education:class_10', 'type': 'education_level', 'display_name': 'Class 10',
+        'streams': [f'stream:{s}' for s in STREAMS],
+    })
+    edges = []
+    for s in STREAMS:
+        _write(os.path.join(base, 'streams', f'{s}.json'),
+               {'id': f'stream:{s}', 'type': 'stream', 'display_name': s.title()})
+        edges.append({'from': 'education:class_10', 'to': f'stream:{s}', 'type': 'education_to_stream'})
+    for v in range(n_variants):
+        stream = STREAMS[v % len(STREAMS)]
+        _write(os.path.join(base, 'stream_variants', f'synthetic_{v}.json'),
+               {'id': f'variant:synthetic_{v}', 'type': 'stream_variant', 'stream_id': f'stream:{stream}',
+                'display_name': f'Variant {v}', 'subjects': ['Mathematics', 'Physics']})
+        edges.append({'from': f'stream:{stream}', 'to': f'variant:synthetic_{v}', 'type': 'stream_to_variant'})
+
+    courses = []
+    for c in range(n_courses):
+        variant = f'variant:synthetic_{rng.randrange(n_variants)}'
+        courses.append({
+            'id': f'course:synthetic_{c}', 'type': 'course', 'display_name': f'Course {c}',
+            'attributes': {'eligible_stream_variants': [variant], 'duration_years': rng.choice([2, 3, 4, 5]),
+                           'entry_exams': [f'exam:synthetic_{rng.randrange(n_exams)}']},
+            'metadata': {'source': ['synthetic'], 'last_reviewed': '2026-01-14', 'version': 1},
+        })
+        edges.append({'from': variant, 'to': f'course:synthetic_{c}', 'type': 'variant_to_course'})
+    _write(os.path.join(base, 'courses.json'), courses)
+
+    for e in range(n_exams):
+        _write(os.path.join(base, 'exams', f'synthetic_{e}.json'),
+               {'id': f'exam:synthetic_{e}', 'type': 'exam', 'display_name': f'Exam {e}',
+                'requires': [], 'leads_to': []})
+    for i in range(n_careers):
+        node = career_node(i, rng, n_courses, n_variants)
+        _write(os.path.join(base, 'careers', f'synthetic_{i}.json'), node)
+        for course_id in node['attributes']['course_ids']:
+            edges.append({'from': course_id, 'to': node['id'], 'type': 'course_to_career'})
+
+    _write(os.path.join(base, 'mappings', 'graph_edges.json'),
+           [dict(e, id=f'e{i}') for i, e in enumerate(edges)])
+    os.makedirs(os.path.join(base, 'rules'), exist_ok=True)
+    shutil.copy(os.path.join(BASE, 'rules', 'transition_rules.json'), os.path.join(base, 'rules'))
+    return base
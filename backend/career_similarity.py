@@ -0,0 +1,162 @@
+"""
+Career Similarity Index
+Career x feature matrix over skills, courses, stream paths, exam types and nature,
+with the top-k most similar careers precomputed per career (cosine and Jaccard)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# feature group -> weight of one shared feature from that group
+FEATURE_WEIGHTS: Dict[str, float] = {
+    'skills': 1.0,
+    'course_ids': 1.0,
+    'stream_paths': 0.5,
+    'exam_types': 0.75,
+    'nature': 0.5,
+}
+METRICS = ('cosine', 'jaccard')
+# rows scored per block; bounds the dense block at BLOCK_ROWS x n_careers floats
+BLOCK_ROWS = 256
+# features held by more careers than this (or 1/16 of them) are scored with a dense matmul
+DENSE_POSTINGS = 64
+
+Feature = Tuple[str, str]
+
+
+def career_features(node) -> Tuple[Feature, ...]:
+    """(group, value) features of a career node, in FEATURE_WEIGHTS group order."""
+    attrs = node.get('attributes') or {}
+    groups = {
+        'skills': node.get('skills') or [],
+        'course_ids': attrs.get('course_ids') or [],
+        'stream_paths': attrs.get('stream_paths') or [],
+        'exam_types': (attrs.get('nba_attributes') or {}).get('exam_types') or [],
+        'nature': [attrs['nature']] if attrs.get('nature') else [],
+    }
+    features: List[Feature] = []
+    for group in FEATURE_WEIGHTS:
+        for value in groups[group]:
+            if isinstance(value, str) and (group, value) not in features:
+                features.append((group, value))
+    return tuple(features)
+
+
+class SimilarityIndex:
+    """
+    Top-k similar careers for every career, built once per dataset
+
+    Careers are rows of a sparse binary matrix (kept as CSR/CSC index arrays)
+    whose columns are the features above, each weighted by its group. Pairwise
+    scores are computed a block of rows at a time: rare features by expanding
+    each row's features through the feature -> careers postings and summing
+    with np.bincount, common ones with a dense matmul. Memory stays at one
+    block rather than n x n. The per-career answer is a row lookup in the
+    precomputed top-k arrays.
+    """
+
+    def __init__(self, loader, top_k: int = 10):
+        self.top_k = top_k
+        self.career_ids: List[str] = [n for n in loader.nodes if n.startswith('career:')]
+        self.position = {cid: i for i, cid in enumerate(self.career_ids)}
+        self.features: List[Tuple[Feature, ...]] = [career_features(loader.nodes[cid]) for cid in self.career_ids]
+        # metric -> (career positions, scores), both n x top_k; -1 pads careers with fewer matches
+        self.top: Dict[str, Tuple[np.ndarray, np.ndarray]] = self._build()
+
+    def _matrix(self):
+        vocab: Dict[Feature, int] = {}
+        rows, cols = [], []
+        for r, features in enumerate(self.features):
+            for feature in features:
+                rows.append(r)
+                cols.append(vocab.setdefault(feature, len(vocab)))
+        group_weight = np.array([FEATURE_WEIGHTS[group] for group, _ in vocab], dtype=np.float64)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        # CSR (career -> features) and CSC (feature -> careers) views of the same entries
+        row_ptr = np.zeros(len(self.career_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(self.career_ids)), out=row_ptr[1:])
+        order = np.argsort(cols, kind='stable')
+        col_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=len(vocab)), out=col_ptr[1:])
+        return rows, cols, row_ptr, rows[order], col_ptr, group_weight
+
+    def _build(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        n = len(self.career_ids)
+        k = min(self.top_k, max(n - 1, 0))
+        top = {m: (np.full((n, k), -1, dtype=np.int32), np.zeros((n, k), dtype=np.float32)) for m in METRICS}
+        if n == 0 or k == 0:
+            return top
+        rows, cols, row_ptr, col_rows, col_ptr, group_weight = self._matrix()
+        w = group_weight[cols]
+        # norm (cosine) and total weight (weighted Jaccard) per career; an empty career scores 0 everywhere
+        norm = np.sqrt(np.bincount(rows, weights=w * w, minlength=n))
+        norm[norm == 0] = np.inf
+        mass = np.bincount(rows, weights=w, minlength=n)
+
+        # features shared by many careers (nature, common exams) go through a small dense matmul;
+        # expanding their postings pair by pair would cost O(n) per career
+        postings = np.diff(col_ptr)
+        dense = np.flatnonzero(postings > max(DENSE_POSTINGS, n // 16))
+        dense_pos = np.full(len(postings), -1, dtype=np.int64)
+        dense_pos[dense] = np.arange(len(dense))
+        x = np.zeros((n, len(dense)), dtype=np.float64)
+        in_dense = dense_pos[cols] >= 0
+        x[rows[in_dense], dense_pos[cols[in_dense]]] = 1.0
+        x_w, x_w2 = x * group_weight[dense], x * group_weight[dense] ** 2
+
+        tie_break = np.arange(n) * 1e-12
+        for start in range(0, n, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, n)
+            lo, hi = row_ptr[start], row_ptr[stop]
+            sparse = dense_pos[cols[lo:hi]] < 0
+            entry_rows, entry_cols = rows[lo:hi][sparse] - start, cols[lo:hi][sparse]
+            # expand every (row, rare feature) entry into (row, other career sharing the feature)
+            counts = col_ptr[entry_cols + 1] - col_ptr[entry_cols]
+            firsts = np.repeat(col_ptr[entry_cols] - np.cumsum(counts) + counts, counts)
+            others = col_rows[firsts + np.arange(counts.sum())]
+            flat = np.repeat(entry_rows, counts) * n + others
+            shared_w = np.repeat(group_weight[entry_cols], counts)
+            shape = (stop - start, n)
+            dot = np.bincount(flat, weights=shared_w * shared_w, minlength=shape[0] * n).reshape(shape)
+            dot += x[start:stop] @ x_w2.T
+            overlap = np.bincount(flat, weights=shared_w, minlength=shape[0] * n).reshape(shape)
+            overlap += x[start:stop] @ x_w.T
+
+            block = np.arange(start, stop)
+            dot /= norm[block, None]
+            dot /= norm[None, :]
+            union = mass[None, :] - overlap
+            union += mass[block, None]
+            np.divide(overlap, union, out=overlap, where=union > 0)
+            for metric, s in (('cosine', dot), ('jaccard', overlap)):
+                s[np.arange(shape[0]), block] = 0.0  # a career is not similar to itself
+                # argpartition degrades badly on long runs of equal scores; a tiny per-column offset
+                # makes them distinct and breaks ties in career order
+                best = np.argpartition(s - tie_break, n - k, axis=1)[:, n - k:]
+                best_scores = np.take_along_axis(s, best, axis=1)
+                # order by score, then by career order for a stable ranking among ties
+                order = np.lexsort((best, -best_scores), axis=1)
+                best = np.take_along_axis(best, order, axis=1)
+                best_scores = np.take_along_axis(best_scores, order, axis=1)
+                ids, values = top[metric]
+                ids[start:stop] = np.where(best_scores > 0, best, -1)
+                values[start:stop] = best_scores
+        return top
+
+    def similar(self, career_id: str, metric: str = 'cosine',
+                limit: Optional[int] = None) -> List[Tuple[str, float, Tuple[Feature, ...]]]:
+        """(career id, score, shared features) of the careers most similar to career_id, best first."""
+        pos = self.position.get(career_id)
+        if pos is None:
+            return []
+        ids, scores = self.top[metric]
+        own = set(self.features[pos])
+        result = []
+        for other, score in zip(ids[pos][:limit], scores[pos][:limit]):
+            if other < 0:
+                break
+            shared = tuple(f for f in self.features[other] if f in own)
+            result.append((self.career_ids[other], round(float(score), 4), shared))
+        return result
@@ -252,19 +252,20 @@ class ResponseFormatter:
         }
     
     @staticmethod
-    def apply_gpt_explanation(formatted_response: Dict, gpt_key: Optional[str]) -> Dict:
+    async def apply_gpt_explanation(formatted_response: Dict, gpt_key: Optional[str], llm, deadline: float) -> Dict:
         """
         OPTIONAL: Use GPT to rewrite answer in simpler language
         
         CRITICAL: GPT does NOT add facts, only rewrites
+
+        `llm` is the app's shared LLMClient (see llm_client.py); past `deadline`
+        (a time.monotonic() value) the original answer is kept
         """
         if not gpt_key or formatted_response.get('type') == 'error':
             return formatted_response
         
         # GPT rewriting logic (controlled)
         try:
-            import requests
-            
             system_prompt = """You are a helpful career advisor assistant.
 Rewrite the following verified career information in a friendly, conversational tone.
 
@@ -288,18 +289,9 @@ CRITICAL RULES:
                 'max_tokens': 400
             }
             
-            resp = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                json=payload,
-                headers={'Authorization': f'Bearer {gpt_key}'},
-                timeout=10
-            )
-            
-            if resp.ok:
-                body = resp.json()
-                rewritten = body['choices'][0]['message']['content']
-                formatted_response['answer'] = rewritten
-                formatted_response['gpt_enhanced'] = True
+            rewritten = await llm.chat(payload, gpt_key, deadline)
+            formatted_response['answer'] = rewritten
+            formatted_response['gpt_enhanced'] = True
         
         except Exception as e:
             # Fallback to original on any error
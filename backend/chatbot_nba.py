@@ -306,8 +306,8 @@ class NBAEngine:
         
         return checklist
     
-    def get_similar_careers(self, career_id: str) -> Dict:
-        """Get similar careers from graph edges"""
+    def get_similar_careers(self, career_id: str, metric: str = 'cosine', limit: int = 5) -> Dict:
+        """Get similar careers: curated career_similar edges and the similarity index, merged, then limited"""
         if not career_id.startswith('career:'):
             career_id = f'career:{career_id}'
         
@@ -315,29 +315,68 @@ class NBAEngine:
         if not career:
             return {'available': False}
         
-        similar_careers = []
-        
-        # Find similar careers in edges
-        for edge in self.loader.edges:
-            if edge.get('source') == career_id and edge.get('type') == 'career_similar':
-                target_id = edge.get('target')
-                target_career = self.loader.nodes.get(target_id)
-                if target_career:
-                    similar_careers.append({
-                        'id': target_id,
-                        'name': target_career.get('display_name'),
-                        'nature': target_career.get('attributes', {}).get('nature'),
-                        'reason': edge.get('reason', 'Similar career path')
-                    })
+        # Ranked by shared skills, courses, stream paths, exam types and nature
+        computed = {target_id: (score, shared)
+                    for target_id, score, shared in self.loader.similar_careers(career_id, metric)}
+        merged = {}
+        
+        # Curated edges lead, keeping their reason and taking the computed score when there is one
+        for edge in self.loader.edges_from(career_id, 'career_similar'):
+            target_id = edge.get('to')
+            target_career = self.loader.nodes.get(target_id)
+            if target_career and target_id not in merged:
+                merged[target_id] = {
+                    'id': target_id,
+                    'name': target_career.get('display_name'),
+                    'nature': target_career.get('attributes', {}).get('nature'),
+                    'reason': edge.get('reason', 'Similar career path')
+                }
+                if target_id in computed:
+                    merged[target_id]['score'] = computed[target_id][0]
+        
+        for target_id, (score, shared) in computed.items():
+            target_career = self.loader.nodes.get(target_id)
+            if target_career and target_id not in merged:
+                merged[target_id] = {
+                    'id': target_id,
+                    'name': target_career.get('display_name'),
+                    'nature': target_career.get('attributes', {}).get('nature'),
+                    'score': score,
+                    'reason': self._similarity_reason(shared)
+                }
+        
+        similar_careers = list(merged.values())[:limit]
         
         return {
             'available': True,
             'career_id': career_id,
             'career_name': career.get('display_name'),
+            'metric': metric,
             'similar_careers': similar_careers,
             'comparison_count': len(similar_careers)
         }
     
+    def _similarity_reason(self, shared) -> str:
+        """Describe shared (group, value) features, e.g. 'Shared skills: Problem Solving; same nature: Technical'"""
+        labels = {'skills': 'Shared skills', 'course_ids': 'Same courses', 'stream_paths': 'Same streams',
+                  'exam_types': 'Same exams', 'nature': 'Same nature'}
+        parts = []
+        for group, label in labels.items():
+            names = []
+            for g, value in shared:
+                if g != group:
+                    continue
+                node = self.loader.nodes.get(value) if ':' in value else None
+                if node:
+                    names.append(node.get('display_name', value))
+                elif group == 'exam_types':
+                    names.append(value.upper())
+                else:
+                    names.append(value.split(':', 1)[-1].replace('_', ' ').title())
+            if names:
+                parts.append(f"{label}: {', '.join(names)}")
+        return '; '.join(parts) or 'Similar career path'
+    
     def get_failure_paths(self, career_id: str) -> Dict:
         """Get recovery options if exam/degree fails"""
         if not career_id.startswith('career:'):
@@ -417,9 +456,9 @@ class NBAEngine:
         alternate_paths = []
         
         # Find alternate paths in edges
-        for edge in self.loader.edges:
-            if edge.get('target') == career_id and edge.get('type') in ['variant_to_career', 'course_to_career']:
-                source_id = edge.get('source')
+        for edge_type in ['variant_to_career', 'course_to_career']:
+            for edge in self.loader.edges_to(career_id, edge_type):
+                source_id = edge.get('from')
                 source_node = self.loader.nodes.get(source_id)
                 if source_node:
                     alternate_paths.append({
@@ -430,11 +469,17 @@ class NBAEngine:
                         'difficulty': edge.get('difficulty', 'Medium')
                     })
         
+        # full Class 10 -> career chains from the precomputed route index
+        routes = [{'path': list(path), 'exams': list(exams)}
+                  for path, exams in self.loader.routes_to(career_id)]
+        
         return {
             'available': True,
             'career_id': career_id,
             'career_name': career.get('display_name'),
             'alternate_paths': alternate_paths,
             'total_paths': len(alternate_paths),
+            'routes': routes,
+            'total_routes': len(routes),
             'message': 'Multiple routes lead to this career'
         }
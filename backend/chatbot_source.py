@@ -3,23 +3,27 @@ Answer Source Module
 SAFE data retrieval - App data is the ONLY source of truth
 """
 
-import os
-import json
 from typing import Dict, Optional, List
-from data_loader_versioned import load_career, load_stream, load_exam
-from config import CAREERS_DIR, STREAMS_DIR, EXAMS_DIR
 
 
 class AnswerSource:
     """
     Fetch answers from verified sources ONLY (uses versioned data)
     
+    Reads the same in-memory CareerData as the REST endpoints; versioned
+    career/exam records come from `loader.versioned`, not from disk.
+
     SAFETY RULE: Never invent data
     """
     
     def __init__(self, loader=None):
-        # Keep a loader reference for stream lookups; fallback to None-safe usage
+        # Keep a loader reference for all lookups; fallback to None-safe usage
         self.loader = loader
+
+    def _versioned(self, kind: str, record_id: str) -> Optional[Dict]:
+        if not self.loader:
+            return None
+        return self.loader.get_versioned(kind, record_id)
     
     def fetch_career_data(self, career_id: str) -> Optional[Dict]:
         """
@@ -27,7 +31,7 @@ class AnswerSource:
         """
         # Try loading from versioned data
         print(f"🔍 fetch_career_data: Trying to load career_id='{career_id}'")
-        career_data = load_career(career_id)
+        career_data = self._versioned('careers', career_id)
         
         if career_data:
             print(f"✅ Loaded career data: {career_data.get('display_name', 'N/A')}")
@@ -36,7 +40,7 @@ class AnswerSource:
         # Try with career: prefix
         if not career_id.startswith('career:'):
             print(f"🔍 Trying with prefix: 'career:{career_id}'")
-            career_data = load_career(f'career:{career_id}')
+            career_data = self._versioned('careers', f'career:{career_id}')
             if career_data:
                 print(f"✅ Loaded with prefix: {career_data.get('display_name', 'N/A')}")
         
@@ -55,7 +59,7 @@ class AnswerSource:
 
     def get_exam_info(self, exam_id: str) -> Dict:
         """Return basic exam information from versioned data."""
-        exam = load_exam(exam_id) or load_exam(f'exam:{exam_id}')
+        exam = self._versioned('exams', exam_id) or self._versioned('exams', f'exam:{exam_id}')
         if not exam:
             return {'available': False}
 
@@ -87,18 +91,23 @@ class AnswerSource:
         paths = []
         
         # Search edges for paths to this career
-        for edge in self.loader.edges:
-            if edge.get('target') == career_id or edge.get('target') == f'career:{career_id}':
-                source_id = edge.get('source')
-                source_node = self.loader.nodes.get(source_id)
-                if source_node:
-                    paths.append({
-                        'from': source_node.get('display_name', source_id),
-                        'type': source_node.get('type'),
-                        'id': source_id
-                    })
-        
-        return {'paths': paths}
+        edges = self.loader.edges_to(career_id) + self.loader.edges_to(f'career:{career_id}')
+        for edge in edges:
+            source_id = edge.get('from')
+            source_node = self.loader.nodes.get(source_id)
+            if source_node:
+                paths.append({
+                    'from': source_node.get('display_name', source_id),
+                    'type': source_node.get('type'),
+                    'id': source_id
+                })
+        
+        # full Class 10 -> career chains from the precomputed route index
+        full_id = career_id if career_id.startswith('career:') else f'career:{career_id}'
+        routes = [{'path': list(path), 'exams': list(exams)}
+                  for path, exams in self.loader.routes_to(full_id)]
+        
+        return {'paths': paths, 'routes': routes}
     
     def get_career_eligibility(self, career_id: str) -> Dict:
         """
@@ -81,6 +81,38 @@ ANALYTICS_LOG_FILE = "logs/analytics.json"
 
 ENABLE_VERSIONING = True  # Enable data versioning support
 VERSIONING_ENABLED_SINCE = "2025-12"
+RESIDENT_DATA_VERSIONS = ["v1", "v2"]  # Versions kept loaded for ?version= / X-Data-Version requests
+
+ENABLE_DATA_SNAPSHOT = True  # Start from career-data/.build snapshot when it matches the JSON sources
+DATA_LOAD_WORKERS = 0  # Parse career-data files with a worker pool when > 0 (0 = serial)
+DATA_LOAD_EXECUTOR = "thread"  # "thread" or "process" pool for parallel loading
+LAZY_NODE_LOADING = False  # Parse nodes on first access (manifest + LRU) instead of at startup
+LAZY_NODE_CACHE_SIZE = 2048  # Parsed nodes kept resident in lazy mode
+SHARED_DATASET = False  # Workers mmap one read-only dataset image instead of each loading a copy
+SHARED_DATASET_PATH = None  # Image location; None = career-data/.build/career_data.shm (use /dev/shm/... for tmpfs)
+
+ENABLE_HOT_RELOAD = False  # Watch career-data/ and swap in rebuilt data without a restart (development; the HOT_RELOAD=1 env var also turns it on)
+HOT_RELOAD_POLL_SECONDS = 2.0  # Polling interval when inotify (watchfiles) is unavailable
+ADMIN_TOKEN = None  # X-Admin-Token required by admin POST endpoints; the ADMIN_TOKEN env var overrides this. None = they are disabled
+
+# ========== LLM (OpenAI-compatible API) ==========
+OPENAI_BASE_URL = "https://api.openai.com/v1"  # The OPENAI_BASE_URL env var overrides this (proxies, local servers)
+LLM_CACHE_ENABLED = True  # Reuse /ai/rank LLM answers for identical (profile, candidate set) requests
+LLM_CACHE_TTL_SECONDS = 86400  # Lifetime of a cached LLM answer (both tiers)
+LLM_CACHE_CAPACITY = 1024  # L1: answers kept in memory per worker (LRU)
+LLM_CACHE_DISK_CAPACITY = 100000  # L2: answers kept in the SQLite file
+LLM_CACHE_PATH = None  # L2 SQLite file; None = backend/.cache/llm_cache.sqlite3, "" = memory only
+LLM_RANK_BUDGET_SECONDS = 4.0  # /ai/rank serves the heuristic ranking if the LLM has not answered by then
+LLM_CHAT_BUDGET_SECONDS = 3.0  # /chatbot/ask serves the formatted answer unrewritten if the LLM has not answered by then
+LLM_MAX_CONCURRENCY = 64  # LLM calls in flight per worker; further calls queue within their budget
+LLM_BREAKER_FAILURES = 5  # Consecutive failed or late LLM calls that open the circuit breaker
+LLM_BREAKER_RESET_SECONDS = 30  # While open, LLM calls are skipped; then one trial call decides
+
+# ========== BATCH RANKING ==========
+BATCH_RANK_MAX_PROFILES = 5000  # Profiles accepted by one /ai/rank/batch call
+BATCH_RANK_PROCESS_MIN_PROFILES = 2000  # Batches at least this large are scored in a process pool
+BATCH_RANK_WORKERS = 4  # Processes in that pool, shared by all batches (0 = always score in the request thread)
+BATCH_RANK_MAX_CONCURRENT = 2  # Batches scored at once; further /ai/rank/batch calls get 429
 
 # ========== FALLBACK BEHAVIOR ==========
 FALLBACK_CAREER_RESPONSE = "I couldn't find detailed information for that career. Would you like to explore alternative paths?"
@@ -0,0 +1,64 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """
+    OpenAI-compatible /chat/completions: ranks the first candidate of an
+    /ai/rank prompt and answers anything else with a fixed rewrite, after
+    `delay` seconds
+    """
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    calls = 0
+    clients = set()
+    delay = 0.0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        cls = type(self)
+        with cls.lock:
+            cls.calls += 1
+            cls.clients.add(self.client_address)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][1]['content']
+        if 'Candidates: ' in prompt:
+            candidates = json.loads(prompt.split('Candidates: ', 1)[1].split('\n\n', 1)[0])
+            content = json.dumps({'ranked': [{'career_id': c['career_id'], 'career_name': c['career_name'],
+                                              'score': 0.9, 'reason': 'fake'} for c in candidates[:1]]})
+        else:
+            content = 'Rewritten by the fake model.'
+        reply = json.dumps({'choices': [{'message': {'content': content}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """A local fake LLM API; OPENAI_API_KEY and OPENAI_BASE_URL point the app at it."""
+    # a subclass per test, so a request still sleeping in an earlier test's server cannot touch these counters
+    handler = type('FakeOpenAI', (FakeOpenAI,), {'calls': 0, 'clients': set(), 'delay': 0.0, 'in_flight': 0,
+                                                 'max_in_flight': 0, 'lock': threading.Lock()})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', f'http://127.0.0.1:{server.server_address[1]}/v1')
+    yield handler
+    server.shutdown()
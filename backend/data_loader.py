@@ -1,84 +1,377 @@
 import os
+import copy
 import json
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from transition_rules import TransitionRules, hierarchy_parents
+from dataset_snapshot import read_snapshot, write_snapshot
+from lazy_nodes import LazyNodeStore, load_or_build_manifest
+from shared_dataset import attach_or_build
+from route_index import RouteIndex, Route
+from route_planner import RoutePlanner
+from career_similarity import SimilarityIndex
+from reachability import ReachabilityIndex
+from singleflight import SingleFlight
+from next_steps import NextSteps
+from dataset_diff import ContentHashes
+from node_models import NodeRecord, make_node
+from program_data import PROGRAM_FILES, read_program_file
+
+try:
+    from config import ACTIVE_DATA_VERSION
+except ImportError:
+    ACTIVE_DATA_VERSION = "v1"
 
 BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'career-data'))
+SNAPSHOT_PATH = os.path.join(BASE, '.build', 'career_data.snapshot')
+SHARED_IMAGE_PATH = os.path.join(BASE, '.build', 'career_data.shm')
+MANIFEST_FILE = os.path.join('.build', 'node_manifest.json')
+
+CLASS_LEVELS_FILE = 'class_10.json'
+NODE_LIST_FILES = ['streams.json', 'stream_variants.json', 'courses.json', 'careers.json']
+NODE_FOLDERS = ['phases', 'education_levels', 'streams', 'stream_variants', 'courses', 'careers', 'exams']
+EDGES_FILE = 'mappings/graph_edges.json'
+RULES_FILE = 'rules/transition_rules.json'
+# chatbot records (career_id / exam_id schema) under career-data/<version>/<kind>/<id>.json
+VERSIONED_KINDS = ['careers', 'streams', 'stream_variants', 'courses', 'exams', 'roadmaps']
+# fields the chatbot search matches a query against
+SEARCH_FIELDS = ('display_name', 'description', 'id')
+
+# node_id -> edge type -> edges
+Adjacency = Dict[str, Dict[str, List[Dict[str, Any]]]]
+
+
+def normalize_edge(edge: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the edge using the 'from'/'to' key convention.
+
+    Older mappings (and the NBA engine) used 'source'/'target'; those keys are
+    renamed so every lookup in the app can rely on a single convention.
+    """
+    if 'from' in edge and 'to' in edge:
+        return edge
+    normalized = dict(edge)
+    if 'from' not in normalized and 'source' in normalized:
+        normalized['from'] = normalized.pop('source')
+    if 'to' not in normalized and 'target' in normalized:
+        normalized['to'] = normalized.pop('target')
+    return normalized
+
+
+def read_json_file(path: str) -> Any:
+    """Parse one JSON file; returns None if it does not exist (used by the load pools)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def read_json_files(paths: List[str]) -> List[Any]:
+    """Parse a batch of files in order; one pool task per batch keeps scheduling overhead low."""
+    return [read_json_file(p) for p in paths]
+
+
+def build_adjacency(edges: List[Dict[str, Any]], key: str) -> Adjacency:
+    """Group edges by their `key` endpoint ('from' or 'to') and edge type."""
+    index: Adjacency = {}
+    for e in edges:
+        node_id = e.get(key)
+        if node_id is None:
+            continue
+        index.setdefault(node_id, {}).setdefault(e.get('type'), []).append(e)
+    return index
+
 
 class CareerData:
     """Career data loader with support for both 'id' and 'career_id' fields - Enhanced version"""
-    def __init__(self, base_path: str = BASE):
+
+    # Everything load_all produces; this is what a dataset snapshot stores.
+    SNAPSHOT_ATTRS = ('nodes', 'edges', 'rules', 'class_levels', 'adjacency', 'reverse_adjacency',
+                      'transition_rules', 'allowed_adjacency', 'paths_by_variant',
+                      'versioned', 'search_index')
+
+    def __init__(self, base_path: str = BASE, snapshot_path: Optional[str] = None,
+                 load_workers: int = 0, load_executor: str = 'thread',
+                 lazy: bool = False, lazy_cache_size: int = 1024,
+                 data_version: Optional[str] = ACTIVE_DATA_VERSION,
+                 shared_image: Optional[str] = None):
+        """
+        Args:
+            base_path: career-data directory
+            data_version: versioned record set (career-data/<version>/) served to the chatbot
+            shared_image: attach to this read-only mmap image (built on first use) instead of loading
+            snapshot_path: compiled snapshot to start from when it is current
+            load_workers: parse files with a pool of this many workers (0 = serial)
+            load_executor: 'thread' or 'process' pool for parallel parsing
+            lazy: parse nodes on first access via a manifest instead of up front
+            lazy_cache_size: how many parsed nodes the lazy store keeps resident
+        """
         self.base = base_path
+        self.load_workers = load_workers
+        self.load_executor = load_executor
+        self.lazy = lazy
+        self.lazy_cache_size = lazy_cache_size
+        self.data_version = data_version
+        self.shared_image = shared_image
         self.nodes: Dict[str, Dict[str, Any]] = {}
         self.edges: List[Dict[str, Any]] = []
+        # forward (from -> to) and reverse (to -> from) adjacency, keyed by node id then edge type
+        self.adjacency: Adjacency = {}
+        self.reverse_adjacency: Adjacency = {}
         self.rules: List[Dict[str, Any]] = []
+        self.transition_rules = TransitionRules([], {})
+        # adjacency with disallowed transitions already removed
+        self.allowed_adjacency: Adjacency = {}
+        # materialized /paths payloads, one per variant id
+        self.paths_by_variant: Dict[str, Dict[str, Any]] = {}
         self.class_levels: Dict[str, Any] = {}
+        # versioned chatbot records: kind -> file id -> record
+        self.versioned: Dict[str, Dict[str, NodeRecord]] = {}
+        # kind -> [(lowercased search fields, record)] for the chatbot search
+        self.search_index: Dict[str, List[Tuple[Tuple[str, ...], NodeRecord]]] = {}
+        # all class-level -> career routes, built on first use (see route_index.py)
+        self.route_index: Optional[RouteIndex] = None
+        # top-k similar careers per career, built on the first lookup (see career_similarity.py)
+        self.similarity_index: Optional[SimilarityIndex] = None
+        self._similarity_flight = SingleFlight()
+        # reachable / can-reach bitsets per node, built at startup (see reachability.py)
+        self.reachability: Optional[ReachabilityIndex] = None
+        # memoised "what next" search, per-node cache dropped with the dataset (see next_steps.py)
+        self._next_steps: Optional[NextSteps] = None
+        # weighted k-shortest routes, memoised per dataset (see route_planner.py)
+        self._route_planner: Optional[RoutePlanner] = None
+        # per-node, per-edge and per-record content hashes, built on first use (see dataset_diff.py)
+        self._content_hashes: Optional[ContentHashes] = None
+        # set when startup was served from a compiled snapshot (see dataset_snapshot.py)
+        self.loaded_from_snapshot = False
+        if shared_image:
+            self.load_shared(shared_image)
+            return
+        if lazy:
+            self.load_lazy()
+            return
+        if snapshot_path and self._load_snapshot(snapshot_path):
+            return
         self.load_all()
 
+    def _load_snapshot(self, path: str) -> bool:
+        state = read_snapshot(path, self.base, self.source_files())
+        if state is None:
+            if os.path.exists(path):
+                print(f"Data snapshot {path} is stale; loading career data from JSON")
+            return False
+        for attr in self.SNAPSHOT_ATTRS:
+            setattr(self, attr, state[attr])
+        self.loaded_from_snapshot = True
+        return True
+
+    def write_snapshot(self, path: str) -> str:
+        """Compile the loaded data into a snapshot file; returns the source hash."""
+        return write_snapshot(path, self.base, self.source_files(),
+                              {attr: getattr(self, attr) for attr in self.SNAPSHOT_ATTRS})
+
+    def with_version(self, version: str,
+                     intern: Optional[Callable[[NodeRecord], NodeRecord]] = None) -> 'CareerData':
+        """The same graph with another versioned record set.
+
+        Nodes, edges and every derived index are shared with this loader, not
+        copied; only `versioned` and `search_index` are loaded for `version`.
+        `intern` may map each record to an identical one already in memory.
+        """
+        view = copy.copy(self)
+        view.data_version = version
+        view.versioned = {}
+        files = view._versioned_files()
+        for rel, data in zip(files, view._read_sources(files)):
+            if data is not None:
+                view._merge_source(rel, data)
+        if intern is not None:
+            view.versioned = {kind: {rid: intern(record) for rid, record in records.items()}
+                              for kind, records in view.versioned.items()}
+        view._index_versioned()
+        # the graph is shared, so its hashes are too; only the records are hashed again
+        view._content_hashes = self._content_hashes and ContentHashes(view, graph=self._content_hashes)
+        return view
+
     def _load_json(self, *parts):
         path = os.path.join(self.base, *parts)
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    def load_all(self):
-        # Load nodes from single-file lists and single objects
-        # education_levels / class_10.json
-        try:
-            self.class_levels = self._load_json('class_10.json')
-        except FileNotFoundError:
-            self.class_levels = {}
-
+    def source_files(self) -> List[str]:
+        """Relative paths (using '/') of every file load_all reads, in load order."""
+        files = [CLASS_LEVELS_FILE]
         # streams.json, stream_variants.json, courses.json, careers.json, exams, phases
-        for fname in ['streams.json', 'stream_variants.json', 'courses.json', 'careers.json']:
-            p = os.path.join(self.base, fname)
-            if os.path.exists(p):
-                arr = self._load_json(fname)
-                for item in arr:
-                    self.nodes[item['id']] = item
-
+        files.extend(f for f in NODE_LIST_FILES if os.path.exists(os.path.join(self.base, f)))
         # also load single files created earlier (individual files under directories)
-        # directories: phases, education_levels, streams, stream_variants, courses, careers, exams
-        for folder in ['phases','education_levels','streams','stream_variants','courses','careers','exams']:
-            dirpath = os.path.join(self.base, folder)
-            if not os.path.isdir(dirpath):
+        for folder in NODE_FOLDERS:
+            try:
+                # scandir yields entries in the same order as listdir, so "last file wins" is unchanged
+                with os.scandir(os.path.join(self.base, folder)) as entries:
+                    files.extend(f'{folder}/{entry.name}' for entry in entries
+                                 if entry.name.endswith('.json') and entry.is_file())
+            except (FileNotFoundError, NotADirectoryError):
                 continue
-            for fname in os.listdir(dirpath):
-                if not fname.endswith('.json'):
+        files.extend([EDGES_FILE, RULES_FILE])
+        # degree programs, postgraduate paths and lateral transitions (nodes and typed edges)
+        files.extend(f for f in PROGRAM_FILES if os.path.exists(os.path.join(self.base, f)))
+        files.extend(self._versioned_files())
+        return files
+
+    def _versioned_files(self) -> List[str]:
+        if not self.data_version:
+            return []
+        files = []
+        for kind in VERSIONED_KINDS:
+            try:
+                with os.scandir(os.path.join(self.base, self.data_version, kind)) as entries:
+                    files.extend(f'{self.data_version}/{kind}/{entry.name}' for entry in entries
+                                 if entry.name.endswith('.json') and entry.is_file())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return files
+
+    def _read_sources(self, files: List[str]) -> List[Any]:
+        """Parse the source files, in parallel when load_workers is set; results keep file order."""
+        paths = [os.path.join(self.base, *rel.split('/')) for rel in files]
+        if self.load_workers <= 0:
+            return read_json_files(paths)
+        size = max(1, len(paths) // (self.load_workers * 4))
+        batches = [paths[i:i + size] for i in range(0, len(paths), size)]
+        pool_cls = ProcessPoolExecutor if self.load_executor == 'process' else ThreadPoolExecutor
+        with pool_cls(max_workers=self.load_workers) as pool:
+            # map() yields batches in submission order, so the flattened list keeps file order
+            return [data for batch in pool.map(read_json_files, batches) for data in batch]
+
+    def _merge_source(self, rel: str, data: Any):
+        """Fold one parsed source file into the loader; later files win on id clashes."""
+        if rel == CLASS_LEVELS_FILE:
+            self.class_levels = data
+        elif rel == EDGES_FILE:
+            self.edges = [normalize_edge(e) for e in data]
+        elif rel == RULES_FILE:
+            self.rules = data
+        elif rel in PROGRAM_FILES:
+            nodes, edges = read_program_file(rel, data)
+            for item in nodes:
+                self.nodes[item['id']] = make_node(item)
+            # merged after EDGES_FILE, so these extend the mapped edges
+            self.edges.extend(edges)
+        elif self.data_version and rel.startswith(f'{self.data_version}/'):
+            _, kind, name = rel.split('/', 2)
+            if isinstance(data, dict):
+                # keyed by file name, the id the chatbot asks for
+                self.versioned.setdefault(kind, {})[name[:-len('.json')]] = make_node(data)
+        elif rel in NODE_LIST_FILES:
+            for item in data:
+                self.nodes[item['id']] = make_node(item)
+        else:
+            folder = rel.split('/', 1)[0]
+            # a file holds either one node object or a list of them
+            items = [data] if isinstance(data, dict) else data if isinstance(data, list) else []
+            for item in items:
+                if not isinstance(item, dict):
                     continue
-                data = self._load_json(folder, fname)
-                # if file is an object
-                if isinstance(data, dict):
-                    # Support both 'id' and 'career_id' fields for backwards compatibility
-                    node_id = data.get('id') or data.get('career_id')
-                    if node_id and folder == 'careers' and not node_id.startswith('career:'):
-                        # Add 'career:' prefix if missing
-                        node_id = f'career:{node_id}'
-                        data['id'] = node_id
-                    if node_id:
-                        self.nodes[node_id] = data
-                # if it's a list, add each
-                elif isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict):
-                            node_id = item.get('id') or item.get('career_id')
-                            if node_id and folder == 'careers' and not node_id.startswith('career:'):
-                                node_id = f'career:{node_id}'
-                                item['id'] = node_id
-                            if node_id:
-                                self.nodes[node_id] = item
-
-        # load mappings/graph_edges.json
-        try:
-            edges = self._load_json('mappings', 'graph_edges.json')
-            self.edges = edges
-        except FileNotFoundError:
-            self.edges = []
-
-        # load rules
-        try:
-            rules = self._load_json('rules', 'transition_rules.json')
-            self.rules = rules
-        except FileNotFoundError:
-            self.rules = []
+                # Support both 'id' and 'career_id' fields for backwards compatibility
+                node_id = item.get('id') or item.get('career_id')
+                fixed_id = None
+                if node_id and folder == 'careers' and not node_id.startswith('career:'):
+                    # Add 'career:' prefix if missing
+                    node_id = fixed_id = f'career:{node_id}'
+                if node_id:
+                    self.nodes[node_id] = make_node(item, fixed_id)
+
+    def load_all(self):
+        # start from empty containers so a reload drops nodes whose files were removed
+        self.nodes = {}
+        self.class_levels = {}
+        self.edges = []
+        self.rules = []
+        self.versioned = {}
+        files = self.source_files()
+        # merge strictly in discovery order so parallel parsing resolves id clashes like the serial path
+        for rel, data in zip(files, self._read_sources(files)):
+            if data is not None:
+                self._merge_source(rel, data)
+
+        self._index_edges()
+        self._compile_rules()
+        self._materialize_paths()
+        self._index_versioned()
+
+    def load_lazy(self):
+        """Index nodes by file location and parse them on demand (see lazy_nodes.py)."""
+        files = self.source_files()
+        # the versioned chatbot records and the program files are small and always kept resident
+        meta_files = [f for f in [CLASS_LEVELS_FILE, EDGES_FILE, RULES_FILE, *PROGRAM_FILES] if f in files]
+        meta_files += self._versioned_files()
+        manifest = load_or_build_manifest(
+            self.base, files, [f for f in files if f not in meta_files], NODE_LIST_FILES,
+            os.path.join(self.base, MANIFEST_FILE))
+        self.class_levels = {}
+        self.edges = []
+        self.rules = []
+        self.versioned = {}
+        self.nodes = {}
+        for rel, data in zip(meta_files, self._read_sources(meta_files)):
+            if data is not None:
+                self._merge_source(rel, data)
+        # degree and postgraduate nodes come from the program files just merged
+        self.nodes = LazyNodeStore(self.base, manifest, self.lazy_cache_size, resident=self.nodes)
+        self._index_edges()
+        self._compile_rules()
+        # a materialized view would pin every course and career node; /paths is built per call instead
+        self.paths_by_variant = {}
+        self._index_versioned()
+
+    def load_shared(self, path: str):
+        """Attach to the shared mmap image used by every worker (see shared_dataset.py)."""
+        # the image is compiled for the active version when none is given, so hash that version's files
+        self.data_version = self.data_version or ACTIVE_DATA_VERSION
+        state = attach_or_build(path, self.base, self.source_files(), self.data_version, self.lazy_cache_size)
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        # like lazy mode, /paths is built per call so workers do not each pin a materialized view
+        self.paths_by_variant = {}
+
+    def _index_versioned(self):
+        self.search_index = {
+            kind: [(tuple(str(record.get(f) or '').lower() for f in SEARCH_FIELDS), record)
+                   for record in records.values()]
+            for kind, records in self.versioned.items()
+        }
+
+    def _index_edges(self):
+        self.adjacency = build_adjacency(self.edges, 'from')
+        self.reverse_adjacency = build_adjacency(self.edges, 'to')
+
+    def _compile_rules(self):
+        self.transition_rules = TransitionRules(self.rules, hierarchy_parents(self.reverse_adjacency, self.nodes))
+        allowed: Adjacency = {}
+        for from_id, by_type in self.adjacency.items():
+            for edge_type, edges in by_type.items():
+                kept = [e for e in edges if self.transition_rules.is_allowed(from_id, e.get('to'))]
+                if kept:
+                    allowed.setdefault(from_id, {})[edge_type] = kept
+        self.allowed_adjacency = allowed
+
+    def edges_from(self, node_id: str, edge_type: Optional[str] = None,
+                   allowed_only: bool = False) -> List[Dict[str, Any]]:
+        """Outgoing edges of a node, optionally restricted to one edge type.
+
+        With `allowed_only`, edges blocked by the transition rules are skipped.
+        """
+        by_type = (self.allowed_adjacency if allowed_only else self.adjacency).get(node_id, {})
+        if edge_type is not None:
+            return by_type.get(edge_type, [])
+        return [e for edges in by_type.values() for e in edges]
+
+    def edges_to(self, node_id: str, edge_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Incoming edges of a node, optionally restricted to one edge type."""
+        by_type = self.reverse_adjacency.get(node_id, {})
+        if edge_type is not None:
+            return by_type.get(edge_type, [])
+        return [e for edges in by_type.values() for e in edges]
 
     def normalize_variant_id(self, variant_param: str) -> str:
         if variant_param.startswith('variant:'):
@@ -104,57 +397,45 @@ class CareerData:
                     streams.append(node)
         else:
             # fallback: collect stream nodes referenced by edges from the education node
-            for e in self.edges:
-                if e.get('from') == class_id and e.get('type') == 'education_to_stream':
-                    node = self.nodes.get(e.get('to'))
-                    if node:
-                        streams.append(node)
+            for e in self.edges_from(class_id, 'education_to_stream'):
+                node = self.nodes.get(e.get('to'))
+                if node:
+                    streams.append(node)
         return streams
 
     def variant_to_courses(self, variant_id: str) -> List[Dict[str, Any]]:
         # return course nodes reachable from variant, after applying rules
         result = []
-        for e in self.edges:
-            if e.get('from') == variant_id and e.get('type') == 'variant_to_course':
-                to_id = e.get('to')
-                if self._is_transition_allowed(variant_id, to_id):
-                    node = self.nodes.get(to_id)
-                    if node:
-                        result.append(node)
+        # rules were applied when allowed_adjacency was compiled
+        for e in self.edges_from(variant_id, 'variant_to_course', allowed_only=True):
+            node = self.nodes.get(e.get('to'))
+            if node:
+                result.append(node)
         return result
 
     def get_variants_for_stream(self, stream_param: str) -> List[Dict[str, Any]]:
         # Accept either 'stream:science' or 'science'
         stream_id = stream_param if stream_param.startswith('stream:') else f'stream:{stream_param}'
         variants = []
-        for e in self.edges:
-            if e.get('from') == stream_id and e.get('type') == 'stream_to_variant':
-                node = self.nodes.get(e.get('to'))
-                if node:
-                    variants.append(node)
+        for e in self.edges_from(stream_id, 'stream_to_variant'):
+            node = self.nodes.get(e.get('to'))
+            if node:
+                variants.append(node)
         return variants
 
     def course_to_careers(self, course_id: str) -> List[Dict[str, Any]]:
         result = []
-        for e in self.edges:
-            if e.get('from') == course_id and e.get('type') == 'course_to_career':
-                node = self.nodes.get(e.get('to'))
-                if node:
-                    result.append(node)
+        for e in self.edges_from(course_id, 'course_to_career'):
+            node = self.nodes.get(e.get('to'))
+            if node:
+                result.append(node)
         return result
 
     def _is_transition_allowed(self, from_id: str, to_id: str) -> bool:
-        # Apply disallow rules: if any rule has from==from_id and disallow_to_types contains to_id, block
-        for r in self.rules:
-            if r.get('from') == from_id:
-                dis = r.get('disallow_to_types', [])
-                if to_id in dis:
-                    return False
-        # No explicit disallow found
-        return True
+        # Rules are compiled per node at load time, inheriting stream-level rules for variants
+        return self.transition_rules.is_allowed(from_id, to_id)
 
-    def get_paths_for_variant(self, variant_param: str) -> Dict[str, Any]:
-        variant_id = self.normalize_variant_id(variant_param)
+    def _build_paths(self, variant_id: str) -> Dict[str, Any]:
         courses = self.variant_to_courses(variant_id)
         data = []
         for c in courses:
@@ -165,6 +446,99 @@ class CareerData:
             })
         return {'variant': variant_id, 'paths': data}
 
+    def _materialize_paths(self):
+        variant_ids = {n for n in self.nodes if n.startswith('variant:')}
+        variant_ids.update(n for n in self.adjacency if n.startswith('variant:'))
+        view = {vid: self._build_paths(vid) for vid in variant_ids}
+        # swap the whole view in one assignment so readers never see a partial rebuild
+        self.paths_by_variant = view
+
+    def build_route_index(self, previous: Optional[RouteIndex] = None) -> RouteIndex:
+        """(Re)build the route index; with `previous`, only careers whose routes changed are rebuilt."""
+        self.route_index = RouteIndex(self, previous)
+        return self.route_index
+
+    def routes_to(self, career_id: str) -> Tuple[Route, ...]:
+        """Every education -> stream -> variant -> course -> career route to a career."""
+        index = self.route_index or self.build_route_index()
+        return index.routes_to(career_id)
+
+    def build_similarity_index(self) -> SimilarityIndex:
+        """(Re)build the career similarity index."""
+        self.similarity_index = SimilarityIndex(self)
+        return self.similarity_index
+
+    def similar_careers(self, career_id: str, metric: str = 'cosine', limit: Optional[int] = None):
+        """(career id, score, shared features) of the most similar careers, best first."""
+        # concurrent first lookups share one build, which reads every career node
+        index = self.similarity_index or self._similarity_flight.do(
+            'similarity', lambda: self.similarity_index or self.build_similarity_index())
+        return index.similar(career_id, metric, limit)
+
+    def build_reachability_index(self) -> ReachabilityIndex:
+        """(Re)build the reachability bitsets."""
+        self.reachability = ReachabilityIndex(self)
+        return self.reachability
+
+    def reachable(self, reachable_from=(), can_reach=(), mode: str = 'all',
+                  kind: Optional[str] = None) -> List[str]:
+        """Node ids reachable from all/any of `reachable_from` that can reach all/any of `can_reach`.
+
+        Raises ValueError listing the ids the graph does not have.
+        """
+        index = self.reachability or self.build_reachability_index()
+        reachable_from, can_reach = list(reachable_from), list(can_reach)
+        unknown = index.unknown(reachable_from + can_reach)
+        if unknown:
+            raise ValueError(f"Nodes not found: {', '.join(unknown)}")
+        return index.decode(index.query(reachable_from, can_reach, mode, kind))
+
+    @property
+    def next_steps(self) -> NextSteps:
+        """Depth-bounded forward search over this dataset, created on first use."""
+        if self._next_steps is None:
+            self._next_steps = NextSteps(self)
+        return self._next_steps
+
+    @property
+    def route_planner(self) -> RoutePlanner:
+        """Weighted route planner over this dataset, created on first use."""
+        if self._route_planner is None:
+            self._route_planner = RoutePlanner(self)
+        return self._route_planner
+
+    @property
+    def content_hashes(self) -> ContentHashes:
+        """Content hash of every node, edge and versioned record, computed on first use."""
+        if self._content_hashes is None:
+            self._content_hashes = ContentHashes(self)
+        return self._content_hashes
+
+    def carry_over_caches(self, previous: 'CareerData', changes: Dict[str, Any]):
+        """Keep the memoised answers of `previous` that the diff `changes` (see dataset_diff.py) leaves valid."""
+        if previous._next_steps is not None:
+            self.next_steps.carry_over(previous._next_steps, changes)
+        if previous._route_planner is not None:
+            self.route_planner.carry_over(previous._route_planner, changes)
+
+    def get_versioned(self, kind: str, record_id: str) -> Optional[NodeRecord]:
+        """Versioned chatbot record by file id, e.g. get_versioned('careers', 'doctor')."""
+        return self.versioned.get(kind, {}).get(record_id)
+
+    def search_versioned(self, kind: str, query: str) -> List[NodeRecord]:
+        """Versioned records whose display name, description or id contains the query."""
+        query_lower = query.lower()
+        return [record for fields, record in self.search_index.get(kind, [])
+                if any(query_lower in f for f in fields)]
+
+    def get_paths_for_variant(self, variant_param: str) -> Dict[str, Any]:
+        variant_id = self.normalize_variant_id(variant_param)
+        paths = self.paths_by_variant.get(variant_id)
+        if paths is None:
+            # lazy mode, or an unknown variant (which yields {'variant': ..., 'paths': []})
+            return self._build_paths(variant_id)
+        return paths
+
 
 # simple module-level loader
 _loader: CareerData = None
@@ -0,0 +1,173 @@
+"""
+Career Data Hot Reload
+======================
+
+Watches career-data/ and rebuilds the loader + NBA engine in the background
+when a JSON file changes. The new objects are validated before they are
+swapped in; requests already in flight keep the references they started
+with, so they finish on the old snapshot. A failed rebuild leaves the
+current data serving and is reported through status().
+
+Uses watchfiles (inotify/FSEvents, installed with uvicorn[standard]) when
+available and falls back to polling file sizes/mtimes.
+"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dataset_snapshot import stat_fingerprint
+
+try:
+    import watchfiles
+except ImportError:  # optional: fall back to mtime polling
+    watchfiles = None
+
+
+class DataReloader:
+    """
+    Background watcher that rebuilds and atomically swaps the dataset
+
+    Args:
+        current: returns the loader currently serving requests
+        build: builds a fresh (loader, nba_engine) pair
+        swap: installs a validated (loader, nba_engine) pair
+        poll_seconds: polling interval when watchfiles is unavailable
+        after_reload: called with the new loader once a reload has succeeded; its
+            errors are logged and never fail the reload
+    """
+
+    def __init__(self, current: Callable[[], Any], build: Callable[[], Tuple[Any, Any]],
+                 swap: Callable[[Any, Any], None], poll_seconds: float = 2.0,
+                 after_reload: Optional[Callable[[Any], None]] = None):
+        self.current = current
+        self.build = build
+        self.swap = swap
+        self.after_reload = after_reload
+        self.poll_seconds = poll_seconds
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.watcher = 'stopped'
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_at: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[str] = None
+        self.reloading = False
+
+    @staticmethod
+    def validate(loader, nba_engine) -> None:
+        """Raise ValueError if a freshly built dataset is not fit to serve."""
+        if not len(loader.nodes):
+            raise ValueError('no nodes loaded')
+        if not loader.edges:
+            raise ValueError('no graph edges loaded')
+        if not loader.get_streams_for_class('10'):
+            raise ValueError('no streams for class 10')
+        materialized = not (loader.lazy or loader.shared_image)
+        if materialized and not any(p['paths'] for p in loader.paths_by_variant.values()):
+            raise ValueError('no variant has any course path')
+        if nba_engine.loader is not loader:
+            raise ValueError('NBA engine was built for a different loader')
+
+    def reload_now(self) -> Dict[str, Any]:
+        """Rebuild, validate and swap; returns the resulting status."""
+        with self._reload_lock:
+            self.reloading = True
+            started = time.perf_counter()
+            try:
+                loader, nba_engine = self.build()
+                self.validate(loader, nba_engine)
+                self.swap(loader, nba_engine)
+                self.reloads += 1
+                self.last_reload_at = datetime.now().isoformat()
+            except Exception as e:
+                # keep serving the previous dataset
+                self.failures += 1
+                self.last_error = f'{type(e).__name__}: {e}'
+                self.last_error_at = datetime.now().isoformat()
+                print(f"Career data reload failed (still serving previous data): {self.last_error}")
+                loader = None
+            finally:
+                self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.reloading = False
+            if loader is not None and self.after_reload is not None:
+                try:
+                    self.after_reload(loader)
+                except Exception as e:
+                    print(f"Post-reload step failed (reload itself succeeded): {type(e).__name__}: {e}")
+        return self.status()
+
+    def _fingerprint(self) -> str:
+        loader = self.current()
+        return stat_fingerprint(loader.base, loader.source_files())
+
+    def _watch_polling(self):
+        self.watcher = 'polling'
+        seen = self._fingerprint()
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                now = self._fingerprint()
+            except OSError:
+                continue
+            if now != seen:
+                self.reload_now()
+                seen = self._fingerprint()
+
+    def _watch_events(self):
+        self.watcher = 'watchfiles'
+        base = self.current().base
+
+        def is_source(change, path: str) -> bool:
+            # ignore compiled artifacts (snapshot, manifest) written under .build/
+            return path.endswith('.json') and '.build' not in path
+
+        for _changes in watchfiles.watch(base, watch_filter=is_source, stop_event=self._stop):
+            self.reload_now()
+
+    def _run(self):
+        try:
+            if watchfiles is not None:
+                self._watch_events()
+            else:
+                self._watch_polling()
+        except Exception as e:
+            print(f"Career data watcher stopped ({e}); falling back to polling")
+            if not self._stop.is_set():
+                self._watch_polling()
+        finally:
+            self.watcher = 'stopped'
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='career-data-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def status(self) -> Dict[str, Any]:
+        loader = self.current()
+        return {
+            'watcher': self.watcher,
+            'reloading': self.reloading,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_reload_at': self.last_reload_at,
+            'last_duration_ms': self.last_duration_ms,
+            'last_error': self.last_error,
+            'last_error_at': self.last_error_at,
+            'dataset': {
+                'nodes': len(loader.nodes),
+                'edges': len(loader.edges),
+                'version': loader.data_version,
+                'from_snapshot': loader.loaded_from_snapshot,
+            },
+        }
@@ -6,7 +6,11 @@ Ensures data integrity and tracks career information validity
 from enum import Enum
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import os
 import json
+import threading
+
+from node_models import NodeRecord, content_hash
 
 
 class CareerStatus(Enum):
@@ -48,6 +52,85 @@ class DataVersion:
         return False
 
 
+class DataVersionRegistry:
+    """
+    Keeps several data versions loaded at once.
+
+    Every version is a CareerData view over the same graph (see
+    CareerData.with_version); versioned records with identical content are
+    interned by content hash, so a version only costs memory for the records
+    that differ. Choosing a version per request is a dict lookup and changing
+    the default version is a single pointer flip, with no reload.
+    """
+
+    def __init__(self, primary, versions: List[str]):
+        """
+        Args:
+            primary: loaded CareerData; its data_version is the initial default
+            versions: other versions to keep resident (missing directories are skipped)
+        """
+        self._lock = threading.Lock()
+        self.active_version = primary.data_version
+        self.rebind(primary, versions)
+
+    def rebind(self, primary, versions: Optional[List[str]] = None):
+        """Rebuild every resident version on top of a (re)loaded primary dataset."""
+        versions = list(self.versions) if versions is None else versions
+        pool: Dict[str, NodeRecord] = {}
+
+        def intern(record: NodeRecord) -> NodeRecord:
+            return pool.setdefault(content_hash(record), record)
+
+        for records in primary.versioned.values():
+            for record in records.values():
+                intern(record)
+        datasets = {primary.data_version: primary}
+        for version in versions:
+            if version in datasets:
+                continue
+            if not os.path.isdir(os.path.join(primary.base, version)):
+                print(f"Data version {version} not found under {primary.base}; skipping")
+                continue
+            datasets[version] = primary.with_version(version, intern)
+        with self._lock:
+            self.datasets = datasets
+            self.unique_records = len(pool)
+            if self.active_version not in datasets:
+                self.active_version = primary.data_version
+
+    @property
+    def versions(self) -> List[str]:
+        return list(self.datasets)
+
+    def get(self, version: Optional[str] = None):
+        """Dataset for `version` (default: the active one); raises KeyError if not resident."""
+        return self.datasets[version or self.active_version]
+
+    def set_active_version(self, version: str) -> bool:
+        """Make `version` the default for requests that do not ask for one."""
+        with self._lock:
+            if version not in self.datasets:
+                return False
+            self.active_version = version
+        DataVersion.ACTIVE_VERSION = version
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        datasets = self.datasets
+        resident = {version: {id(record) for records in data.versioned.values() for record in records.values()}
+                    for version, data in datasets.items()}
+        versions = {}
+        for version, ids in resident.items():
+            shared = set().union(*(other for v, other in resident.items() if v != version))
+            # records not shared with any other resident version
+            versions[version] = {'records': len(ids), 'own_records': len(ids - shared)}
+        return {
+            'active_version': self.active_version,
+            'unique_records': self.unique_records,
+            'versions': versions,
+        }
+
+
 class CareerStatusManager:
     """
     Manages career information status.
@@ -0,0 +1,180 @@
+"""
+Dataset Diff
+============
+
+Field-level differences between two loaded datasets: nodes, graph edges,
+versioned chatbot records and transition rules. Every item is indexed by its
+content hash once per dataset (see CareerData.content_hashes), so a diff is a
+symmetric difference of two hash tables and only the items whose hash differs
+are compared field by field.
+
+The same diff tells the memoised searches which of their answers a reload
+can keep (see NextSteps.carry_over and RoutePlanner.carry_over).
+
+Usage:
+    python dataset_diff.py v1 v2                      # versioned record sets under career-data/
+    python dataset_diff.py OLD_DIR NEW_DIR            # two career-data checkouts
+    python dataset_diff.py v1 v2 --json               # full field-level report
+"""
+
+import os
+import sys
+import json
+import argparse
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from node_models import content_hash
+
+SECTIONS = ('nodes', 'edges', 'records')
+
+
+def edge_key(edge: Mapping) -> str:
+    """Identity of an edge across versions: its type and ends (edge ids are renumbered between files)."""
+    return f"{edge.get('type')}:{edge['from']}->{edge['to']}"
+
+
+def edge_ends(key: str) -> Tuple[str, str]:
+    """(from, to) of an edge_key."""
+    from_id, to_id = key.split(':', 1)[1].split('->', 1)
+    return from_id, to_id
+
+
+def keyed_edges(edges: Iterable[Mapping]) -> Dict[str, Mapping]:
+    """Edges by edge_key; parallel edges of one type get '#2', '#3', ... suffixes in file order."""
+    keyed: Dict[str, Mapping] = {}
+    for edge in edges:
+        key = base = edge_key(edge)
+        n = 1
+        while key in keyed:
+            n += 1
+            key = f'{base}#{n}'
+        keyed[key] = edge
+    return keyed
+
+
+class ContentHashes:
+    """
+    Content hash of every node, edge and versioned record of one dataset
+
+    Views of another data version share the graph (CareerData.with_version);
+    passing the primary's hashes as `graph` shares the node and edge tables too,
+    so only the version's records are hashed.
+    """
+
+    def __init__(self, loader, graph: Optional['ContentHashes'] = None):
+        if graph is None:
+            self.edge_items = keyed_edges(loader.edges)
+            self.nodes = {node_id: content_hash(node) for node_id, node in loader.nodes.items()}
+            self.edges = {key: content_hash(edge) for key, edge in self.edge_items.items()}
+            self.rules = content_hash({'rules': loader.rules})
+        else:
+            self.edge_items, self.nodes, self.edges, self.rules = (
+                graph.edge_items, graph.nodes, graph.edges, graph.rules)
+        self.records = {f'{kind}/{record_id}': content_hash(record)
+                        for kind, records in loader.versioned.items() for record_id, record in records.items()}
+
+
+def field_changes(old: Mapping, new: Mapping) -> Dict[str, Dict[str, Any]]:
+    """{field: {'old': ..., 'new': ...}} for top-level fields that differ; a missing side is left out."""
+    changes = {}
+    for field in sorted(set(old) | set(new)):
+        if field not in new:
+            changes[field] = {'old': old[field]}
+        elif field not in old:
+            changes[field] = {'new': new[field]}
+        elif old[field] != new[field]:
+            changes[field] = {'old': old[field], 'new': new[field]}
+    return changes
+
+
+def diff_hashed(old_hashes: Dict[str, str], new_hashes: Dict[str, str],
+                old_get: Callable[[str], Mapping], new_get: Callable[[str], Mapping]) -> Dict[str, Any]:
+    """Added, removed and changed keys of two hash tables; changed items are compared field by field."""
+    if old_hashes is new_hashes:
+        return {'added': [], 'removed': [], 'changed': []}
+    # a C-level set operation over (key, hash) pairs; unchanged items are never looked at again
+    differing = sorted({key for key, _ in old_hashes.items() ^ new_hashes.items()})
+    return {
+        'added': [key for key in differing if key not in old_hashes],
+        'removed': [key for key in differing if key not in new_hashes],
+        'changed': [{'id': key, 'fields': field_changes(old_get(key), new_get(key))}
+                    for key in differing if key in old_hashes and key in new_hashes],
+    }
+
+
+def _record_getter(loader) -> Callable[[str], Mapping]:
+    def get(key: str) -> Mapping:
+        kind, record_id = key.split('/', 1)
+        return loader.versioned[kind][record_id]
+    return get
+
+
+def diff_datasets(old, new) -> Dict[str, Any]:
+    """
+    What changed from loader `old` to loader `new`.
+
+    Returns {'nodes', 'edges', 'records'} sections of {'added', 'removed',
+    'changed': [{'id', 'fields'}]} (edges are identified by edge_key, records
+    by '<kind>/<file id>'), 'rules_changed' and a 'summary' of counts.
+    """
+    a, b = old.content_hashes, new.content_hashes
+    changes = {
+        'nodes': diff_hashed(a.nodes, b.nodes, old.nodes.__getitem__, new.nodes.__getitem__),
+        'edges': diff_hashed(a.edges, b.edges, a.edge_items.__getitem__, b.edge_items.__getitem__),
+        'records': diff_hashed(a.records, b.records, _record_getter(old), _record_getter(new)),
+        'rules_changed': a.rules != b.rules,
+    }
+    changes['summary'] = {section: {kind: len(changes[section][kind]) for kind in ('added', 'removed', 'changed')}
+                          for section in SECTIONS}
+    return changes
+
+
+def touched_nodes(changes: Dict[str, Any], content: bool = True) -> Set[str]:
+    """Both ends of every added, removed or changed edge, plus (with `content`) every added, removed or changed node."""
+    touched: Set[str] = set()
+    if content:
+        nodes = changes['nodes']
+        touched.update(nodes['added'], nodes['removed'], (c['id'] for c in nodes['changed']))
+    edges = changes['edges']
+    for key in edges['added'] + edges['removed'] + [c['id'] for c in edges['changed']]:
+        touched.update(edge_ends(key.split('#', 1)[0]))
+    return touched
+
+
+def _load(spec: str, base: str):
+    from data_loader import CareerData
+    if os.path.isdir(spec):
+        return CareerData(spec)
+    return CareerData(base, data_version=spec)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from data_loader import BASE
+
+    parser = argparse.ArgumentParser(description='Compare two career-data versions')
+    parser.add_argument('old', help='data version under --base (e.g. v1) or a career-data directory')
+    parser.add_argument('new', help='data version under --base (e.g. v2) or a career-data directory')
+    parser.add_argument('--base', default=BASE, help='career-data directory holding the versions')
+    parser.add_argument('--json', action='store_true', help='print the full field-level diff as JSON')
+    args = parser.parse_args(argv)
+
+    changes = diff_datasets(_load(args.old, args.base), _load(args.new, args.base))
+    if args.json:
+        print(json.dumps(changes, indent=2, ensure_ascii=False, default=str))
+        return 0
+    for section in SECTIONS:
+        counts = changes['summary'][section]
+        print(f"{section:<8} +{counts['added']} -{counts['removed']} ~{counts['changed']}")
+        for key in changes[section]['added']:
+            print(f'  + {key}')
+        for key in changes[section]['removed']:
+            print(f'  - {key}')
+        for change in changes[section]['changed']:
+            print(f"  ~ {change['id']}: {', '.join(change['fields'])}")
+    if changes['rules_changed']:
+        print('rules    changed')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
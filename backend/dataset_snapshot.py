@@ -0,0 +1,134 @@
+"""
+Dataset Snapshot
+================
+
+Compiles `career-data/` into one binary snapshot holding the loaded nodes,
+edges, rules and every derived index CareerData builds (adjacency, compiled
+transition rules, materialized paths). CareerData reads the snapshot at
+startup instead of parsing each JSON file, as long as the snapshot's content
+hash matches the current source tree.
+
+Usage:
+    python dataset_snapshot.py                  # compile ../career-data
+    python dataset_snapshot.py --base DIR --out FILE
+    python dataset_snapshot.py --shared FILE    # mmap image for multi-worker mode (shared_dataset.py)
+"""
+
+import gc
+import os
+import sys
+import pickle
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional
+
+# Bump whenever the pickled state layout changes; older snapshots are ignored.
+SNAPSHOT_FORMAT_VERSION = 4
+
+
+def source_hash(base: str, files: List[str]) -> str:
+    """sha256 over the relative path and bytes of each source file, in load order."""
+    digest = hashlib.sha256()
+    digest.update(f'format:{SNAPSHOT_FORMAT_VERSION}'.encode())
+    for rel in files:
+        digest.update(b'\0' + rel.encode('utf-8') + b'\0')
+        try:
+            with open(os.path.join(base, *rel.split('/')), 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def stat_fingerprint(base: str, files: List[str]) -> str:
+    """Cheap fingerprint of (path, size, mtime) used to skip re-hashing unchanged trees."""
+    digest = hashlib.sha256()
+    for rel in files:
+        try:
+            st = os.stat(os.path.join(base, *rel.split('/')))
+            digest.update(f'{rel}\0{st.st_size}\0{st.st_mtime_ns}\0'.encode('utf-8'))
+        except FileNotFoundError:
+            digest.update(f'{rel}\0<missing>\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, base: str, files: List[str], state: Dict[str, Any]) -> str:
+    """Write header + state to a temp file and rename it into place; returns the source hash."""
+    content_hash = source_hash(base, files)
+    header = {
+        'format': SNAPSHOT_FORMAT_VERSION,
+        'source_hash': content_hash,
+        'fingerprint': stat_fingerprint(base, files),
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # per-process temp file, so workers writing at once never interleave into one file
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    try:
+        with open(tmp_path, 'wb') as f:
+            # header first, so a stale snapshot is rejected without unpickling the state
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return content_hash
+
+
+def read_snapshot(path: str, base: str, files: List[str]) -> Optional[Dict[str, Any]]:
+    """Return the stored state, or None if the snapshot is missing or stale.
+
+    The snapshot is current when its content hash matches the source files. If
+    no file's size or mtime changed since it was written the hash is trusted
+    without re-reading every file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('format') != SNAPSHOT_FORMAT_VERSION:
+                return None
+            if header.get('fingerprint') != stat_fingerprint(base, files) and \
+                    header.get('source_hash') != source_hash(base, files):
+                return None
+            # the state is one large acyclic object graph; GC passes only slow the unpickle down
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable data snapshot {path}: {e}")
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from data_loader import ACTIVE_DATA_VERSION, BASE, SNAPSHOT_PATH, CareerData
+
+    parser = argparse.ArgumentParser(description='Compile career-data/ into a startup snapshot')
+    parser.add_argument('--base', default=BASE, help='career-data directory')
+    parser.add_argument('--out', default=None, help=f'snapshot file (default: {SNAPSHOT_PATH})')
+    parser.add_argument('--shared', default=None, metavar='FILE',
+                        help='write a shared mmap image (see shared_dataset.py) instead of a snapshot')
+    parser.add_argument('--data-version', default=ACTIVE_DATA_VERSION, help='versioned record set to include')
+    args = parser.parse_args(argv)
+
+    loader = CareerData(args.base, data_version=args.data_version)
+    if args.shared:
+        from shared_dataset import write_image
+        content_hash = write_image(args.shared, loader, loader.source_files())
+        print(f"Wrote {args.shared} ({len(loader.nodes)} nodes, {len(loader.edges)} edges, hash {content_hash[:12]})")
+        return 0
+
+    out = args.out or (SNAPSHOT_PATH if args.base == BASE else os.path.join(args.base, '.build', 'career_data.snapshot'))
+    content_hash = loader.write_snapshot(out)
+    print(f"Wrote {out} ({len(loader.nodes)} nodes, {len(loader.edges)} edges, hash {content_hash[:12]})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Lazy Node Store
+===============
+
+Manifest-backed, read-only node mapping for large datasets. The manifest maps
+each node id to the file that defines it (plus the byte span of the object
+for list files such as careers.json); a node is parsed on first access and
+kept in a bounded LRU, so memory follows the working set rather than the
+size of career-data/.
+
+The manifest is cached next to the data snapshot and reused while the source
+fingerprint/hash still matches (see dataset_snapshot.py).
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dataset_snapshot import source_hash, stat_fingerprint
+from node_models import NodeRecord, make_node
+
+MANIFEST_FORMAT_VERSION = 1
+
+# node id -> (relative file, byte offset, byte length, set 'id' after parsing)
+ManifestEntry = Tuple[str, int, int, bool]
+
+
+def _list_item_spans(raw: bytes) -> List[Tuple[int, int]]:
+    """Byte (offset, length) of every top-level item in a JSON array."""
+    text = raw.decode('utf-8')
+    ascii_only = len(text) == len(raw)
+    decoder = json.JSONDecoder()
+    spans = []
+    idx = text.index('[') + 1
+    byte_pos, char_pos = idx, idx
+    while True:
+        while idx < len(text) and text[idx] in ' \t\r\n,':
+            idx += 1
+        if idx >= len(text) or text[idx] == ']':
+            break
+        _, end = decoder.raw_decode(text, idx)
+        if ascii_only:
+            spans.append((idx, end - idx))
+        else:
+            byte_pos += len(text[char_pos:idx].encode('utf-8'))
+            length = len(text[idx:end].encode('utf-8'))
+            spans.append((byte_pos, length))
+            byte_pos += length
+            char_pos = end
+        idx = end
+    return spans
+
+
+def build_manifest(base: str, node_files: List[str], list_files: List[str]) -> Dict[str, ManifestEntry]:
+    """Scan node files in load order; later files win on id clashes, as in CareerData.load_all."""
+    manifest: Dict[str, ManifestEntry] = {}
+    for rel in node_files:
+        try:
+            with open(os.path.join(base, *rel.split('/')), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            continue
+        data = json.loads(raw)
+        folder = rel.split('/', 1)[0] if '/' in rel else None
+        if isinstance(data, dict):
+            items, spans = [data], [(0, len(raw))]
+        elif isinstance(data, list):
+            items, spans = data, _list_item_spans(raw)
+        else:
+            continue
+        for item, (offset, length) in zip(items, spans):
+            if not isinstance(item, dict):
+                continue
+            if rel in list_files:
+                manifest[item['id']] = (rel, offset, length, False)
+                continue
+            node_id = item.get('id') or item.get('career_id')
+            fix_id = False
+            if node_id and folder == 'careers' and not node_id.startswith('career:'):
+                node_id = f'career:{node_id}'
+                fix_id = True
+            if node_id:
+                manifest[node_id] = (rel, offset, length, fix_id)
+    return manifest
+
+
+def load_or_build_manifest(base: str, files: List[str], node_files: List[str], list_files: List[str],
+                           cache_path: Optional[str]) -> Dict[str, ManifestEntry]:
+    """Reuse the cached manifest when the sources are unchanged, otherwise rebuild and cache it."""
+    fingerprint = stat_fingerprint(base, files)
+    if cache_path:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('format') == MANIFEST_FORMAT_VERSION and (
+                    cached.get('fingerprint') == fingerprint or
+                    cached.get('source_hash') == source_hash(base, files)):
+                return {node_id: tuple(entry) for node_id, entry in cached['entries'].items()}
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    manifest = build_manifest(base, node_files, list_files)
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            # per-process temp file, so workers starting together never interleave into one file
+            tmp_path = f'{cache_path}.tmp{os.getpid()}'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'format': MANIFEST_FORMAT_VERSION,
+                        'fingerprint': fingerprint,
+                        'source_hash': source_hash(base, files),
+                        'entries': manifest,
+                    }, f)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except OSError as e:
+            # read-only data directory: keep the in-memory manifest only
+            print(f"Could not cache node manifest at {cache_path}: {e}")
+    return manifest
+
+
+class LazyNodeStore(Mapping):
+    """
+    Read-only node mapping that parses nodes on first access
+
+    Supports the dict read API used across the app (`get`, `in`, `[]`,
+    iteration, `items()`); parsed nodes live in an LRU of `capacity` entries.
+    `resident` nodes (from files loaded up front) are always held and win
+    over manifest entries with the same id.
+    """
+
+    def __init__(self, base: str, manifest: Dict[str, ManifestEntry], capacity: int = 1024,
+                 resident: Optional[Dict[str, NodeRecord]] = None):
+        self.base = base
+        self.resident = resident or {}
+        self.manifest = {node_id: entry for node_id, entry in manifest.items() if node_id not in self.resident}
+        self.capacity = capacity
+        self._cache: 'OrderedDict[str, NodeRecord]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self, node_id: str) -> NodeRecord:
+        rel, offset, length, fix_id = self.manifest[node_id]
+        with open(os.path.join(self.base, *rel.split('/')), 'rb') as f:
+            f.seek(offset)
+            data = json.loads(f.read(length))
+        return make_node(data, node_id if fix_id else None)
+
+    def __getitem__(self, node_id: str) -> NodeRecord:
+        node = self.resident.get(node_id)
+        if node is not None:
+            return node
+        with self._lock:
+            node = self._cache.get(node_id)
+            if node is not None:
+                self._cache.move_to_end(node_id)
+                self.hits += 1
+                return node
+        node = self._read(node_id)  # raises KeyError for unknown ids
+        with self._lock:
+            self.misses += 1
+            self._cache[node_id] = node
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        return node
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.manifest or node_id in self.resident
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.manifest
+        yield from self.resident
+
+    def __len__(self) -> int:
+        return len(self.manifest) + len(self.resident)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache performance stats, in the same shape as CacheManager.get_stats."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_requests': total,
+            'hit_rate': f"{(self.hits / total * 100) if total else 0:.1f}%",
+            'cached_items': len(self._cache),
+            'capacity': self.capacity,
+        }
@@ -0,0 +1,161 @@
+"""
+LLM Answer Cache
+================
+
+Two-tier cache for LLM answers: an in-memory LRU (L1) in front of a SQLite
+file (L2) that survives restarts and is shared by every worker process on
+the host. Both tiers expire entries after the same TTL; an L2 hit is copied
+into L1. Values are stored as JSON.
+
+Keys are canonical hashes of what the answer depends on (see rank_cache_key),
+so identical requests map to one entry whatever the order of their inputs.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'llm_cache.sqlite3')
+# L2 is pruned (expired rows, then oldest rows over capacity) once every this many writes
+PRUNE_EVERY = 256
+
+
+def canonical_hash(payload: Any) -> str:
+    """sha256 of payload as canonical JSON (sorted keys, no whitespace)."""
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def rank_profile(user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """The profile an /ai/rank prompt is built from: interests sorted, without duplicates."""
+    profile = dict(user_profile)
+    if 'interests' in profile:
+        profile['interests'] = sorted({str(i) for i in (profile['interests'] or [])})
+    return profile
+
+
+def rank_cache_key(model: str, user_profile: Dict[str, Any], candidate_ids: Iterable[Any]) -> str:
+    """Key of an /ai/rank answer: model, the rank_profile and sorted candidate ids.
+
+    Prompts are built from rank_profile too, so requests sharing a key send the same prompt.
+    """
+    return canonical_hash({
+        'kind': 'rank',
+        'model': model,
+        'profile': rank_profile(user_profile),
+        'candidates': sorted({str(c) for c in candidate_ids}),
+    })
+
+
+class LLMCache:
+    """
+    In-memory LRU (L1) backed by SQLite (L2)
+
+    Args:
+        path: SQLite file for L2 (created if missing); None keeps only L1
+        capacity: L1 entries
+        disk_capacity: L2 entries
+        ttl_seconds: lifetime of an entry in both tiers
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, capacity: int = 1024,
+                 disk_capacity: int = 100_000, ttl_seconds: int = 86400):
+        self.path = path
+        self.capacity = capacity
+        self.disk_capacity = disk_capacity
+        self.ttl_seconds = ttl_seconds
+        self._memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # one connection shared by the request threads, serialised by self._lock
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS llm_cache '
+                             '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None when absent or expired in both tiers."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.l1_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute('SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?',
+                                       (key, now)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.l2_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value in both tiers for ttl_seconds."""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is None:
+                return
+            self._db.execute('INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                             (key, json.dumps(value, ensure_ascii=False, default=str), expires_at))
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._prune()
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _prune(self) -> None:
+        self._db.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (time.time(),))
+        self._db.execute('DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache '
+                         'ORDER BY expires_at DESC LIMIT -1 OFFSET ?)', (self.disk_capacity,))
+
+    def clear(self) -> int:
+        """Drop every entry from both tiers. Returns the number of L1 entries cleared."""
+        with self._lock:
+            count = len(self._memory)
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM llm_cache')
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache stats, in the same shape as CacheManager.get_stats plus per-tier hits."""
+        hits = self.l1_hits + self.l2_hits
+        total = hits + self.misses
+        with self._lock:
+            disk_items = (self._db.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+                          if self._db is not None else 0)
+        return {
+            'hits': hits,
+            'misses': self.misses,
+            'total_requests': total,
+            'hit_rate': f"{(hits / total * 100) if total else 0:.1f}%",
+            'cached_items': len(self._memory),
+            'capacity': self.capacity,
+            'l1_hits': self.l1_hits,
+            'l2_hits': self.l2_hits,
+            'disk_items': disk_items,
+            'disk_capacity': self.disk_capacity,
+            'ttl_seconds': self.ttl_seconds,
+        }
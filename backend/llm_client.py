@@ -0,0 +1,268 @@
+"""
+LLM Client
+==========
+
+One shared async HTTP client for the OpenAI-compatible chat completions API.
+Connections are pooled and kept alive between calls, so a request to the LLM
+reuses an open TLS connection instead of handshaking each time, and an
+`await` on the answer holds no worker thread.
+
+main.py opens the client in the app lifespan and closes it on shutdown. The
+pool belongs to the event loop it was opened on; using it from another loop
+raises RuntimeError rather than leaking the first loop's connections.
+
+Every call carries a deadline: the time by which the caller needs an answer
+to still be useful. Waiting for a concurrency slot counts against it. When it
+passes, or the circuit breaker is open after repeated failures, chat() raises
+LLMUnavailable and the caller serves its deterministic answer instead. Only
+the upstream request's timeouts and errors count as breaker failures; a spent
+budget or a full queue says nothing about the LLM's health.
+
+Identical calls in flight at the same time (a class onboarding together) are
+coalesced: duplicates wait for the first one's answer instead of calling the
+API again (see singleflight.py). The first caller's deadline applies to all.
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from config import OPENAI_BASE_URL
+from llm_cache import canonical_hash
+from singleflight import AsyncSingleFlight
+
+
+class LLMUnavailable(Exception):
+    """The LLM was skipped (breaker open) or did not answer before the deadline."""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing service
+
+    Closed: calls go through. After `failure_threshold` consecutive failures
+    it opens and rejects calls for `reset_seconds`; then it is half-open and
+    lets one trial call through, which closes it on success or reopens it.
+
+    Args:
+        failure_threshold: consecutive failures that open the breaker
+        reset_seconds: how long it stays open before a trial call
+        clock: monotonic time source (tests pass a fake one)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at < self.reset_seconds:
+            return 'open'
+        return 'half_open'
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one trial call at a time."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self.trial_running:
+            self.trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.trial_running or self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_running:
+                self.times_opened += 1
+            self.opened_at = self.clock()
+        self.trial_running = False
+
+    def abandon(self) -> None:
+        """The allowed call ended without an outcome (cancelled); a half-open breaker may try again."""
+        self.trial_running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            'state': state,
+            'consecutive_failures': self.consecutive_failures,
+            'times_opened': self.times_opened,
+            'retry_in_seconds': (round(self.opened_at + self.reset_seconds - self.clock(), 1)
+                                 if state == 'open' else 0),
+        }
+
+
+class LLMClient:
+    """
+    Pooled async client for POST {base_url}/chat/completions
+
+    Args:
+        base_url: API root; the OPENAI_BASE_URL environment variable wins when set
+        max_concurrency: calls in flight at most, each on its own kept-alive connection;
+            further calls queue (within their deadline)
+        breaker: circuit breaker shared by all calls (a default one if None)
+    """
+
+    def __init__(self, base_url: str = OPENAI_BASE_URL, max_concurrency: int = 64,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        # one connection per call in flight, all kept alive between calls
+        self.limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self.flight = AsyncSingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._gate: Optional[asyncio.BoundedSemaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.expired = 0
+        self.queue_timeouts = 0
+        self.waiting = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.admitted = 0
+
+    async def start(self) -> None:
+        self._client_for_loop()
+
+    async def aclose(self) -> None:
+        client, self._client, self._gate, self._loop = self._client, None, None, None
+        if client is not None:
+            await client.aclose()
+
+    def _client_for_loop(self) -> httpx.AsyncClient:
+        """The open client, opened on first use when start() was not called."""
+        loop = asyncio.get_running_loop()
+        if self._client is None:
+            # no httpx timeout: the caller's deadline bounds the whole call
+            self._client = httpx.AsyncClient(timeout=None, limits=self.limits)
+            self._gate = asyncio.BoundedSemaphore(self.max_concurrency)
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError('LLMClient is open on another event loop; aclose() it there before reuse')
+        return self._client
+
+    def url(self, path: str) -> str:
+        return os.environ.get('OPENAI_BASE_URL', self.base_url).rstrip('/') + path
+
+    async def chat(self, payload: Dict[str, Any], api_key: str, deadline: float,
+                   flight_key: Optional[str] = None) -> str:
+        """
+        Content of the first choice of a chat completion.
+
+        `deadline` is a time.monotonic() value. Raises LLMUnavailable when the
+        breaker is open or the deadline passes (queueing included), and the
+        HTTP or shape error when the call fails. Concurrent calls with the same
+        `flight_key` (default: the canonical hash of payload) share one API call.
+        """
+        key = flight_key or canonical_hash({'kind': 'chat', 'payload': payload})
+        return await self.flight.do(key, lambda: self._call(payload, api_key, deadline))
+
+    async def _call(self, payload: Dict[str, Any], api_key: str, deadline: float) -> str:
+        self.calls += 1
+        if deadline - time.monotonic() <= 0:
+            # the caller's budget ran out before the call: nothing was asked of the LLM
+            self.expired += 1
+            raise LLMUnavailable('deadline passed before the call')
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise LLMUnavailable(f'circuit breaker {self.breaker.state}')
+        try:
+            client = self._client_for_loop()
+            await self._acquire(deadline)
+        except asyncio.TimeoutError:
+            # every slot stayed busy until the deadline: local load, not an LLM failure
+            self.breaker.abandon()
+            self.queue_timeouts += 1
+            raise LLMUnavailable('no free LLM slot before the deadline') from None
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        try:
+            # only the upstream request is timed and counted by the breaker
+            content = await asyncio.wait_for(self._send(client, payload, api_key),
+                                             deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise LLMUnavailable('no answer before the deadline') from None
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        finally:
+            self._gate.release()
+        self.breaker.record_success()
+        return content
+
+    async def _acquire(self, deadline: float) -> None:
+        """Take a concurrency slot, waiting at most until the deadline (asyncio.TimeoutError)."""
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._gate.acquire(), deadline - queued_at)
+        finally:
+            self.waiting -= 1
+        wait = time.monotonic() - queued_at
+        self.admitted += 1
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    async def _send(self, client: httpx.AsyncClient, payload: Dict[str, Any], api_key: str) -> str:
+        self.in_flight += 1
+        try:
+            resp = await client.post(self.url('/chat/completions'), json=payload,
+                                     headers={'Authorization': f'Bearer {api_key}'})
+        finally:
+            self.in_flight -= 1
+        resp.raise_for_status()
+        return resp.json()['choices'][0]['message']['content']
+
+    def get_stats(self) -> Dict[str, Any]:
+        """API call counts, queueing, coalescing and breaker state. A fallback is any API call that raised."""
+        fallbacks = self.failures + self.timeouts + self.rejected + self.expired + self.queue_timeouts
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+            'expired': self.expired,
+            'fallbacks': fallbacks,
+            'fallback_rate': f"{(fallbacks / self.calls * 100) if self.calls else 0:.1f}%",
+            'open': self._client is not None,
+            'max_connections': self.limits.max_connections,
+            'queue': {
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'timeouts': self.queue_timeouts,
+                'avg_wait_ms': round(self.queue_wait_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+                'max_wait_ms': round(self.queue_wait_max * 1000, 2),
+            },
+            'breaker': self.breaker.get_stats(),
+            'coalescing': self.flight.get_stats(),
+        }
@@ -1,19 +1,145 @@
-from fastapi import FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 import os
-import requests
+import hmac
 import json
-from typing import Optional
+import sqlite3
+import threading
+import time
+from typing import List, Optional
 from pathlib import Path
-from data_loader import CareerData
+from data_loader import CareerData, SNAPSHOT_PATH, SHARED_IMAGE_PATH
+from route_planner import WEIGHT_PROFILES
+from career_similarity import METRICS as SIMILARITY_METRICS
+from subgraph import ALL as SUBGRAPH_ALL, DEFAULT_FIELDS, iter_subgraph_json
+from dataset_diff import diff_datasets
+from ranking import batch_pool, extract_candidates, heuristic_rank, rank_batch, resolve_paths
+from llm_cache import DEFAULT_PATH as LLM_CACHE_DEFAULT_PATH, LLMCache, rank_cache_key, rank_profile
+from llm_client import CircuitBreaker, LLMClient
 from chatbot_nba import NBAEngine
+from data_reload import DataReloader
+from data_versioning import DataVersionRegistry
+from config import (
+    ENABLE_DATA_SNAPSHOT, DATA_LOAD_WORKERS, DATA_LOAD_EXECUTOR, LAZY_NODE_LOADING, LAZY_NODE_CACHE_SIZE,
+    ENABLE_HOT_RELOAD, HOT_RELOAD_POLL_SECONDS, ADMIN_TOKEN, RESIDENT_DATA_VERSIONS, SHARED_DATASET, SHARED_DATASET_PATH,
+    OPENAI_BASE_URL, LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_CAPACITY, LLM_CACHE_DISK_CAPACITY,
+    LLM_CACHE_PATH, LLM_RANK_BUDGET_SECONDS, LLM_CHAT_BUDGET_SECONDS, LLM_MAX_CONCURRENCY, LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SECONDS, BATCH_RANK_MAX_PROFILES, BATCH_RANK_PROCESS_MIN_PROFILES, BATCH_RANK_WORKERS,
+    BATCH_RANK_MAX_CONCURRENT,
+)
+
+
+def _build_loader() -> CareerData:
+    # Load all data (from the compiled snapshot when it is current)
+    return CareerData(snapshot_path=SNAPSHOT_PATH if ENABLE_DATA_SNAPSHOT else None,
+                      load_workers=DATA_LOAD_WORKERS, load_executor=DATA_LOAD_EXECUTOR,
+                      lazy=LAZY_NODE_LOADING, lazy_cache_size=LAZY_NODE_CACHE_SIZE,
+                      shared_image=(SHARED_DATASET_PATH or SHARED_IMAGE_PATH) if SHARED_DATASET else None)
+
+
+def _build_dataset():
+    new_loader = _build_loader()
+    # only careers whose routes changed since the current data are rebuilt
+    new_loader.build_route_index(previous=loader.route_index)
+    new_loader.build_reachability_index()
+    if new_loader.lazy or new_loader.shared_image or loader.lazy or loader.shared_image:
+        # the diff hashes every node, which would parse (lazy) or unpickle (shared) all of them;
+        # memoised searches start empty instead
+        print("Data reloaded; diff and cache carry-over skipped for a lazy or shared node store")
+        return new_loader, NBAEngine(new_loader)
+    # memoised searches keep the answers the changed nodes and edges cannot affect
+    changes = diff_datasets(loader, new_loader)
+    new_loader.carry_over_caches(loader, changes)
+    print(f"Data diff since last load: {changes['summary']}")
+    return new_loader, NBAEngine(new_loader)
+
+
+def _swap_dataset(new_loader: CareerData, new_engine: NBAEngine):
+    # Handlers read these globals once per request, so in-flight requests finish on the old objects
+    global loader, nba_engine
+    versions.rebind(new_loader)
+    loader, nba_engine = new_loader, new_engine
+
+
+def _write_reload_snapshot(new_loader: CareerData):
+    # the next start loads the reloaded data from the snapshot instead of parsing JSON again
+    if not ENABLE_DATA_SNAPSHOT or new_loader.loaded_from_snapshot or new_loader.lazy or new_loader.shared_image:
+        return
+    new_loader.write_snapshot(SNAPSHOT_PATH)
 
-app = FastAPI(title='Career Path API')
-loader = CareerData()  # Create a fresh instance and load all data - Updated with complete career details
+
+# data version requested by the current request (None = the registry's active version)
+_request_version: ContextVar[Optional[str]] = ContextVar('data_version', default=None)
+
+
+async def select_data_version(request: Request):
+    """Pick the data version for this request from ?version= or the X-Data-Version header.
+
+    Versions differ only in their versioned records, which only the chatbot reads,
+    so only routes that call current_data() take this dependency.
+    """
+    version = request.query_params.get('version') or request.headers.get('x-data-version')
+    if version and version not in versions.datasets:
+        raise HTTPException(status_code=404, detail=f'Data version {version} is not loaded')
+    _request_version.set(version)
+
+
+def current_data() -> CareerData:
+    """Dataset for the version selected by this request."""
+    return versions.get(_request_version.get())
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin POST endpoints need the configured token in X-Admin-Token; with none configured they are off."""
+    token = os.environ.get('ADMIN_TOKEN') or ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=403, detail='Admin endpoints are disabled; set ADMIN_TOKEN to enable them')
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail='Invalid admin token')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global rank_pool
+    if ENABLE_HOT_RELOAD or os.environ.get('HOT_RELOAD') == '1':
+        reloader.start()
+    await llm_client.start()
+    rank_pool = batch_pool(BATCH_RANK_WORKERS) if BATCH_RANK_WORKERS > 0 else None
+    yield
+    if rank_pool is not None:
+        rank_pool.shutdown(cancel_futures=True)
+        rank_pool = None
+    await llm_client.aclose()
+    reloader.stop()
+
+
+app = FastAPI(title='Career Path API', lifespan=lifespan)
+loader = _build_loader()  # Create a fresh instance and load all data
+loader.build_route_index()
+loader.build_reachability_index()
 nba_engine = NBAEngine(loader)  # Initialize NBA engine for next-best-action recommendations
+versions = DataVersionRegistry(loader, RESIDENT_DATA_VERSIONS)  # other data versions, sharing loader's graph
+reloader = DataReloader(lambda: loader, _build_dataset, _swap_dataset, poll_seconds=HOT_RELOAD_POLL_SECONDS,
+                        after_reload=_write_reload_snapshot)
+# /ai/rank LLM answers by canonical request hash: in-memory LRU over a SQLite file
+llm_cache = LLMCache(LLM_CACHE_DEFAULT_PATH if LLM_CACHE_PATH is None else LLM_CACHE_PATH or None,
+                     capacity=LLM_CACHE_CAPACITY, disk_capacity=LLM_CACHE_DISK_CAPACITY,
+                     ttl_seconds=LLM_CACHE_TTL_SECONDS) if LLM_CACHE_ENABLED else None
+# pooled keep-alive connections to the LLM API, opened and closed by the lifespan;
+# calls beyond LLM_MAX_CONCURRENCY queue, and the breaker skips the LLM while it keeps failing
+llm_client = LLMClient(OPENAI_BASE_URL, max_concurrency=LLM_MAX_CONCURRENCY,
+                       breaker=CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS))
+# /ai/rank/batch processes, opened and closed by the lifespan (None: batches are scored in the request thread)
+rank_pool = None
+# batches being scored; one more than BATCH_RANK_MAX_CONCURRENT is turned away rather than queued
+batch_slots = threading.BoundedSemaphore(BATCH_RANK_MAX_CONCURRENT)
 # Reload trigger: Software Engineer roadmap updated with detailed phases
 
 # Helpers
@@ -154,71 +280,173 @@ def get_graph():
 
     The response includes `nodes` (dict of id -> node) and `edges` (list).
     """
-    return {'nodes': loader.nodes, 'edges': loader.edges}
+    data = loader
+    return {'nodes': data.nodes, 'edges': list(data.edges)}
 
 
-class RankRequest(BaseModel):
-    user_profile: dict
-    valid_paths: list
+@app.get('/graph/subgraph')
+def get_subgraph(root: str = Query('education:class_10'), depth: int = Query(2, ge=0, le=10),
+                 types: Optional[str] = Query(None), fields: Optional[str] = Query(None)):
+    """
+    The part of the graph within `depth` hops of `root`, in the /graph shape.
 
+    root: a node id, or * for every node (depth is then ignored)
+    types: comma-separated node types to return (e.g. stream,stream_variant,course)
+    fields: comma-separated node fields to return, or * for whole nodes (default id,type,display_name)
 
-@app.post('/ai/rank')
-def ai_rank(req: RankRequest):
-    """Rank provided valid_paths for the given user_profile.
+    The payload is streamed, so size and time scale with the view rather than the dataset.
+    Example: /graph/subgraph?root=variant:mpc&depth=2&types=course,career
+    """
+    data = loader
+    if root != SUBGRAPH_ALL and root not in data.nodes and root not in data.adjacency:
+        raise HTTPException(status_code=404, detail=f'Node {root} not found')
+    type_set = {t.strip() for t in types.split(',') if t.strip()} if types else None
+    if fields == '*':
+        field_list = None
+    elif fields:
+        field_list = [f.strip() for f in fields.split(',') if f.strip()]
+    else:
+        field_list = list(DEFAULT_FIELDS)
+    return StreamingResponse(iter_subgraph_json(data, root, depth, type_set, field_list),
+                             media_type='application/json')
 
-    If OPENAI_API_KEY is set in environment, attempt a controlled AI call.
-    Otherwise, use a deterministic heuristic.
+
+class ReachabilityQuery(BaseModel):
+    reachable_from: List[str] = []
+    can_reach: List[str] = []
+    mode: str = 'all'
+    kind: Optional[str] = None
+
+
+class ReachabilityRequest(BaseModel):
+    queries: List[ReachabilityQuery]
+
+
+@app.post('/graph/reachability')
+def graph_reachability(req: ReachabilityRequest):
     """
+    Batch reachability queries over the rule-filtered graph, answered from precomputed bitsets.
+
+    Each query returns the nodes reachable from all (mode 'all') or any (mode 'any')
+    of `reachable_from` that can reach all/any of `can_reach`, limited to `kind`
+    (an id prefix such as 'career' or 'variant') when given. Examples:
+      {"reachable_from": ["variant:mpc", "variant:bipc"], "kind": "career"}
+      {"can_reach": ["career:doctor"], "kind": "variant"}
+    """
+    data = loader
+    index = data.reachability or data.build_reachability_index()
+    results = []
+    for q in req.queries:
+        if q.mode not in ('all', 'any'):
+            raise HTTPException(status_code=400, detail=f"Unknown mode {q.mode}; use 'all' or 'any'")
+        unknown = index.unknown(q.reachable_from + q.can_reach)
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Nodes not found: {', '.join(unknown)}")
+        nodes = index.decode(index.query(q.reachable_from, q.can_reach, q.mode, q.kind))
+        results.append({'nodes': nodes, 'count': len(nodes)})
+    return {'results': results}
+
+
+class RankRequest(BaseModel):
+    user_profile: dict
+    valid_paths: list = []
+    # ids whose paths the server looks up itself, instead of the client posting them in valid_paths
+    variant_ids: List[str] = []
+    course_ids: List[str] = []
+    career_ids: List[str] = []
+
+
+def _prepare_rank(req: RankRequest, with_llm: bool):
+    """Candidates of a rank request and, `with_llm`, the LLM payload and its cache key."""
     user = req.user_profile
-    paths = req.valid_paths
+    resolved, unknown = resolve_paths(loader, req.variant_ids, req.course_ids, req.career_ids)
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Not found: {', '.join(unknown)}")
+    paths = req.valid_paths + resolved
     
     print(f"[AI RANK] Received {len(paths)} paths for user profile: {user}")
 
     # Extract candidate careers from paths
-    candidates = []
-    for p in paths:
-        # p expected as {course: {...}, careers: [{...}]}
-        course = p.get('course', {})
-        for c in p.get('careers', []):
-            candidates.append({
-                'career_id': c.get('id'),
-                'career_name': c.get('display_name'),
-                'course_id': course.get('id'),
-                'course_name': course.get('display_name'),
-                'skills': c.get('skills', [])
-            })
+    candidates = extract_candidates(paths)
     
     print(f"[AI RANK] Extracted {len(candidates)} candidate careers")
+    if not with_llm:
+        return candidates, None, None
+
+    system = (
+        "You are a safe career guidance assistant. You MUST only evaluate and rank the provided candidate list. "
+        "Do NOT suggest or invent candidates outside the provided list. Reply with JSON only, no extra text."
+    )
+    # in key order, like the candidate ids in the cache key
+    options_text = json.dumps(sorted(candidates, key=lambda c: str(c['career_id'])), ensure_ascii=False)
+    user_text = (
+        "User profile: " + json.dumps(rank_profile(user)) + "\n\n"
+        + "Candidates: " + options_text + "\n\n"
+        + "Task: Rank the candidates by fit to the user profile and provide a short reason for each. "
+        + "Return JSON only in the following schema: {\"ranked\": [{\"career_id\": \"...\", \"career_name\": \"...\", \"score\": 0.0, \"reason\": \"...\"}]}"
+    )
+    payload = {
+        'model': 'gpt-4o-mini',
+        'messages': [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': user_text}
+        ],
+        'temperature': 0.0,
+        'max_tokens': 512
+    }
+    # identical (profile, candidate set) requests reuse the stored answer,
+    # and share one LLM call while it is in flight
+    cache_key = rank_cache_key(payload['model'], user, [c['career_id'] for c in candidates])
+    return candidates, payload, cache_key
+
+
+async def _rank_cache_get(key: str):
+    """Stored /ai/rank answer, or None; an unusable cache (e.g. SQLite 'database is locked') is a miss."""
+    if not llm_cache:
+        return None
+    try:
+        # SQLite I/O under the cache's lock: kept off the event loop
+        return await run_in_threadpool(llm_cache.get, key)
+    except (sqlite3.Error, OSError) as e:
+        print('LLM cache read failed, treated as a miss:', e)
+        return None
+
+
+async def _rank_cache_set(key: str, answer: dict):
+    """Store an /ai/rank answer; a failed write is skipped, the answer is still served."""
+    if not llm_cache:
+        return
+    try:
+        await run_in_threadpool(llm_cache.set, key, answer)
+    except (sqlite3.Error, OSError) as e:
+        print('LLM cache write failed, skipped:', e)
 
+
+@app.post('/ai/rank')
+async def ai_rank(req: RankRequest):
+    """Rank provided valid_paths for the given user_profile.
+
+    Candidates can also be given as variant_ids, course_ids or career_ids
+    (e.g. {"user_profile": {...}, "variant_ids": ["mpc", "bipc"]}); their paths
+    are resolved from the precomputed paths view and added to valid_paths.
+
+    If OPENAI_API_KEY is set in environment, attempt a controlled AI call.
+    Otherwise, use a deterministic heuristic. The heuristic is also the answer
+    when the LLM has not replied within LLM_RANK_BUDGET_SECONDS of the request
+    arriving, fails, or is being skipped by the circuit breaker.
+    """
+    deadline = time.monotonic() + LLM_RANK_BUDGET_SECONDS
+    user = req.user_profile
     # If OPENAI_API_KEY present, call OpenAI Chat Completions with strict instructions
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
-    if OPENAI_API_KEY:
-        system = (
-            "You are a safe career guidance assistant. You MUST only evaluate and rank the provided candidate list. "
-            "Do NOT suggest or invent candidates outside the provided list. Reply with JSON only, no extra text."
-        )
-        options_text = json.dumps(candidates, ensure_ascii=False)
-        user_text = (
-            "User profile: " + json.dumps(user) + "\n\n"
-            + "Candidates: " + options_text + "\n\n"
-            + "Task: Rank the candidates by fit to the user profile and provide a short reason for each. "
-            + "Return JSON only in the following schema: {\"ranked\": [{\"career_id\": \"...\", \"career_name\": \"...\", \"score\": 0.0, \"reason\": \"...\"}]}"
-        )
-        payload = {
-            'model': 'gpt-4o-mini',
-            'messages': [
-                {'role': 'system', 'content': system},
-                {'role': 'user', 'content': user_text}
-            ],
-            'temperature': 0.0,
-            'max_tokens': 512
-        }
+    # path lookups, candidate extraction and prompt building are sync work: off the event loop
+    candidates, payload, cache_key = await run_in_threadpool(_prepare_rank, req, bool(OPENAI_API_KEY))
+    if payload is not None:
+        cached = await _rank_cache_get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            resp = requests.post('https://api.openai.com/v1/chat/completions', json=payload,
-                                 headers={'Authorization': f'Bearer {OPENAI_API_KEY}'}, timeout=15)
-            resp.raise_for_status()
-            body = resp.json()
-            content = body['choices'][0]['message']['content']
+            content = await llm_client.chat(payload, OPENAI_API_KEY, deadline, flight_key=cache_key)
             # Extract JSON substring robustly
             import re
             m = re.search(r"\{[\s\S]*\}", content)
@@ -226,76 +454,88 @@ def ai_rank(req: RankRequest):
                 parsed = json.loads(m.group(0))
                 # basic validation of parsed structure
                 if isinstance(parsed, dict) and 'ranked' in parsed:
+                    await _rank_cache_set(cache_key, parsed)
                     return parsed
         except Exception as e:
             # Log and fall back to deterministic heuristic
             print('AI call failed or returned invalid JSON:', e)
 
     # Heuristic fallback ranking
-    interests = set((user.get('interests') or []))
-    
-    # Deduplicate candidates by career_id
-    seen = {}
-    for c in candidates:
-        career_id = c['career_id']
-        if career_id not in seen:
-            seen[career_id] = c
-    
-    ranked = []
-    for c in seen.values():
-        score = 0
-        name = (c.get('career_name') or '').lower()
-        for it in interests:
-            if it.lower() in name:
-                score += 3
-        # skills match
-        for s in c.get('skills', []):
-            for it in interests:
-                if it.lower() in s.lower():
-                    score += 2
-        
-        # Only include careers with score > 0 or top general careers
-        if score > 0:
-            ranked.append({
-                'career_id': c['career_id'], 
-                'career_name': c['career_name'], 
-                'score': score, 
-                'reason': f"Matches your interests in {', '.join(interests)}"
-            })
-    
-    # If no matches, add top 5 general careers
-    if len(ranked) == 0:
-        for c in list(seen.values())[:5]:
-            ranked.append({
-                'career_id': c['career_id'], 
-                'career_name': c['career_name'], 
-                'score': 0, 
-                'reason': "General career path available to you"
-            })
-    
-    ranked.sort(key=lambda x: -x['score'])
-    # Limit to top 15 results
-    ranked = ranked[:15]
-    return {'ranked': ranked}
+    return await run_in_threadpool(heuristic_rank, user, candidates)
+
+
+def _release_once(semaphore: threading.BoundedSemaphore):
+    """semaphore.release for the first of several callers (the stream's end, the response's background task)."""
+    taken = threading.Lock()
+
+    def release():
+        if taken.acquire(blocking=False):
+            semaphore.release()
+    return release
+
+
+class BatchRankRequest(BaseModel):
+    profiles: List[dict]
+    # one candidate set shared by every profile, given like RankRequest's
+    valid_paths: list = []
+    variant_ids: List[str] = []
+    course_ids: List[str] = []
+    career_ids: List[str] = []
+
+
+@app.post('/ai/rank/batch')
+def ai_rank_batch(req: BatchRankRequest):
+    """Rank one shared candidate set for many user profiles (e.g. a whole class).
+
+    Uses the deterministic /ai/rank heuristic for every profile, scored
+    profiles x candidates at once; batches of BATCH_RANK_PROCESS_MIN_PROFILES
+    or more are spread over the server's pool of BATCH_RANK_WORKERS processes.
+    At most BATCH_RANK_MAX_CONCURRENT batches are scored at once; others get 429.
+
+    Streams NDJSON, one line per profile in request order:
+    {"index": 0, "id": <profile's id, if it has one>, "ranked": [...]}
+
+    Example: {"profiles": [{"id": "s1", "interests": ["biology"]}, ...], "variant_ids": ["bipc"]}
+    """
+    if len(req.profiles) > BATCH_RANK_MAX_PROFILES:
+        raise HTTPException(status_code=413, detail=f'At most {BATCH_RANK_MAX_PROFILES} profiles per batch')
+    resolved, unknown = resolve_paths(loader, req.variant_ids, req.course_ids, req.career_ids)
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Not found: {', '.join(unknown)}")
+    candidates = extract_candidates(req.valid_paths + resolved)
+    pool = rank_pool if len(req.profiles) >= BATCH_RANK_PROCESS_MIN_PROFILES else None
+    if not batch_slots.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail='Too many batch rankings in progress; retry shortly',
+                            headers={'Retry-After': '1'})
+    release = _release_once(batch_slots)
+
+    def lines():
+        try:
+            for index, (profile, result) in enumerate(zip(req.profiles, rank_batch(req.profiles, candidates, pool))):
+                line = {'index': index}
+                if 'id' in profile:
+                    line['id'] = profile['id']
+                line.update(result)
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+        finally:
+            release()
+
+    # the background task frees the slot if the stream never started (e.g. the client left first)
+    return StreamingResponse(lines(), media_type='application/x-ndjson', background=BackgroundTask(release))
+
 
 
 class ChatbotRequest(BaseModel):
     question: str
 
 
-@app.post('/chatbot/ask')
-def chatbot_ask(req: ChatbotRequest):
+def _chatbot_prepare(question: str, data: CareerData) -> dict:
     """
-    🔐 ZERO-HALLUCINATION CHATBOT ENDPOINT
-    
-    Architecture:
-    1. Intent Classification (Rule-based)
-    2. Decision Engine (Determine answer source)
-    3. Answer Source (App data ONLY)
-    4. Response Formatter (Consistent UI)
-    5. Optional GPT Explanation (Rewriting only)
-    
-    CRITICAL: GPT is NEVER the source of truth
+    Steps 1-5 of /chatbot/ask: classify, decide, fetch and format (sync work, for the threadpool)
+
+    Returns {'response': ...} when a search answers the question outright, else
+    the formatted answer with the intent, entities, confidence, decision and
+    fetched data that step 6 and the response metadata need.
     """
     from chatbot_intent import classify_intent
     from chatbot_decision import DecisionEngine
@@ -303,8 +543,6 @@ def chatbot_ask(req: ChatbotRequest):
     from chatbot_formatter import ResponseFormatter
     from chatbot_search import CareerSearch
     
-    question = req.question
-    
     # STEP 1: Classify Intent (Rule-based, deterministic)
     intent_result = classify_intent(question)
     intent = intent_result['intent']
@@ -314,8 +552,8 @@ def chatbot_ask(req: ChatbotRequest):
     # STEP 2: Decision Engine - Decide answer source
     decision = DecisionEngine.decide_source(intent, entities, confidence)
     
-    # Fetch required data based on intent
-    answer_source = AnswerSource(loader)
+    # Fetch required data based on intent; REST and chatbot share one dataset
+    answer_source = AnswerSource(data)
     fetched_data = {}  # Initialize as empty dict
     
     # Check if this is a general search query (mentions stream, career, exam, course)
@@ -324,17 +562,17 @@ def chatbot_ask(req: ChatbotRequest):
     
     if is_search_query and confidence < 0.7:
         # Perform comprehensive search
-        search_results = CareerSearch.comprehensive_search(question)
+        search_results = CareerSearch.comprehensive_search(question, data)
         if search_results['total_results'] > 0:
             formatted = ResponseFormatter.format_search_results(search_results)
-            return {
+            return {'response': {
                 'answer': formatted.get('answer', 'Search completed'),
                 'type': formatted.get('type', 'search_results'),
                 'intent': 'search',
                 'confidence': 0.8,
                 'verified': True,
                 'metadata': formatted.get('metadata', {})
-            }
+            }}
     
     # Fetch required data based on intent
     if intent == 'eligibility_check' and entities.get('career'):
@@ -367,17 +605,17 @@ def chatbot_ask(req: ChatbotRequest):
     # STEP 4: Validate data availability; if missing, try comprehensive search before fallback
     if not fetched_data or not fetched_data.get('available', False):
         print(f"⚠️  No verified data; attempting search. fetched_data={fetched_data}")
-        search_results = CareerSearch.comprehensive_search(question)
+        search_results = CareerSearch.comprehensive_search(question, data)
         if search_results.get('total_results', 0) > 0:
             formatted = ResponseFormatter.format_search_results(search_results)
-            return {
+            return {'response': {
                 'answer': formatted.get('answer', 'Search completed'),
                 'type': formatted.get('type', 'search_results'),
                 'intent': 'search',
                 'confidence': 0.8,
                 'verified': True,
                 'metadata': formatted.get('metadata', {})
-            }
+            }}
         # Use fallback if search also empty
         formatted = ResponseFormatter.format_fallback()
     else:
@@ -395,12 +633,44 @@ def chatbot_ask(req: ChatbotRequest):
             formatted = ResponseFormatter.format_exam_info(fetched_data)
         else:
             formatted = ResponseFormatter.format_fallback()
+
+    return {'formatted': formatted, 'intent': intent, 'entities': entities, 'confidence': confidence,
+            'decision': decision, 'fetched_data': fetched_data}
+
+
+@app.post('/chatbot/ask', dependencies=[Depends(select_data_version)])
+async def chatbot_ask(req: ChatbotRequest):
+    """
+    🔐 ZERO-HALLUCINATION CHATBOT ENDPOINT
+    
+    Architecture:
+    1. Intent Classification (Rule-based)
+    2. Decision Engine (Determine answer source)
+    3. Answer Source (App data ONLY)
+    4. Response Formatter (Consistent UI)
+    5. Optional GPT Explanation (Rewriting only)
+    
+    CRITICAL: GPT is NEVER the source of truth
+
+    The rewrite gets LLM_CHAT_BUDGET_SECONDS from the request arriving;
+    after that the formatted answer is returned as it is.
+    """
+    deadline = time.monotonic() + LLM_CHAT_BUDGET_SECONDS
+    from chatbot_formatter import ResponseFormatter
+
+    # steps 1-5 are sync lookups and formatting: off the event loop, which only awaits the LLM
+    prepared = await run_in_threadpool(_chatbot_prepare, req.question, current_data())
+    if 'response' in prepared:
+        return prepared['response']
+    formatted, intent, entities, confidence, decision, fetched_data = (
+        prepared['formatted'], prepared['intent'], prepared['entities'], prepared['confidence'],
+        prepared['decision'], prepared['fetched_data'])
     
     # STEP 6: Optional GPT Explanation (REWRITING ONLY)
     # Only if decision allows AND OPENAI_API_KEY is set
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     if decision['allow_gpt_explain'] and OPENAI_API_KEY and formatted.get('type') == 'career_card':
-        formatted = ResponseFormatter.apply_gpt_explanation(formatted, OPENAI_API_KEY)
+        formatted = await ResponseFormatter.apply_gpt_explanation(formatted, OPENAI_API_KEY, llm_client, deadline)
     
     # SAFETY GUARDRAIL: Add metadata for transparency
     return {
@@ -459,13 +729,16 @@ def get_eligibility(career_id: str):
 
 
 @app.get('/career/{career_id}/similar')
-def get_similar_careers(career_id: str):
+def get_similar_careers(career_id: str, metric: str = Query('cosine'), limit: int = Query(5, ge=1, le=10)):
     """
-    Get similar careers and alternate options
+    Get similar careers and alternate options, ranked by shared skills, courses,
+    stream paths, exam types and nature (metric: cosine or jaccard)
     
     Example: /career/software_engineer/similar
     """
-    result = nba_engine.get_similar_careers(career_id)
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f'Unknown metric {metric}; use one of {list(SIMILARITY_METRICS)}')
+    result = nba_engine.get_similar_careers(career_id, metric, limit)
     
     if not result.get('available', False):
         raise HTTPException(status_code=404, detail=f'Career {career_id} not found')
@@ -503,6 +776,102 @@ def get_alternate_career_paths(career_id: str):
     return result
 
 
+@app.get('/career/{career_id}/routes')
+def get_career_routes(career_id: str):
+    """
+    Every route from Class 10 to a career: education -> stream -> variant -> course,
+    plus the exams taken after the course (e.g. UPSC); disallowed transitions are excluded
+
+    Example: /career/software_engineer/routes
+    """
+    cid = _norm_id('career', career_id)
+    data = loader
+    career = data.nodes.get(cid)
+    if not career:
+        raise HTTPException(status_code=404, detail=f'Career {career_id} not found')
+
+    def ref(node_id):
+        node = data.nodes.get(node_id) or {}
+        return {'id': node_id, 'name': node.get('display_name', node_id)}
+
+    routes = []
+    for path, exams in data.routes_to(cid):
+        rule = data.transition_rules.rule_for(path[2], path[3]) or {}
+        routes.append({
+            'steps': [ref(node_id) for node_id in path],
+            'exams': [ref(exam_id) for exam_id in exams],
+            'difficulty': rule.get('difficulty'),
+        })
+    return {
+        'career_id': cid,
+        'career_name': career.get('display_name'),
+        'routes': routes,
+        'total_routes': len(routes)
+    }
+
+
+@app.get('/route')
+def get_route(from_id: str = Query(..., alias='from'), to: str = Query(...),
+              k: int = Query(3, ge=1, le=10), profile: str = Query('balanced')):
+    """
+    The k best routes between any two nodes, cheapest first. Each hop costs the
+    duration_years of the node it enters, its entrance exams and its transition
+    difficulty, weighted by `profile` (balanced, fastest, fewest_exams, easiest)
+
+    Example: /route?from=education:class_10&to=career:doctor&k=3
+    """
+    if profile not in WEIGHT_PROFILES:
+        raise HTTPException(status_code=400, detail=f'Unknown profile {profile}; use one of {sorted(WEIGHT_PROFILES)}')
+    data = loader
+    planner = data.route_planner
+    for node_id in (from_id, to):
+        if not planner.has_node(node_id):
+            raise HTTPException(status_code=404, detail=f'Node {node_id} not found')
+
+    def ref(node_id):
+        node = data.nodes.get(node_id) or {}
+        return {'id': node_id, 'name': node.get('display_name', node_id)}
+
+    routes = []
+    for cost, path in planner.routes(from_id, to, k, profile):
+        hops = planner.describe(path, profile)
+        routes.append({
+            'steps': [ref(node_id) for node_id in path],
+            'hops': hops,
+            'cost': round(cost, 3),
+            'duration_years': sum(h['duration_years'] for h in hops),
+            'exams': sum(h['exams'] for h in hops),
+        })
+    return {'from': from_id, 'to': to, 'profile': profile, 'routes': routes, 'total_routes': len(routes)}
+
+
+@app.get('/next-steps')
+def get_next_steps(from_id: str = Query(..., alias='from'), depth: int = Query(2, ge=1, le=4)):
+    """
+    What a student can do from where they are now: every node reachable within `depth`
+    hops of a degree, postgraduate path, course or any other node, nearest first, with
+    the shortest way there (including postgraduate and lateral moves)
+
+    Example: /next-steps?from=degree:btech&depth=2
+    """
+    data = loader
+    if from_id not in data.nodes and from_id not in data.adjacency:
+        raise HTTPException(status_code=404, detail=f'Node {from_id} not found')
+
+    def ref(node_id):
+        node = data.nodes.get(node_id) or {}
+        return {'id': node_id, 'name': node.get('display_name', node_id)}
+
+    options = []
+    for target, path, edge in data.next_steps.options(from_id, depth):
+        node = data.nodes.get(target) or {}
+        option = dict(ref(target), type=node.get('type') or target.split(':', 1)[0], hops=len(path),
+                      path=[ref(node_id) for node_id in path], via=edge.get('type'))
+        option.update((k, edge[k]) for k in ('via_exam', 'feasibility', 'notes') if edge.get(k))
+        options.append(option)
+    return {'from': ref(from_id), 'depth': depth, 'options': options, 'total_options': len(options)}
+
+
 # ------------------------
 # Exam endpoints (for NBA)
 # ------------------------
@@ -547,7 +916,8 @@ def get_exam_syllabus(exam_id: str):
 def get_alternate_exams(career_id: str):
     """Return other exams relevant to the career based on nba_attributes.exam_types."""
     cid = _norm_id('career', career_id)
-    career = loader.nodes.get(cid)
+    data = loader
+    career = data.nodes.get(cid)
     if not career:
         raise HTTPException(status_code=404, detail=f'Career {career_id} not found')
     nba = career.get('attributes', {}).get('nba_attributes', {})
@@ -555,7 +925,7 @@ def get_alternate_exams(career_id: str):
     exams = []
     for et in exam_types:
         eid = _norm_id('exam', et)
-        node = loader.nodes.get(eid)
+        node = data.nodes.get(eid)
         if node:
             exams.append({
                 'id': eid,
@@ -595,14 +965,13 @@ def get_course_structure(course_id: str):
 def get_course_outcomes(course_id: str):
     """Return careers reachable from a course via edges."""
     coid = _norm_id('course', course_id)
-    if coid not in loader.nodes:
+    data = loader
+    if coid not in data.nodes:
         raise HTTPException(status_code=404, detail=f'Course {course_id} not found')
-    outcomes = []
-    for e in loader.edges:
-        if e.get('from') == coid and e.get('type') == 'course_to_career':
-            target = loader.nodes.get(e.get('to'))
-            if target:
-                outcomes.append({'id': target.get('id'), 'name': target.get('display_name')})
+    outcomes = [
+        {'id': target.get('id'), 'name': target.get('display_name')}
+        for target in data.course_to_careers(coid)
+    ]
     return {
         'course_id': coid,
         'career_outcomes': outcomes,
@@ -702,14 +1071,15 @@ def govt_service_posting_growth():
 def get_other_govt_exams(career_id: str):
     """Return other related government exams for the career (basic stub)."""
     cid = _norm_id('career', career_id)
-    node = loader.nodes.get(cid)
+    data = loader
+    node = data.nodes.get(cid)
     if not node:
         raise HTTPException(status_code=404, detail=f'Career {career_id} not found')
     # Minimal related exams set; can be enriched via data
     exams = ['exam:ssc', 'exam:state_psc']
     results = []
     for eid in exams:
-        exnode = loader.nodes.get(eid)
+        exnode = data.nodes.get(eid)
         if exnode:
             results.append({'id': eid, 'name': exnode.get('display_name', eid)})
     return {'career_id': cid, 'career_name': node.get('display_name'), 'other_govt_exams': results}
@@ -761,6 +1131,56 @@ def get_career_work_options(career_id: str):
     }
 
 
+# --------------------------
+# Admin endpoints
+# --------------------------
+
+@app.get('/admin/data-status')
+def admin_data_status():
+    """Return hot-reload watcher state, last reload duration/failure and dataset size."""
+    return reloader.status()
+
+
+@app.post('/admin/data-reload', dependencies=[Depends(require_admin)])
+def admin_data_reload():
+    """Rebuild career data now; the previous data keeps serving if validation fails. Needs X-Admin-Token."""
+    return reloader.reload_now()
+
+
+@app.get('/admin/data-versions')
+def admin_data_versions():
+    """Resident data versions, the default one and how many records each shares."""
+    return versions.status()
+
+
+@app.get('/admin/llm-status')
+def admin_llm_status():
+    """LLM answer cache hit/miss counts per tier and LLM API call counts."""
+    return {'rank_cache': llm_cache.get_stats() if llm_cache else None, 'client': llm_client.get_stats()}
+
+
+@app.get('/admin/data-diff')
+def admin_data_diff(old: str = Query(..., alias='from'), new: str = Query(..., alias='to')):
+    """
+    Field-level diff between two resident data versions: added, removed and
+    changed nodes, edges and versioned records, found by content hash
+
+    Example: /admin/data-diff?from=v1&to=v2
+    """
+    for version in (old, new):
+        if version not in versions.datasets:
+            raise HTTPException(status_code=404, detail=f'Data version {version} is not loaded')
+    return diff_datasets(versions.get(old), versions.get(new))
+
+
+@app.post('/admin/data-versions/active', dependencies=[Depends(require_admin)])
+def admin_set_data_version(active: str = Query(...)):
+    """Switch the default data version for requests that do not choose one. Needs X-Admin-Token."""
+    if not versions.set_active_version(active):
+        raise HTTPException(status_code=404, detail=f'Data version {active} is not loaded')
+    return versions.status()
+
+
 if __name__ == '__main__':
     import uvicorn
     # Production: Render uses PORT environment variable
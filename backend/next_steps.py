@@ -0,0 +1,107 @@
+"""
+Next Steps
+Memoised, depth-bounded "what can I do after this" search from any degree, course or other node
+"""
+
+import threading
+from typing import Any, Dict, Tuple
+
+from dataset_diff import touched_nodes
+
+# (target id, node ids from the start's first step to the target, the edge into the target)
+Option = Tuple[str, Tuple[str, ...], Dict[str, Any]]
+
+MAX_DEPTH = 4
+
+
+class NextSteps:
+    """
+    Everything reachable within `depth` hops, with the shortest way there
+
+    The search follows the rule-filtered adjacency, which includes the
+    degree_to_career, pg_path and lateral_entry edges from the program files.
+    Each node's answers are cached per depth and built from its successors'
+    cached answers, so overlapping queries (every degree leading to pg:mba or
+    pg:phd, say) share work. The cache belongs to one dataset, so a reload,
+    which builds a new instance, invalidates it.
+    """
+
+    def __init__(self, loader, max_depth: int = MAX_DEPTH):
+        self.loader = loader
+        self.max_depth = max_depth
+        # node id -> depth -> options
+        self._cache: Dict[str, Dict[int, Tuple[Option, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def options(self, node_id: str, depth: int) -> Tuple[Option, ...]:
+        """Nodes reachable from node_id within `depth` hops, nearest first (BFS order for ties)."""
+        depth = min(depth, self.max_depth)
+        if depth <= 0:
+            return ()
+        cached = self._cache.get(node_id, {}).get(depth)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        best: Dict[str, Option] = {}
+        edges = self.loader.edges_from(node_id, allowed_only=True)
+        # direct successors first, then what each of them leads to
+        for edge in edges:
+            target = edge['to']
+            if target != node_id and target not in best:
+                best[target] = (target, (target,), edge)
+        for edge in edges:
+            for target, path, last in self.options(edge['to'], depth - 1):
+                current = best.get(target)
+                if target != node_id and (current is None or len(current[1]) > len(path) + 1):
+                    best[target] = (target, (edge['to'],) + path, last)
+        result = tuple(sorted(best.values(), key=lambda option: len(option[1])))
+        with self._lock:
+            self._cache.setdefault(node_id, {})[depth] = result
+        return result
+
+    def carry_over(self, previous: 'NextSteps', changes: Dict[str, Any]):
+        """
+        Copy the answers of `previous` (built on the data before a reload) that
+        `changes` leaves valid. A node's answer at depth d only walks edges out
+        of nodes fewer than d hops away, so it is kept unless the end of a
+        changed edge is that close in either version. Node content is not part
+        of an answer, so edits that leave the edges alone keep everything.
+        """
+        if changes['rules_changed']:
+            return
+        distance = self._distances_to(touched_nodes(changes, content=False), (self.loader, previous.loader))
+        with self._lock:
+            for node_id, by_depth in previous._cache.items():
+                kept = {d: options for d, options in by_depth.items() if distance.get(node_id, d) >= d}
+                if kept:
+                    self._cache.setdefault(node_id, {}).update(kept)
+
+    def _distances_to(self, targets, loaders) -> Dict[str, int]:
+        """Fewest hops from each node to any of `targets` (up to max_depth), over both datasets."""
+        distance = dict.fromkeys(targets, 0)
+        frontier = list(targets)
+        for hops in range(1, self.max_depth):
+            nxt = []
+            for node_id in frontier:
+                for loader in loaders:
+                    for edge in loader.edges_to(node_id):
+                        if edge['from'] not in distance:
+                            distance[edge['from']] = hops
+                            nxt.append(edge['from'])
+            frontier = nxt
+        return distance
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache stats, in the same shape as CacheManager.get_stats."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_requests': total,
+            'hit_rate': f"{(self.hits / total * 100) if total else 0:.1f}%",
+            'cached_items': sum(len(by_depth) for by_depth in self._cache.values()),
+            'cached_nodes': len(self._cache),
+        }
@@ -0,0 +1,186 @@
+"""
+Node Models
+===========
+
+Immutable, slotted records for the nodes held in CareerData.nodes. Each
+record stores its common fields in __slots__ and anything else from the
+source JSON in a small overflow mapping, so a node costs one fixed-size
+object instead of a full dict.
+
+Records are read-only Mappings: `node.get('display_name')`, `node['id']`,
+`'skills' in node`, `dict(node)` and JSON encoding behave as they did with
+raw dicts, and keys iterate in the order of the source JSON. Nested values
+(e.g. `attributes`) are the parsed JSON objects and must be treated as
+read-only as well.
+"""
+
+import json
+import hashlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+# key-order tuples are shared between records loaded from files with the same layout
+_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_layout(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _LAYOUTS.setdefault(keys, keys)
+
+
+def _restore(cls: Type['NodeRecord'], layout: Tuple[str, ...], values: Tuple[Any, ...],
+             extra: Optional[Dict[str, Any]]) -> 'NodeRecord':
+    """Pickle hook; rebuilds a record without going through the mapping constructor."""
+    record = object.__new__(cls)
+    setattr_ = object.__setattr__
+    setattr_(record, '_layout', _intern_layout(layout))
+    setattr_(record, '_extra', extra)
+    for name, value in zip(cls.FIELDS, values):
+        if value is not _MISSING:
+            setattr_(record, name, value)
+    return record
+
+
+class _Missing:
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self):
+        return '<missing>'
+
+
+_MISSING = _Missing()
+
+
+class NodeRecord(Mapping):
+    """
+    Base record: `FIELDS` become slots, all other keys go to the overflow mapping
+
+    Subclasses only declare FIELDS (and matching __slots__).
+    """
+
+    __slots__ = ('_layout', '_extra')
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, data: Dict[str, Any], node_id: Optional[str] = None):
+        setattr_ = object.__setattr__
+        fields = self._FIELD_SET
+        extra = None
+        for key, value in data.items():
+            if key in fields:
+                setattr_(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        keys = tuple(data)
+        if node_id is not None:
+            # careers stored without the 'career:' prefix get the normalized id
+            setattr_(self, 'id', node_id)
+            if 'id' not in data:
+                keys = keys + ('id',)
+        setattr_(self, '_layout', _intern_layout(keys))
+        setattr_(self, '_extra', extra)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout)
+
+    def __len__(self) -> int:
+        return len(self._layout)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        values = tuple(getattr(self, name, _MISSING) for name in self.FIELDS)
+        return _restore, (type(self), self._layout, values, self._extra)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.get("id")!r})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the original JSON key order."""
+        return {key: self[key] for key in self._layout}
+
+
+class Node(NodeRecord):
+    """Fallback for node types without a dedicated record (phases, education levels)."""
+    FIELDS = ('id', 'type', 'display_name', 'description', 'metadata')
+    __slots__ = FIELDS
+
+
+class Career(NodeRecord):
+    FIELDS = ('id', 'type', 'display_name', 'short_description', 'description', 'attributes',
+              'skills', 'roadmap', 'why_path', 'what_to_study', 'metadata')
+    __slots__ = FIELDS
+
+
+class Course(NodeRecord):
+    FIELDS = ('id', 'type', 'display_name', 'attributes', 'metadata')
+    __slots__ = FIELDS
+
+
+class Exam(NodeRecord):
+    FIELDS = ('id', 'type', 'display_name', 'description', 'requires', 'leads_to', 'attributes', 'metadata')
+    __slots__ = FIELDS
+
+
+class Stream(NodeRecord):
+    FIELDS = ('id', 'type', 'display_name', 'short_description', 'description', 'paths', 'metadata')
+    __slots__ = FIELDS
+
+
+class Variant(NodeRecord):
+    FIELDS = ('id', 'type', 'display_name', 'name', 'full_name', 'description', 'stream', 'stream_id',
+              'subjects', 'eligible_after', 'course_eligibility', 'exam_options', 'difficulty_level',
+              'metadata')
+    __slots__ = FIELDS
+
+
+RECORD_TYPES: Dict[str, Type[NodeRecord]] = {
+    'career': Career,
+    'course': Course,
+    'exam': Exam,
+    'stream': Stream,
+    'variant': Variant,
+}
+
+
+def make_node(data: Dict[str, Any], node_id: Optional[str] = None) -> NodeRecord:
+    """Build the record for a parsed node; the id prefix selects the record type."""
+    nid = node_id or data.get('id') or data.get('career_id') or ''
+    cls = RECORD_TYPES.get(nid.split(':', 1)[0], Node)
+    return cls(data, node_id)
+
+
+def content_hash(node: Mapping) -> str:
+    """sha1 of the node's canonical JSON; equal content gives an equal hash regardless of key order."""
+    payload = json.dumps(dict(node), sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
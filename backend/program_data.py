@@ -0,0 +1,59 @@
+"""
+Program Data
+Degree programs, postgraduate paths and lateral transitions as graph nodes and typed edges
+"""
+
+from typing import Any, Dict, List, Tuple
+
+DEGREES_FILE = 'degree_programs.json'
+PG_FILE = 'postgraduate_paths.json'
+LATERAL_FILE = 'lateral_transitions.json'
+# program file -> key of the list it wraps, in load order
+PROGRAM_FILES = {DEGREES_FILE: 'degree_programs', PG_FILE: 'postgraduate_paths', LATERAL_FILE: 'lateral_transitions'}
+
+
+def _edge(edge_type: str, from_id: str, to_id: str, **extra) -> Dict[str, Any]:
+    edge = {'id': f'{edge_type}:{from_id}->{to_id}', 'from': from_id, 'to': to_id, 'type': edge_type}
+    edge.update((k, v) for k, v in extra.items() if v is not None)
+    return edge
+
+
+def degree_edges(program: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """variant -> degree for each stream variant it admits, degree -> career for each career it leads to."""
+    degree_id = program['id']
+    edges = [_edge('variant_to_degree', v, degree_id) for v in program.get('requires_stream_variants', [])]
+    edges += [_edge('degree_to_career', degree_id, c) for c in program.get('leads_to_careers', [])]
+    return edges
+
+
+def pg_edges(path: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """degree -> postgraduate path for each qualifying degree, then pg -> career like a degree."""
+    pg_id = path['id']
+    edges = [_edge('pg_path', d, pg_id) for d in path.get('requires_degree', [])]
+    edges += [_edge('degree_to_career', pg_id, c) for c in path.get('leads_to_careers', [])]
+    return edges
+
+
+def lateral_edges(transition: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One lateral_entry edge per source degree, carrying the exam, feasibility and notes."""
+    target = transition.get('to_career') or transition.get('to_path') or transition.get('to_degree')
+    sources = transition.get('from_degree') or []
+    if isinstance(sources, str):
+        sources = [sources]
+    if not target:
+        return []
+    return [_edge('lateral_entry', source, target, transition_id=transition.get('id'),
+                  via_exam=transition.get('via_exam'), feasibility=transition.get('feasibility'),
+                  notes=transition.get('notes'))
+            for source in sources]
+
+
+def read_program_file(rel: str, data: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(nodes, edges) defined by one parsed program file."""
+    items = data.get(PROGRAM_FILES[rel], []) if isinstance(data, dict) else []
+    items = [item for item in items if isinstance(item, dict)]
+    if rel == LATERAL_FILE:
+        return [], [e for t in items for e in lateral_edges(t)]
+    to_edges = degree_edges if rel == DEGREES_FILE else pg_edges
+    items = [item for item in items if item.get('id')]
+    return items, [e for item in items for e in to_edges(item)]
@@ -0,0 +1,247 @@
+"""
+Career Ranking
+Deterministic /ai/rank heuristic: interest matches in career names and skills,
+scored for all candidates (and, in batches, all profiles) at once over a
+shared term vocabulary
+"""
+
+import os
+import itertools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+NAME_MATCH_POINTS = 3
+SKILL_MATCH_POINTS = 2
+MAX_RANKED = 15
+# shown, with score 0, when no candidate matches any interest
+FALLBACK_COUNT = 5
+# profiles x (vocabulary + skill) cells scored per pass of a batch; bounds the memory of one pass
+BATCH_CELLS = 1_000_000
+# a batch on a process pool is split into at least this many chunks, so the workers finish close together
+POOL_CHUNKS = 16
+
+
+def extract_candidates(paths: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One candidate per (course, career) of the {course: {...}, careers: [{...}]} path objects."""
+    candidates = []
+    for p in paths:
+        course = p.get('course', {})
+        for c in p.get('careers', []):
+            candidates.append({
+                'career_id': c.get('id'),
+                'career_name': c.get('display_name'),
+                'course_id': course.get('id'),
+                'course_name': course.get('display_name'),
+                'skills': c.get('skills', [])
+            })
+    return candidates
+
+
+def resolve_paths(loader, variant_ids: Iterable[str] = (), course_ids: Iterable[str] = (),
+                  career_ids: Iterable[str] = ()) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Path objects ({course, careers}, as /paths returns them) for ids sent
+    instead of the paths themselves, and the ids that were not found.
+
+    A variant contributes its precomputed paths, a course its careers, and a
+    career one path per course leading to it (a course-less one if none does).
+    Ids may omit their 'variant:' / 'course:' / 'career:' prefix.
+    """
+    paths: List[Dict[str, Any]] = []
+    unknown: List[str] = []
+    for raw in variant_ids:
+        variant_id = loader.normalize_variant_id(raw)
+        if variant_id not in loader.nodes and variant_id not in loader.paths_by_variant:
+            unknown.append(raw)
+            continue
+        paths.extend(loader.get_paths_for_variant(variant_id)['paths'])
+    for raw in course_ids:
+        course = loader.nodes.get(raw if raw.startswith('course:') else f'course:{raw}')
+        if course is None:
+            unknown.append(raw)
+            continue
+        paths.append({'course': course, 'careers': loader.course_to_careers(course['id'])})
+    for raw in career_ids:
+        career_id = raw if raw.startswith('career:') else f'career:{raw}'
+        career = loader.nodes.get(career_id)
+        if career is None:
+            unknown.append(raw)
+            continue
+        courses = [loader.nodes.get(e['from']) for e in loader.edges_to(career_id, 'course_to_career')]
+        paths.extend({'course': course, 'careers': [career]} for course in courses if course)
+        if not any(courses):
+            paths.append({'course': {}, 'careers': [career]})
+    return paths, unknown
+
+
+def _intern(strings: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Distinct strings, in first-seen order, and the index of each string among them."""
+    position = {term: i for i, term in enumerate(dict.fromkeys(strings))}
+    return list(position), np.fromiter(map(position.__getitem__, strings), dtype=np.int64, count=len(strings))
+
+
+def interest_weights(interests: Sequence[str], terms: Sequence[str]) -> np.ndarray:
+    """For each term, how many of the (lowercased) interests it contains as a substring.
+
+    Sums the interest x term match matrix over interests; each row is one
+    vectorised substring search over the whole vocabulary.
+    """
+    if not interests or not terms:
+        return np.zeros(len(terms), dtype=np.int64)
+    vocabulary = np.array(terms, dtype=str)
+    matches = np.stack([np.strings.find(vocabulary, interest) >= 0 for interest in interests])
+    return matches.sum(axis=0, dtype=np.int64)
+
+
+class CandidateMatrix:
+    """
+    Candidates prepared once for scoring any number of profiles
+
+    Names and skills are interned into one lowercased vocabulary, so each
+    distinct term is matched against each distinct interest once however many
+    candidates share it. Candidate i's skills are the vocabulary positions
+    skill_index[skill_bounds[i]:skill_bounds[i + 1]].
+    """
+
+    def __init__(self, candidates: Sequence[Dict[str, Any]]):
+        skill_lists = [c.get('skills', []) for c in candidates]
+        names = [c.get('career_name') or '' for c in candidates]
+        terms, index = _intern(names + [s for skills in skill_lists for s in skills])
+        # lowercased once per distinct term rather than once per (term, interest)
+        self.terms = [term.lower() for term in terms]
+        self.name_index = index[:len(names)]
+        self.skill_index = index[len(names):]
+        self.skill_bounds = np.concatenate(([0], np.cumsum([len(skills) for skills in skill_lists]))).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.name_index)
+
+    def scores(self, interest_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """(profiles x candidates) heuristic scores, one row per interest set (see score_candidates)."""
+        lowered = [[it.lower() for it in interests] for interests in interest_sets]
+        distinct, position = _intern([it for interests in lowered for it in interests])
+        # profile x interest counts: two interests equal after lowercasing both count, as in the single-profile loop
+        rows = np.repeat(np.arange(len(lowered)), [len(interests) for interests in lowered])
+        incidence = np.zeros((len(lowered), len(distinct)))
+        np.add.at(incidence, (rows, position), 1)
+        if distinct and self.terms:
+            vocabulary = np.array(self.terms, dtype=str)
+            matches = np.stack([np.strings.find(vocabulary, interest) >= 0 for interest in distinct])
+        else:
+            matches = np.zeros((len(distinct), len(self.terms)))
+        # profile x term weights: how many of the profile's interests each term contains
+        weights = (incidence @ matches).astype(np.int32)
+        # skill weights summed per candidate as differences of a running sum along each row
+        running = np.zeros((len(lowered), len(self.skill_index) + 1), dtype=np.int32)
+        np.cumsum(weights[:, self.skill_index], axis=1, out=running[:, 1:])
+        skill_scores = running[:, self.skill_bounds[1:]] - running[:, self.skill_bounds[:-1]]
+        return (NAME_MATCH_POINTS * weights[:, self.name_index].astype(np.int64)
+                + SKILL_MATCH_POINTS * skill_scores.astype(np.int64))
+
+
+def score_candidates(interests: Iterable[str], candidates: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    Heuristic score per candidate: NAME_MATCH_POINTS for each interest found
+    in the career name, SKILL_MATCH_POINTS for each (skill, interest) pair
+    where the interest is found in the skill, case-insensitively.
+    """
+    return CandidateMatrix(candidates).scores([list(interests)])[0]
+
+
+def unique_candidates(candidates: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """First candidate of each career_id, in candidate order."""
+    seen: Dict[Any, Dict[str, Any]] = {}
+    for c in candidates:
+        seen.setdefault(c['career_id'], c)
+    return list(seen.values())
+
+
+def _top(scores: np.ndarray) -> List[Tuple[int, int]]:
+    """(candidate position, score) of the best MAX_RANKED matches."""
+    # stable, so equal scores keep candidate order
+    return [(i, int(scores[i])) for i in np.argsort(-scores, kind='stable')[:MAX_RANKED].tolist() if scores[i] > 0]
+
+
+def _ranked(interests: Set[str], unique: Sequence[Dict[str, Any]],
+            top: List[Tuple[int, int]]) -> Dict[str, List[Dict[str, Any]]]:
+    # only the returned rows become dicts
+    reason = f"Matches your interests in {', '.join(interests)}"
+    ranked = [{'career_id': unique[i]['career_id'], 'career_name': unique[i]['career_name'],
+               'score': score, 'reason': reason} for i, score in top]
+
+    # If no matches, add top general careers
+    if not ranked:
+        ranked = [{'career_id': c['career_id'], 'career_name': c['career_name'], 'score': 0,
+                   'reason': "General career path available to you"}
+                  for c in unique[:FALLBACK_COUNT]]
+    return {'ranked': ranked}
+
+
+def heuristic_rank(user: Dict[str, Any], candidates: Sequence[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """{'ranked': [...]}: matching careers by score (ties keep candidate order), at most MAX_RANKED;
+    the first FALLBACK_COUNT careers with score 0 when nothing matches."""
+    interests = set((user.get('interests') or []))
+    unique = unique_candidates(candidates)
+    return _ranked(interests, unique, _top(score_candidates(interests, unique)))
+
+
+def _rank_rows(matrix: CandidateMatrix, unique: Sequence[Dict[str, Any]],
+               interest_lists: List[List[str]]) -> List[Dict[str, List[Dict[str, Any]]]]:
+    interest_sets = [set(interests) for interests in interest_lists]
+    scores = matrix.scores(interest_sets)
+    return [_ranked(interests, unique, _top(row)) for interests, row in zip(interest_sets, scores)]
+
+
+def batch_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for rank_batch, meant to be shared by every batch of the server.
+
+    Workers are spawned rather than forked: the server is multithreaded, and a
+    forked child could inherit a lock another thread was holding.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+# the batch a pool worker last scored, so its candidate matrix is built once per batch, not per chunk
+_worker_batch: Optional[Tuple[Tuple[int, int], CandidateMatrix]] = None
+_batch_ids = itertools.count()
+
+
+def _top_chunk(batch_id: Tuple[int, int], unique: List[Dict[str, Any]],
+               interest_lists: List[List[str]]) -> List[List[Tuple[int, int]]]:
+    global _worker_batch
+    if _worker_batch is None or _worker_batch[0] != batch_id:
+        _worker_batch = (batch_id, CandidateMatrix(unique))
+    return [_top(row) for row in _worker_batch[1].scores([set(interests) for interests in interest_lists])]
+
+
+def rank_batch(profiles: Sequence[Dict[str, Any]], candidates: Sequence[Dict[str, Any]],
+               pool: Optional[Executor] = None) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+    """
+    heuristic_rank of every profile against one shared candidate set, in profile order.
+
+    Profiles are scored a chunk at a time, each chunk as one (profiles x
+    candidates) pass of at most BATCH_CELLS profile x (term + skill) cells, so memory
+    stays flat however many profiles there are. With a `pool` (see batch_pool),
+    chunks are spread over its processes.
+    """
+    unique = unique_candidates(candidates)
+    matrix = CandidateMatrix(unique)
+    size = max(1, BATCH_CELLS // max(1, len(matrix.terms) + len(matrix.skill_index)))
+    interest_lists = [list(p.get('interests') or []) for p in profiles]
+    if pool is not None:
+        size = min(size, max(1, -(-len(interest_lists) // POOL_CHUNKS)))
+        starts = range(0, len(interest_lists), size)
+        batch_id = (os.getpid(), next(_batch_ids))
+        # workers score; the rows are worded here, as a spawned worker's sets iterate (and so
+        # would word the reason) in another order. map() keeps submission, so profile, order
+        tops = pool.map(_top_chunk, itertools.repeat(batch_id), itertools.repeat(unique),
+                        (interest_lists[i:i + size] for i in starts))
+        for start, chunk_tops in zip(starts, tops):
+            for interests, top in zip(interest_lists[start:start + size], chunk_tops):
+                yield _ranked(set(interests), unique, top)
+        return
+    for start in range(0, len(interest_lists), size):
+        yield from _rank_rows(matrix, unique, interest_lists[start:start + size])
@@ -0,0 +1,222 @@
+"""
+Reachability Index
+Precomputed descendant / ancestor sets as bitsets over interned node ids, rules applied
+"""
+
+import gc
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+# sets with at most this many members are kept as sorted bit positions, larger ones as an int bitset
+SMALL_SET = 64
+
+Bits = Union[int, Tuple[int, ...]]
+
+
+def _to_int(bits: Union[Bits, Iterable[int]]) -> int:
+    if isinstance(bits, int):
+        return bits
+    if isinstance(bits, tuple) and len(bits) <= SMALL_SET:
+        value = 0
+        for pos in bits:
+            value |= 1 << pos
+        return value
+    positions = np.fromiter(bits, dtype=np.int64)
+    if not len(positions):
+        return 0
+    mask = np.zeros(positions.max() + 1, dtype=bool)
+    mask[positions] = True
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class ReachabilityIndex:
+    """
+    Every node's reachable set and reverse (can-reach) set, over the rule-filtered adjacency
+
+    Node ids are interned to bit positions level by level. Both sets are
+    built in one pass each over the strongly connected components (so a cycle
+    cannot leave a set incomplete) and stored as Python int bitsets, or as a
+    tuple of positions when small. A query is then a few bitwise AND/OR operations:
+
+        careers reachable from both MPC and BiPC:
+            reachable(mpc) & reachable(bipc) & kind('career')
+        stream variants that can still reach career:doctor:
+            can_reach(doctor) & kind('variant')
+    """
+
+    def __init__(self, loader):
+        # the build allocates one list or set per node and frees nothing; GC passes only slow it down
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._build(loader)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _build(self, loader):
+        adjacency = loader.allowed_adjacency
+        ids: List[str] = list(loader.nodes)
+        position = {node_id: i for i, node_id in enumerate(ids)}
+        successors: List[List[int]] = [[] for _ in ids]
+
+        def intern(node_id: str) -> int:
+            pos = position.get(node_id)
+            if pos is None:
+                pos = position[node_id] = len(ids)
+                ids.append(node_id)
+                successors.append([])
+            return pos
+
+        for from_id, by_type in adjacency.items():
+            src = intern(from_id)
+            for edges in by_type.values():
+                successors[src].extend(intern(e['to']) for e in edges)
+
+        # re-intern level by level (education, streams, variants, courses, then careers and exams) so a
+        # node's can-reach set and the masks of the upper kinds only use low bit positions
+        components = self._components(successors)
+        level = [0] * len(ids)
+        for component in reversed(components):
+            depth = max(level[node] for node in component)
+            for node in component:
+                level[node] = depth
+                for nxt in successors[node]:
+                    if nxt not in component and level[nxt] <= depth:
+                        level[nxt] = depth + 1
+        for node, targets in enumerate(successors):
+            if not targets and not level[node]:
+                level[node] = len(ids)  # nodes without edges go last, out of the way of every set
+        order = sorted(range(len(ids)), key=level.__getitem__)
+        renumber = [0] * len(order)
+        for new, old in enumerate(order):
+            renumber[old] = new
+        self.ids = [ids[old] for old in order]
+        self.position = {node_id: pos for pos, node_id in enumerate(self.ids)}
+        successors = [[renumber[dst] for dst in successors[old]] for old in order]
+        components = [[renumber[old] for old in component] for component in components]
+        predecessors: List[List[int]] = [[] for _ in successors]
+        for src, targets in enumerate(successors):
+            for dst in targets:
+                predecessors[dst].append(src)
+
+        # Tarjan emits components sinks first: descendants are complete before their ancestors need them
+        self.forward = self._propagate(components, successors)
+        self.backward = self._propagate(components[::-1], predecessors)
+        # id prefix -> bitset of the nodes of that kind
+        kind_of = np.array([node_id.split(':', 1)[0] for node_id in self.ids])
+        self.kinds: Dict[str, int] = {
+            kind: int.from_bytes(np.packbits(kind_of == kind, bitorder='little').tobytes(), 'little')
+            for kind in dict.fromkeys(kind_of.tolist())
+        }
+
+    @staticmethod
+    def _components(successors: List[List[int]]) -> List[List[int]]:
+        """Strongly connected components (iterative Tarjan), in reverse topological order."""
+        n = len(successors)
+        index, low = [-1] * n, [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                if child < len(successors[node]):
+                    work.append((node, child + 1))
+                    nxt = successors[node][child]
+                    if index[nxt] < 0:
+                        work.append((nxt, 0))
+                    elif on_stack[nxt]:
+                        low[node] = min(low[node], index[nxt])
+                    continue
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    @staticmethod
+    def _propagate(components: List[List[int]], neighbors: List[List[int]]) -> List[Bits]:
+        """Union of neighbours and their sets, visiting components so neighbours come first."""
+        sets: List[Bits] = [()] * len(neighbors)
+        for component in components:
+            small, big = set(), 0
+            # members of a cycle share one set: each reaches the others, itself and all they reach
+            for node in component:
+                for nxt in neighbors[node]:
+                    small.add(nxt)
+                    reach = sets[nxt]
+                    if isinstance(reach, int):
+                        big |= reach
+                    else:
+                        small.update(reach)
+            stored = big | _to_int(small) if big or len(small) > SMALL_SET else tuple(sorted(small))
+            for node in component:
+                sets[node] = stored
+        return sets
+
+    def _bits(self, table: List[Bits], node_ids: Iterable[str], mode: str) -> int:
+        result: Optional[int] = None
+        for node_id in node_ids:
+            bits = _to_int(table[self.position[node_id]])
+            if result is None:
+                result = bits
+            else:
+                result = result & bits if mode == 'all' else result | bits
+        return result or 0
+
+    def mask(self, node_ids: Iterable[str]) -> int:
+        """Bitset of the given nodes; ids the index does not know are skipped."""
+        return _to_int(tuple(sorted(self.position[n] for n in node_ids if n in self.position)))
+
+    def unknown(self, node_ids: Iterable[str]) -> List[str]:
+        return [node_id for node_id in node_ids if node_id not in self.position]
+
+    def query(self, reachable_from: Iterable[str] = (), can_reach: Iterable[str] = (),
+              mode: str = 'all', kind: Optional[str] = None) -> int:
+        """Bitset of nodes reachable from all (mode 'all') or any ('any') of `reachable_from`,
+        that can reach all/any of `can_reach`, optionally limited to one id prefix."""
+        reachable_from, can_reach = list(reachable_from), list(can_reach)
+        result = -1  # every bit set
+        if reachable_from:
+            result &= self._bits(self.forward, reachable_from, mode)
+        if can_reach:
+            result &= self._bits(self.backward, can_reach, mode)
+        if kind:
+            result &= self.kinds.get(kind, 0)
+        elif result < 0:
+            result &= (1 << len(self.ids)) - 1
+        return result
+
+    def decode(self, bits: int) -> List[str]:
+        """Node ids of the set bits, in interning order."""
+        if not bits:
+            return []
+        if bits.bit_count() <= SMALL_SET:
+            positions = []
+            while bits:
+                low = bits & -bits
+                positions.append(low.bit_length() - 1)
+                bits ^= low
+            return [self.ids[pos] for pos in positions]
+        raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+        positions = np.flatnonzero(np.unpackbits(raw, bitorder='little'))
+        return [self.ids[pos] for pos in positions]
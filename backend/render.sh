@@ -7,4 +7,7 @@ echo "Building Career Navigator Backend for Render..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# Compile career-data/ into the startup snapshot (see dataset_snapshot.py)
+python dataset_snapshot.py
+
 echo "Build completed successfully!"
@@ -0,0 +1,127 @@
+"""
+Route Index
+Precomputed education -> stream -> variant -> course (-> exam) -> career routes, per career
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+# (education, stream, variant) ids
+Prefix = Tuple[str, str, str]
+# (node ids education .. career, exams taken between the course and the career)
+Route = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+class RouteIndex:
+    """
+    All routes from a class level to every career, with transition rules applied
+
+    Routes are built from the rule-filtered adjacency (CareerData.edges_from
+    with allowed_only), so a disallowed hop never appears in a route. The
+    index keeps the per-course pieces a route is made of (the
+    education/stream/variant prefixes that reach it, its course_to_exam
+    exams and its careers). When built with the `previous` index after a data
+    reload, they are compared to rebuild only the careers whose routes changed.
+
+    A course's exams are not a career's: routes_to keeps only those the career
+    requires (its exam_required and nba_attributes.exam_types). Careers no
+    course_to_career edge reaches are routed through their own course_ids.
+    Both need the career node, so they are resolved per career on first lookup.
+    """
+
+    def __init__(self, loader, previous: Optional['RouteIndex'] = None):
+        self.loader = loader
+        # career -> routes with its own exams, filled by routes_to
+        self._resolved: Dict[str, Tuple[Route, ...]] = {}
+        self.course_prefixes = self._course_prefixes(loader)
+        self.course_exams: Dict[str, Tuple[str, ...]] = {}
+        self.course_careers: Dict[str, Tuple[str, ...]] = {}
+        for course_id in self._course_ids(loader):
+            self.course_exams[course_id] = tuple(
+                e['to'] for e in loader.edges_from(course_id, 'course_to_exam', allowed_only=True))
+            self.course_careers[course_id] = tuple(
+                e['to'] for e in loader.edges_from(course_id, 'course_to_career', allowed_only=True))
+
+        # career -> courses leading to it, in course order
+        career_courses: Dict[str, List[str]] = {}
+        for course_id, careers in self.course_careers.items():
+            for career_id in careers:
+                career_courses.setdefault(career_id, []).append(course_id)
+        self.career_courses = career_courses
+
+        if previous is None:
+            stale = set(career_courses)
+            self.routes: Dict[str, Tuple[Route, ...]] = {}
+        else:
+            stale = self._changed_careers(previous)
+            self.routes = {cid: routes for cid, routes in previous.routes.items()
+                           if cid not in stale and cid in career_courses}
+        for career_id in stale:
+            routes = self._build_routes(career_id)
+            if routes:
+                self.routes[career_id] = routes
+        self.rebuilt = len(stale)
+
+    @staticmethod
+    def _course_ids(loader) -> List[str]:
+        return [node_id for node_id in loader.adjacency if node_id.startswith('course:')]
+
+    @staticmethod
+    def _course_prefixes(loader) -> Dict[str, Tuple[Prefix, ...]]:
+        prefixes: Dict[str, List[Prefix]] = {}
+        educations = [n for n in loader.adjacency if n.startswith('education:')]
+        for edu in educations:
+            for s in loader.edges_from(edu, 'education_to_stream', allowed_only=True):
+                for v in loader.edges_from(s['to'], 'stream_to_variant', allowed_only=True):
+                    for c in loader.edges_from(v['to'], 'variant_to_course', allowed_only=True):
+                        prefixes.setdefault(c['to'], []).append((edu, s['to'], v['to']))
+        return {course_id: tuple(p) for course_id, p in prefixes.items()}
+
+    def _build_routes(self, career_id: str) -> Tuple[Route, ...]:
+        routes = []
+        for course_id in self.career_courses.get(career_id, []):
+            exams = self.course_exams.get(course_id, ())
+            for prefix in self.course_prefixes.get(course_id, ()):
+                routes.append((prefix + (course_id, career_id), exams))
+        return tuple(routes)
+
+    def _changed_careers(self, previous: 'RouteIndex') -> Set[str]:
+        """Careers whose routes may differ from `previous`: anything fed by a changed course."""
+        courses = set(self.course_careers) | set(previous.course_careers)
+        changed_courses = {
+            c for c in courses
+            if self.course_prefixes.get(c) != previous.course_prefixes.get(c)
+            or self.course_exams.get(c) != previous.course_exams.get(c)
+            or self.course_careers.get(c) != previous.course_careers.get(c)
+        }
+        stale: Set[str] = set()
+        for course_id in changed_courses:
+            stale.update(self.course_careers.get(course_id, ()))
+            stale.update(previous.course_careers.get(course_id, ()))
+        # a career's course order also changes when its courses are reordered
+        stale.update(cid for cid, courses in self.career_courses.items()
+                     if courses != previous.career_courses.get(cid))
+        return stale
+
+    def routes_to(self, career_id: str) -> Tuple[Route, ...]:
+        routes = self._resolved.get(career_id)
+        if routes is None:
+            routes = self._resolved[career_id] = self._resolve(career_id)
+        return routes
+
+    def _resolve(self, career_id: str) -> Tuple[Route, ...]:
+        attrs = (self.loader.nodes.get(career_id) or {}).get('attributes') or {}
+        required = required_exams(attrs)
+        routes = self.routes.get(career_id, ())
+        if career_id not in self.career_courses:
+            routes = tuple((prefix + (course_id, career_id), self.course_exams.get(course_id, ()))
+                           for course_id in attrs.get('course_ids') or []
+                           for prefix in self.course_prefixes.get(course_id, ()))
+        return tuple((path, tuple(e for e in exams if e in required)) for path, exams in routes)
+
+
+def required_exams(attrs) -> Set[str]:
+    """Exam ids a career's attributes require: exam_required plus nba_attributes.exam_types."""
+    required = attrs.get('exam_required') or []
+    exams = {required} if isinstance(required, str) else set(required)
+    exams.update(f'exam:{t}' for t in (attrs.get('nba_attributes') or {}).get('exam_types') or [])
+    return exams
@@ -0,0 +1,207 @@
+"""
+Route Planner
+Weighted k-shortest routes between any two nodes (Dijkstra + Yen)
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from dataset_diff import touched_nodes
+from singleflight import SingleFlight
+
+# Relative weight of each edge feature; a fixed hop cost keeps zero-weight edges from looping
+WEIGHT_PROFILES: Dict[str, Dict[str, float]] = {
+    'balanced': {'duration': 1.0, 'exams': 1.0, 'difficulty': 1.0},
+    'fastest': {'duration': 3.0, 'exams': 0.5, 'difficulty': 0.5},
+    'fewest_exams': {'duration': 0.5, 'exams': 3.0, 'difficulty': 1.0},
+    'easiest': {'duration': 0.5, 'exams': 1.0, 'difficulty': 3.0},
+}
+HOP_COST = 0.1
+
+# transition rule / edge difficulty, and lateral transition feasibility, on a common 0-4 scale
+DIFFICULTY_LEVELS = {'easy': 0, 'possible': 1, 'medium': 1, 'moderate': 1, 'limited': 2, 'hard': 3, 'very_rare': 4}
+FEASIBILITY_LEVELS = {'very high': 0, 'high': 1, 'medium': 2, 'low': 3, 'very low': 4}
+
+# (duration_years, entrance exams, difficulty) of one edge
+Features = Tuple[float, int, int]
+Path = Tuple[str, ...]
+
+
+class RoutePlanner:
+    """
+    k best routes over the rule-filtered adjacency (mapped edges plus degree, pg and lateral_entry edges)
+
+    Edge cost = HOP_COST + weighted duration_years of the node entered, entrance
+    exams on the edge and transition difficulty (see WEIGHT_PROFILES). Edge
+    features are computed once per node as it is first expanded; answers are
+    memoised (LRU) per (from, to, k, profile) for the lifetime of the dataset;
+    a reload builds a new planner, which keeps the answers the data diff cannot
+    have changed (see carry_over).
+    """
+
+    def __init__(self, loader, cache_size: int = 4096):
+        self.loader = loader
+        self.cache_size = cache_size
+        self._features: Dict[str, List[Tuple[str, Features, Dict[str, Any]]]] = {}
+        self._memo: 'OrderedDict[Tuple[str, str, int, str], Tuple[Tuple[float, Path], ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # concurrent misses for the same query (threadpool requests) search once
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def routes(self, source: str, target: str, k: int, profile: str) -> Tuple[Tuple[float, Path], ...]:
+        """The k cheapest routes source -> target under a weight profile, as (cost, path), cheapest first."""
+        key = (source, target, k, profile)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        found = self._flight.do(key, lambda: self._k_shortest(source, target, k, profile))
+        with self._lock:
+            self._memo[key] = found
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return found
+
+    def carry_over(self, previous: 'RoutePlanner', changes: Dict[str, Any]):
+        """
+        Copy the memoised routes of `previous` (built on the data before a reload)
+        that `changes` leaves valid: a from -> to answer is kept unless, in either
+        version, a touched node (see dataset_diff.touched_nodes) lies on some
+        path between them. Needs both datasets' reachability indexes.
+        """
+        indexes = (self.loader.reachability, previous.loader.reachability)
+        if changes['rules_changed'] or None in indexes:
+            return
+        touched = touched_nodes(changes)
+        masks = [index.mask(touched) for index in indexes]
+
+        def affected(source: str, target: str) -> bool:
+            if source in touched or target in touched:
+                return True
+            return any(index.query([source], [target]) & mask for index, mask in zip(indexes, masks)
+                       if not index.unknown((source, target)))
+
+        with self._lock:
+            for key, found in previous._memo.items():
+                if len(self._memo) < self.cache_size and not affected(key[0], key[1]):
+                    self._memo[key] = found
+
+    def has_node(self, node_id: str) -> bool:
+        loader = self.loader
+        return node_id in loader.nodes or node_id in loader.adjacency or node_id in loader.reverse_adjacency
+
+    def _edge_features(self, edge: Dict[str, Any]) -> Features:
+        target = self.loader.nodes.get(edge['to']) or {}
+        attrs = target.get('attributes') or {}
+        duration = attrs.get('duration_years', target.get('duration_years', 0))
+        duration = duration if isinstance(duration, (int, float)) else 0
+        # one entrance exam admits to a course, whichever of its entry_exams it is
+        exams = int(bool(edge.get('via_exam'))) + int(edge['to'].startswith('exam:'))
+        exams += int(bool(attrs.get('entry_exams') or target.get('entry_exams')))
+        rule = self.loader.transition_rules.rule_for(edge['from'], edge['to']) or {}
+        level = rule.get('difficulty') or edge.get('difficulty')
+        difficulty = DIFFICULTY_LEVELS.get(str(level).lower(), 0) if level else 0
+        if edge.get('feasibility'):
+            difficulty = max(difficulty, FEASIBILITY_LEVELS.get(edge['feasibility'].lower(), 0))
+        return float(duration), exams, difficulty
+
+    def _neighbors(self, node_id: str) -> List[Tuple[str, Features, Dict[str, Any]]]:
+        neighbors = self._features.get(node_id)
+        if neighbors is None:
+            edges = self.loader.edges_from(node_id, allowed_only=True)
+            neighbors = [(e['to'], self._edge_features(e), e) for e in edges]
+            self._features[node_id] = neighbors
+        return neighbors
+
+    @staticmethod
+    def _cost(features: Features, weights: Dict[str, float]) -> float:
+        duration, exams, difficulty = features
+        return (HOP_COST + weights['duration'] * duration + weights['exams'] * exams
+                + weights['difficulty'] * difficulty)
+
+    def _edge(self, from_id: str, to_id: str, weights: Dict[str, float]) -> Tuple[float, Dict[str, Any], Features]:
+        """Cheapest of the parallel edges from_id -> to_id."""
+        return min(((self._cost(f, weights), e, f) for t, f, e in self._neighbors(from_id) if t == to_id),
+                   key=lambda c: c[0])
+
+    def _dijkstra(self, source: str, target: str, weights: Dict[str, float],
+                  banned_nodes: Set[str], banned_edges: Set[Tuple[str, str]]) -> Optional[Tuple[float, Path]]:
+        dist = {source: 0.0}
+        prev: Dict[str, str] = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == target:
+                path = [node]
+                while path[-1] != source:
+                    path.append(prev[path[-1]])
+                return d, tuple(reversed(path))
+            if d > dist.get(node, float('inf')):
+                continue
+            for to_id, features, _ in self._neighbors(node):
+                if to_id in banned_nodes or (node, to_id) in banned_edges:
+                    continue
+                nd = d + self._cost(features, weights)
+                if nd < dist.get(to_id, float('inf')):
+                    dist[to_id] = nd
+                    prev[to_id] = node
+                    heapq.heappush(heap, (nd, to_id))
+        return None
+
+    def _path_cost(self, path: Path, weights: Dict[str, float]) -> float:
+        return sum(self._edge(a, b, weights)[0] for a, b in zip(path, path[1:]))
+
+    def _k_shortest(self, source: str, target: str, k: int, profile: str) -> Tuple[Tuple[float, Path], ...]:
+        """Yen's algorithm: loopless routes in increasing cost order."""
+        weights = WEIGHT_PROFILES[profile]
+        first = self._dijkstra(source, target, weights, set(), set())
+        if first is None:
+            return ()
+        found = [first]
+        candidates: List[Tuple[float, Path]] = []
+        seen = {first[1]}
+        while len(found) < k:
+            last = found[-1][1]
+            for i in range(len(last) - 1):
+                spur, root = last[i], last[:i + 1]
+                banned_edges = {(p[i], p[i + 1]) for _, p in found if p[:i + 1] == root and len(p) > i + 1}
+                spur_result = self._dijkstra(spur, target, weights, set(root[:-1]), banned_edges)
+                if spur_result is None:
+                    continue
+                path = root[:-1] + spur_result[1]
+                if path not in seen:
+                    seen.add(path)
+                    heapq.heappush(candidates, (self._path_cost(path, weights), path))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+        return tuple(found)
+
+    def describe(self, path: Path, profile: str) -> List[Dict[str, Any]]:
+        """Per-hop breakdown of a route: edge type and the features behind its cost."""
+        weights = WEIGHT_PROFILES[profile]
+        hops = []
+        for a, b in zip(path, path[1:]):
+            cost, edge, (duration, exams, difficulty) = self._edge(a, b, weights)
+            hops.append({'from': a, 'to': b, 'type': edge.get('type'), 'duration_years': duration,
+                         'exams': exams, 'difficulty': difficulty, 'cost': round(cost, 3)})
+        return hops
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memo stats, in the same shape as CacheManager.get_stats."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_requests': total,
+            'hit_rate': f"{(self.hits / total * 100) if total else 0:.1f}%",
+            'cached_items': len(self._memo),
+            'capacity': self.cache_size,
+        }
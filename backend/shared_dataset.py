@@ -0,0 +1,288 @@
+"""
+Shared Dataset Image
+====================
+
+Read-only, memory-mapped form of a loaded CareerData for multi-worker
+deployments. The nodes, edges and adjacency indexes are written once into a
+single image file; every worker mmaps the same file, so the pages live in
+the OS page cache once instead of once per worker. Values are pickled per
+key and unpickled on access (with a small per-worker LRU); lookups binary
+search a sorted key table inside the mapping, so no per-worker dict of all
+ids is built either.
+
+Small state (rules, compiled transition rules, class levels, versioned
+chatbot records) is unpickled into each worker.
+
+Image layout (little endian):
+    magic 'CDSHMIMG' | header offset (Q) | sections... | pickled header
+    map section:  n (Q) | insertion order n*(I) | sorted entries n*(QIQI) | keys | values
+    list section: n (Q) | entries n*(QI) | values
+
+Place the image on /dev/shm (SHARED_DATASET_PATH) to keep it in shared
+memory rather than a regular file.
+"""
+
+import os
+import sys
+import mmap
+import pickle
+import struct
+import subprocess
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dataset_snapshot import source_hash, stat_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, concurrent builds just race on os.replace
+    fcntl = None
+
+IMAGE_MAGIC = b'CDSHMIMG'
+IMAGE_FORMAT_VERSION = 3
+
+# attributes stored as shared, mmap-backed sections
+MAP_SECTIONS = ('nodes', 'adjacency', 'reverse_adjacency', 'allowed_adjacency')
+LIST_SECTIONS = ('edges',)
+# small attributes unpickled into every worker
+META_ATTRS = ('rules', 'class_levels', 'transition_rules', 'versioned', 'search_index')
+
+_COUNT = struct.Struct('<Q')
+_ORDER = struct.Struct('<I')
+_MAP_ENTRY = struct.Struct('<QIQI')  # key offset, key length, value offset, value length
+_LIST_ENTRY = struct.Struct('<QI')  # value offset, value length
+
+
+def _dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _SectionWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write_map(self, mapping: Mapping) -> Tuple[int, int]:
+        start = self.f.tell()
+        keys = [k.encode('utf-8') for k in mapping]
+        values = [_dumps(v) for v in mapping.values()]
+        n = len(keys)
+        order = sorted(range(n), key=keys.__getitem__)
+        rank = [0] * n
+        for pos, idx in enumerate(order):
+            rank[idx] = pos
+        table_size = _COUNT.size + n * _ORDER.size + n * _MAP_ENTRY.size
+        key_base = start + table_size
+        value_base = key_base + sum(map(len, keys))
+        key_offsets, value_offsets = [], []
+        pos = key_base
+        for k in keys:
+            key_offsets.append(pos)
+            pos += len(k)
+        pos = value_base
+        for v in values:
+            value_offsets.append(pos)
+            pos += len(v)
+
+        self.f.write(_COUNT.pack(n))
+        self.f.write(b''.join(_ORDER.pack(r) for r in rank))
+        self.f.write(b''.join(_MAP_ENTRY.pack(key_offsets[i], len(keys[i]), value_offsets[i], len(values[i]))
+                              for i in order))
+        self.f.writelines(keys)
+        self.f.writelines(values)
+        return start, self.f.tell() - start
+
+    def write_list(self, items: List[Any]) -> Tuple[int, int]:
+        start = self.f.tell()
+        values = [_dumps(v) for v in items]
+        pos = start + _COUNT.size + len(values) * _LIST_ENTRY.size
+        self.f.write(_COUNT.pack(len(values)))
+        entries = []
+        for v in values:
+            entries.append(_LIST_ENTRY.pack(pos, len(v)))
+            pos += len(v)
+        self.f.write(b''.join(entries))
+        self.f.writelines(values)
+        return start, self.f.tell() - start
+
+
+def write_image(path: str, loader, files: List[str]) -> str:
+    """Write a fully loaded CareerData as a shared image; returns the source hash."""
+    content_hash = source_hash(loader.base, files)
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        # sections follow the magic and a placeholder for the header offset
+        f.write(IMAGE_MAGIC + _COUNT.pack(0))
+        writer = _SectionWriter(f)
+        sections = {}
+        for name in MAP_SECTIONS:
+            sections[name] = ('map',) + writer.write_map(getattr(loader, name))
+        for name in LIST_SECTIONS:
+            sections[name] = ('list',) + writer.write_list(getattr(loader, name))
+        meta = _dumps({attr: getattr(loader, attr) for attr in META_ATTRS})
+        sections['meta'] = ('blob', f.tell(), len(meta))
+        f.write(meta)
+        header = _dumps({
+            'format': IMAGE_FORMAT_VERSION,
+            'source_hash': content_hash,
+            'fingerprint': stat_fingerprint(loader.base, files),
+            'sections': sections,
+        })
+        header_offset = f.tell()
+        f.write(header)
+        f.seek(len(IMAGE_MAGIC))
+        # the header lives at the end; the slot after the magic records where
+        f.write(_COUNT.pack(header_offset))
+    os.replace(tmp_path, path)
+    return content_hash
+
+
+class SharedMap(Mapping):
+    """Read-only mapping over a map section of the image; iterates in the original insertion order."""
+
+    def __init__(self, buf: mmap.mmap, offset: int, cache_size: int = 1024):
+        self._buf = buf
+        (self._n,) = _COUNT.unpack_from(buf, offset)
+        self._order_at = offset + _COUNT.size
+        self._table_at = self._order_at + self._n * _ORDER.size
+        self._get = lru_cache(maxsize=cache_size)(self._load)
+
+    def _entry(self, pos: int) -> Tuple[int, int, int, int]:
+        return _MAP_ENTRY.unpack_from(self._buf, self._table_at + pos * _MAP_ENTRY.size)
+
+    def _key(self, pos: int) -> bytes:
+        key_off, key_len, _, _ = self._entry(pos)
+        return self._buf[key_off:key_off + key_len]
+
+    def _find(self, key: bytes) -> int:
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and self._key(lo) == key:
+            return lo
+        return -1
+
+    def _load(self, key: str) -> Any:
+        pos = self._find(key.encode('utf-8'))
+        if pos < 0:
+            raise KeyError(key)
+        _, _, val_off, val_len = self._entry(pos)
+        return pickle.loads(self._buf[val_off:val_off + val_len])
+
+    def __getitem__(self, key: str) -> Any:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        return self._get(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key.encode('utf-8')) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._n):
+            (pos,) = _ORDER.unpack_from(self._buf, self._order_at + i * _ORDER.size)
+            yield self._key(pos).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self._n
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-worker cache stats, in the same shape as LazyNodeStore.get_stats."""
+        info = self._get.cache_info()
+        total = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'total_requests': total,
+            'hit_rate': f"{(info.hits / total * 100) if total else 0:.1f}%",
+            'cached_items': info.currsize,
+            'capacity': info.maxsize,
+        }
+
+
+class SharedList(Sequence):
+    """Read-only sequence over a list section of the image."""
+
+    def __init__(self, buf: mmap.mmap, offset: int):
+        self._buf = buf
+        (self._n,) = _COUNT.unpack_from(buf, offset)
+        self._table_at = offset + _COUNT.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError(index)
+        val_off, val_len = _LIST_ENTRY.unpack_from(self._buf, self._table_at + index * _LIST_ENTRY.size)
+        return pickle.loads(self._buf[val_off:val_off + val_len])
+
+    def __len__(self) -> int:
+        return self._n
+
+
+def attach_image(path: str, base: str, files: List[str], cache_size: int = 1024) -> Optional[Dict[str, Any]]:
+    """Map the image read-only and return the loader attributes, or None if missing or stale."""
+    try:
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    if buf[:len(IMAGE_MAGIC)] != IMAGE_MAGIC:
+        return None
+    (header_offset,) = _COUNT.unpack_from(buf, len(IMAGE_MAGIC))
+    header = pickle.loads(buf[header_offset:])
+    if header.get('format') != IMAGE_FORMAT_VERSION:
+        return None
+    if header.get('fingerprint') != stat_fingerprint(base, files) and \
+            header.get('source_hash') != source_hash(base, files):
+        return None
+
+    state: Dict[str, Any] = {}
+    for name, (kind, offset, length) in header['sections'].items():
+        if kind == 'map':
+            state[name] = SharedMap(buf, offset, cache_size if name == 'nodes' else cache_size * 4)
+        elif kind == 'list':
+            state[name] = SharedList(buf, offset)
+        else:
+            state.update(pickle.loads(buf[offset:offset + length]))
+    return state
+
+
+def attach_or_build(path: str, base: str, files: List[str], data_version: Optional[str],
+                    cache_size: int = 1024) -> Dict[str, Any]:
+    """Attach to a current image, compiling it first if needed.
+
+    The image is compiled in a child process so the worker that builds it does
+    not keep a full parsed copy of the dataset; a file lock makes concurrently
+    starting workers wait for one build instead of each running their own.
+    """
+    state = attach_image(path, base, files, cache_size)
+    if state is not None:
+        return state
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            state = attach_image(path, base, files, cache_size)
+            if state is None:
+                print(f"Compiling shared dataset image {path}")
+                script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset_snapshot.py')
+                # always pass the version: the builder would otherwise default to the active
+                # one and hash other files than `files`
+                command = [sys.executable, script, '--base', base, '--shared', path,
+                           '--data-version', data_version or '']
+                subprocess.run(command, check=True)
+                state = attach_image(path, base, files, cache_size)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    if state is None:
+        raise RuntimeError(f'Shared dataset image {path} could not be built')
+    return state
@@ -0,0 +1,113 @@
+"""
+Singleflight
+============
+
+Coalesces concurrent identical calls: the first caller for a key runs the
+computation, and callers arriving with the same key while it is in flight wait
+for its result (or its exception) instead of starting their own. Nothing is
+kept once the call finishes; caching is the caller's business (llm_cache.py,
+RoutePlanner's memo).
+
+Keys are whatever identifies the answer, usually a canonical request hash
+(llm_cache.canonical_hash).
+
+    SingleFlight        for code running in threads (sync endpoints run in
+                        the server's threadpool)
+    AsyncSingleFlight   for coroutines on one event loop (async endpoints)
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Stats:
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+
+    def get_stats(self, in_flight: int) -> Dict[str, Any]:
+        coalesced = self.calls - self.executions
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'coalesced': coalesced,
+            'coalesce_rate': f"{(coalesced / self.calls * 100) if self.calls else 0:.1f}%",
+            'in_flight': in_flight,
+        }
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(_Stats):
+    """Per-key coalescing of blocking calls made from several threads."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """fn() for the first caller of key; the same result (or exception) for its concurrent duplicates."""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return super().get_stats(len(self._calls))
+
+
+class AsyncSingleFlight(_Stats):
+    """
+    Per-key coalescing of coroutines
+
+    The computation runs as its own task and every caller awaits it shielded,
+    so a caller that is cancelled (e.g. its client disconnected) leaves the
+    others waiting on the same call. Calls from different event loops are not
+    coalesced with each other.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """await fn() for the first caller of key; the same result (or exception) for its concurrent duplicates."""
+        self.calls += 1
+        slot = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(slot)
+        if task is None:
+            self.executions += 1
+            task = self._calls[slot] = asyncio.ensure_future(fn())
+
+            def forget(done: asyncio.Task) -> None:
+                if self._calls.get(slot) is done:
+                    del self._calls[slot]
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return super().get_stats(len(self._calls))
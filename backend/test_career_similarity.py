@@ -0,0 +1,71 @@
+import math
+
+from data_loader import CareerData
+from career_similarity import FEATURE_WEIGHTS, SimilarityIndex
+
+loader = CareerData()
+
+
+def _brute_force(index, career_id, metric):
+    own = index.features[index.position[career_id]]
+    scores = {}
+    for other_id, features in zip(index.career_ids, index.features):
+        if other_id == career_id:
+            continue
+        shared = set(own) & set(features)
+        w = {f: FEATURE_WEIGHTS[f[0]] for f in set(own) | set(features)}
+        if metric == 'cosine':
+            denom = math.sqrt(sum(w[f] ** 2 for f in own)) * math.sqrt(sum(w[f] ** 2 for f in features))
+            score = sum(w[f] ** 2 for f in shared) / denom if denom else 0.0
+        else:
+            union = sum(w.values())
+            score = sum(w[f] for f in shared) / union if union else 0.0
+        if score > 0:
+            scores[other_id] = score
+    return scores
+
+
+def test_top_k_matches_brute_force():
+    index = SimilarityIndex(loader, top_k=5)
+    for career_id in ('career:software_engineer', 'career:doctor', 'career:chartered_accountant'):
+        for metric in ('cosine', 'jaccard'):
+            expected = _brute_force(index, career_id, metric)
+            got = index.similar(career_id, metric)
+            assert career_id not in [cid for cid, _, _ in got]
+            assert [s for _, s, _ in got] == sorted((round(s, 4) for s in expected.values()), reverse=True)[:5]
+            for cid, score, shared in got:
+                assert math.isclose(score, expected[cid], abs_tol=1e-4) and shared
+
+
+def test_similar_endpoint_ranks_with_reasons():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    body = client.get('/career/software_engineer/similar?limit=3').json()
+    scores = [c['score'] for c in body['similar_careers']]
+    assert body['comparison_count'] == 3 and scores == sorted(scores, reverse=True)
+    assert all(c['reason'] for c in body['similar_careers'])
+    assert client.get('/career/software_engineer/similar?metric=euclid').status_code == 400
+
+
+def test_similarity_index_is_built_on_first_lookup():
+    fresh = CareerData()
+    assert fresh.similarity_index is None
+    assert fresh.similar_careers('career:doctor', limit=3)
+    assert fresh.similarity_index is not None
+
+
+def test_curated_and_computed_similar_careers_are_merged_before_the_limit(monkeypatch):
+    from chatbot_nba import NBAEngine
+
+    computed = [cid for cid, _, _ in loader.similar_careers('career:software_engineer')]
+    curated = [{'to': computed[1], 'reason': 'Curated'}, {'to': 'career:doctor', 'reason': 'Curated'}]
+    edges_from = loader.edges_from
+    monkeypatch.setattr(loader, 'edges_from', lambda node_id, edge_type=None, allowed_only=False:
+                        curated if edge_type == 'career_similar' else edges_from(node_id, edge_type, allowed_only))
+
+    body = NBAEngine(loader).get_similar_careers('software_engineer', limit=3)
+    ids = [c['id'] for c in body['similar_careers']]
+    assert ids == [computed[1], 'career:doctor', computed[0]]
+    assert body['similar_careers'][0]['reason'] == 'Curated' and 'score' in body['similar_careers'][0]
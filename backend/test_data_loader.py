@@ -0,0 +1,154 @@
+from data_loader import CareerData, normalize_edge
+
+loader = CareerData()
+
+
+def test_normalize_edge_source_target():
+    edge = normalize_edge({'source': 'career:a', 'target': 'career:b', 'type': 'career_similar'})
+    assert edge == {'from': 'career:a', 'to': 'career:b', 'type': 'career_similar'}
+
+
+def test_adjacency_matches_edge_scan():
+    for e in loader.edges:
+        assert e in loader.edges_from(e['from'], e['type'])
+        assert e in loader.edges_to(e['to'], e['type'])
+    total = sum(len(edges) for by_type in loader.adjacency.values() for edges in by_type.values())
+    assert total == len(loader.edges)
+
+
+def test_course_to_careers_uses_index():
+    expected = [e['to'] for e in loader.edges
+                if e['from'] == 'course:engineering_btech' and e['type'] == 'course_to_career']
+    assert [c['id'] for c in loader.course_to_careers('course:engineering_btech')] == \
+        [cid for cid in expected if cid in loader.nodes]
+
+
+def test_variant_inherits_stream_rules():
+    rules = loader.transition_rules
+    assert not rules.is_allowed('variant:hec', 'course:mbbs')  # r2 on stream:arts
+    assert not rules.is_allowed('variant:bipc', 'course:engineering_btech')  # r1
+    assert rules.is_allowed('variant:pcmb', 'course:mbbs')
+    assert rules.rule_for('variant:hec', 'course:mbbs')['id'] == 'r2'
+
+
+def test_allow_overrides_inherited_deny():
+    from transition_rules import TransitionRules
+    rules = TransitionRules(
+        [{'id': 'd', 'from': 'stream:s', 'disallow_to_types': ['course:x', 'course:y']},
+         {'id': 'a', 'from': 'variant:v', 'allow_to_types': ['course:x']}],
+        {'variant:v': ['stream:s'], 'stream:s': ['education:class_10']},
+    )
+    assert rules.is_allowed('variant:v', 'course:x')
+    assert not rules.is_allowed('variant:v', 'course:y')
+
+
+def test_paths_served_from_materialized_view():
+    assert loader.get_paths_for_variant('mpc') is loader.paths_by_variant['variant:mpc']
+    assert loader.get_paths_for_variant('variant:mpc') == loader._build_paths('variant:mpc')
+    assert loader.get_paths_for_variant('unknown') == {'variant': 'variant:unknown', 'paths': []}
+
+
+def test_snapshot_used_only_when_sources_match(tmp_path):
+    import json
+    import shutil
+    base = tmp_path / 'career-data'
+    shutil.copytree(loader.base, base, ignore=shutil.ignore_patterns('.build'))
+    snapshot = str(tmp_path / 'data.snapshot')
+    CareerData(str(base)).write_snapshot(snapshot)
+
+    cached = CareerData(str(base), snapshot_path=snapshot)
+    assert cached.loaded_from_snapshot
+    assert len(cached.edges) == len(loader.edges)
+    assert cached.get_paths_for_variant('mpc') == loader.get_paths_for_variant('mpc')
+
+    edges_file = base / 'mappings' / 'graph_edges.json'
+    edges = json.loads(edges_file.read_text(encoding='utf-8'))
+    edges_file.write_text(json.dumps(edges[:-1]), encoding='utf-8')
+    fresh = CareerData(str(base), snapshot_path=snapshot)
+    assert not fresh.loaded_from_snapshot
+    assert len(fresh.edges) == len(loader.edges) - 1
+
+
+def test_parallel_load_matches_serial():
+    for executor in ('thread', 'process'):
+        parallel = CareerData(loader.base, load_workers=2, load_executor=executor)
+        assert list(parallel.nodes) == list(loader.nodes)
+        assert parallel.nodes == loader.nodes and parallel.edges == loader.edges
+
+
+def test_lazy_nodes_match_eager_and_stay_bounded():
+    lazy = CareerData(loader.base, lazy=True, lazy_cache_size=4)
+    assert list(lazy.nodes) == list(loader.nodes)
+    for node_id, node in loader.nodes.items():
+        assert lazy.nodes.get(node_id) == node
+    assert lazy.nodes.get('career:missing') is None
+    assert lazy.nodes.get_stats()['cached_items'] == 4
+    assert lazy.get_paths_for_variant('bipc') == loader.get_paths_for_variant('bipc')
+
+
+def test_versioned_records_shared_with_chatbot(monkeypatch):
+    import builtins
+    from chatbot_source import AnswerSource
+    from chatbot_search import CareerSearch
+
+    assert loader.data_version == 'v1'
+    doctor = loader.get_versioned('careers', 'doctor')
+    assert doctor['career_id'] == 'doctor' and 'neet' in doctor['exams_required']
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError('chatbot lookups must not read files')
+    monkeypatch.setattr(builtins, 'open', no_disk)
+    source = AnswerSource(loader)
+    assert source.fetch_career_data('doctor') is doctor
+    assert source.get_exam_info('jee')['exam_name'] == loader.get_versioned('exams', 'jee')['display_name']
+    results = CareerSearch.comprehensive_search('Doctor (MBBS)', loader)
+    assert [c['name'] for c in results['careers']] == ['Doctor (MBBS)']
+    assert results['total_results'] == 1
+
+
+def test_shared_image_matches_eager(tmp_path):
+    image = str(tmp_path / 'data.shm')
+    shared = CareerData(loader.base, shared_image=image)
+    attached = CareerData(loader.base, shared_image=image)
+    assert list(attached.nodes) == list(loader.nodes)
+    for node_id, node in loader.nodes.items():
+        assert attached.nodes[node_id] == node
+    assert attached.nodes.get('career:missing') is None and 'career:missing' not in attached.nodes
+    assert list(attached.edges) == loader.edges
+    assert attached.edges_from('variant:mpc', allowed_only=True) == loader.edges_from('variant:mpc', allowed_only=True)
+    assert shared.get_paths_for_variant('hec') == loader.get_paths_for_variant('hec')
+
+
+def test_shared_image_without_version_uses_the_active_one(tmp_path):
+    shared = CareerData(loader.base, shared_image=str(tmp_path / 'data.shm'), data_version=None)
+    assert shared.data_version == loader.data_version
+    assert shared.versioned == loader.versioned
+
+
+def test_route_index_applies_rules_and_rebuilds_incrementally(tmp_path):
+    import json
+    import shutil
+    from route_index import RouteIndex
+
+    routes = loader.routes_to('career:doctor')
+    assert (('education:class_10', 'stream:science', 'variant:bipc', 'course:mbbs', 'career:doctor'), ()) in routes
+    assert not any(path[2] == 'variant:hec' for path, _ in routes)  # r2 blocks arts -> mbbs
+    assert (('education:class_10', 'stream:arts', 'variant:hec', 'course:ba_humanities', 'career:ias_officer'),
+            ('exam:upsc',)) in loader.routes_to('career:ias_officer')
+    # course exams reach only the careers that require them
+    assert all('exam:upsc' not in exams for _, exams in loader.routes_to('career:content_writer'))
+    assert all(not exams for _, exams in loader.routes_to('career:banker'))
+    # civil_services has no course_to_career edge; its course_ids route it
+    assert {path[3] for path, _ in loader.routes_to('career:civil_services')} == {'course:bsc'}
+
+    base = tmp_path / 'career-data'
+    shutil.copytree(loader.base, base, ignore=shutil.ignore_patterns('.build'))
+    edges_file = base / 'mappings' / 'graph_edges.json'
+    edges = json.loads(edges_file.read_text(encoding='utf-8'))
+    edges.append({'id': 'test', 'from': 'course:mbbs', 'to': 'career:pharmacist', 'type': 'course_to_career'})
+    edges_file.write_text(json.dumps(edges), encoding='utf-8')
+    changed = CareerData(str(base))
+    index = changed.build_route_index(previous=loader.route_index)
+    assert index.rebuilt < len(index.routes)
+    assert index.routes == RouteIndex(changed).routes
+    assert any(path[3] == 'course:mbbs' for path, _ in changed.routes_to('career:pharmacist'))
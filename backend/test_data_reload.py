@@ -0,0 +1,70 @@
+from data_loader import CareerData
+from chatbot_nba import NBAEngine
+from data_reload import DataReloader
+
+loader = CareerData()
+
+
+def _reloader(build):
+    state = {'loader': loader}
+
+    def swap(new_loader, new_engine):
+        state['loader'] = new_loader
+
+    return DataReloader(lambda: state['loader'], build, swap), state
+
+
+def test_reload_swaps_validated_dataset():
+    fresh = CareerData()
+    reloader, state = _reloader(lambda: (fresh, NBAEngine(fresh)))
+    status = reloader.reload_now()
+    assert state['loader'] is fresh
+    assert status['reloads'] == 1 and status['failures'] == 0
+    assert status['dataset']['nodes'] == len(fresh.nodes)
+
+
+def test_failing_after_reload_step_keeps_the_reload():
+    import pickle
+
+    fresh = CareerData()
+    state = {'loader': loader}
+
+    def write_snapshot(new_loader):
+        raise pickle.PicklingError('cannot pickle')
+
+    reloader = DataReloader(lambda: state['loader'], lambda: (fresh, NBAEngine(fresh)),
+                            lambda new_loader, new_engine: state.update(loader=new_loader),
+                            after_reload=write_snapshot)
+    status = reloader.reload_now()
+    assert state['loader'] is fresh
+    assert status['reloads'] == 1 and status['failures'] == 0 and status['last_error'] is None
+
+
+def test_failed_reload_keeps_previous_dataset(tmp_path):
+    empty = CareerData(str(tmp_path))
+    reloader, state = _reloader(lambda: (empty, NBAEngine(empty)))
+    status = reloader.reload_now()
+    assert state['loader'] is loader
+    assert status['failures'] == 1 and status['reloads'] == 0
+    assert 'no nodes loaded' in status['last_error']
+
+
+def test_admin_endpoints(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    import main
+
+    snapshot = str(tmp_path / 'career_data.snapshot')
+    monkeypatch.setattr(main, 'SNAPSHOT_PATH', snapshot)
+    client = TestClient(main.app)
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    assert client.post('/admin/data-reload').status_code == 403  # no token configured
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    assert client.post('/admin/data-reload', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+    before = main.loader
+    body = client.post('/admin/data-reload', headers={'X-Admin-Token': 'secret'}).json()
+    assert body['reloads'] >= 1 and body['last_error'] is None
+    assert main.loader is not before and main.nba_engine.loader is main.loader
+    # the reloaded data is compiled for the next start
+    assert CareerData(snapshot_path=snapshot).loaded_from_snapshot
+    assert client.get('/admin/data-status').json()['dataset']['edges'] == len(main.loader.edges)
+    assert client.get('/paths', params={'variant': 'mpc'}).status_code == 200
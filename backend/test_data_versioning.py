@@ -0,0 +1,53 @@
+import json
+import shutil
+
+from data_loader import BASE, CareerData
+from data_versioning import DataVersionRegistry
+
+
+def _with_edited_copy(tmp_path):
+    base = tmp_path / 'career-data'
+    shutil.copytree(BASE, base, ignore=shutil.ignore_patterns('.build'))
+    shutil.copytree(base / 'v1', base / 'v3')
+    doctor = base / 'v3' / 'careers' / 'doctor.json'
+    data = json.loads(doctor.read_text(encoding='utf-8'))
+    data['salary_band']['entry'] = '₹8–12 LPA'
+    doctor.write_text(json.dumps(data), encoding='utf-8')
+    return CareerData(str(base), data_version='v1')
+
+
+def test_versions_share_graph_and_unchanged_records(tmp_path):
+    primary = _with_edited_copy(tmp_path)
+    registry = DataVersionRegistry(primary, ['v1', 'v3', 'v9'])
+    assert registry.versions == ['v1', 'v3']
+    v1, v3 = registry.get('v1'), registry.get('v3')
+    assert v1 is primary and v3.nodes is v1.nodes and v3.adjacency is v1.adjacency
+    assert v3.get_versioned('careers', 'software_engineer') is v1.get_versioned('careers', 'software_engineer')
+    assert v3.get_versioned('careers', 'doctor')['salary_band']['entry'] == '₹8–12 LPA'
+    assert v1.get_versioned('careers', 'doctor')['salary_band']['entry'] != '₹8–12 LPA'
+    assert registry.status()['versions']['v3']['own_records'] == 1
+
+    assert registry.get() is v1
+    assert registry.set_active_version('v3') and registry.get() is v3
+    assert not registry.set_active_version('v9')
+
+
+def test_request_selects_version(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    question = {'question': 'Doctor (MBBS)'}
+    assert client.post('/chatbot/ask', json=question, headers={'X-Data-Version': 'v1'}).status_code == 200
+    assert client.post('/chatbot/ask?version=v2', json=question).status_code == 200
+    assert client.post('/chatbot/ask?version=v9', json=question).status_code == 404
+    assert client.get('/admin/data-versions').json()['active_version'] == main.loader.data_version
+    # graph routes serve the shared graph and do not take a version
+    assert client.get('/paths?variant=mpc&version=v9').status_code == 200
+
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    assert client.post('/admin/data-versions/active?active=v2').status_code == 403
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    admin = {'X-Admin-Token': 'secret'}
+    assert client.post('/admin/data-versions/active?active=v2', headers=admin).json()['active_version'] == 'v2'
+    client.post(f'/admin/data-versions/active?active={main.loader.data_version}', headers=admin)
@@ -0,0 +1,75 @@
+import json
+import shutil
+
+from data_loader import CareerData
+from dataset_diff import diff_datasets, main as diff_main
+
+loader = CareerData()
+
+
+def _edited_copy(tmp_path):
+    base = tmp_path / 'career-data'
+    shutil.copytree(loader.base, base, ignore=shutil.ignore_patterns('.build'))
+    old = CareerData(str(base))
+    edges_file = base / 'mappings' / 'graph_edges.json'
+    edges = json.loads(edges_file.read_text(encoding='utf-8'))
+    edges_file.write_text(json.dumps([e for e in edges if e['id'] != 'e13']), encoding='utf-8')
+    degrees_file = base / 'degree_programs.json'
+    degrees = json.loads(degrees_file.read_text(encoding='utf-8'))
+    mbbs = next(d for d in degrees['degree_programs'] if d['id'] == 'degree:mbbs')
+    mbbs['display_name'] = 'Renamed'
+    degrees_file.write_text(json.dumps(degrees), encoding='utf-8')
+    return old, CareerData(str(base)), mbbs['id']
+
+
+def test_diff_reports_changed_nodes_and_edges_at_field_level(tmp_path, capsys):
+    old, new, stream_id = _edited_copy(tmp_path)
+    changes = diff_datasets(old, new)
+    assert changes['edges']['removed'] == ['course_to_career:course:mbbs->career:doctor']
+    assert changes['nodes']['changed'][0]['id'] == stream_id
+    assert changes['nodes']['changed'][0]['fields']['display_name']['new'] == 'Renamed'
+    assert changes['summary']['nodes'] == {'added': 0, 'removed': 0, 'changed': 1}
+    assert not changes['rules_changed'] and changes['records']['changed'] == []
+
+    assert diff_datasets(new, new)['summary']['edges'] == {'added': 0, 'removed': 0, 'changed': 0}
+    assert diff_main(['v1', 'v2', '--base', loader.base]) == 0
+    assert 'records' in capsys.readouterr().out
+
+
+def test_reload_keeps_only_unaffected_cache_entries(tmp_path):
+    old, _, _ = _edited_copy(tmp_path)
+    old.build_reachability_index()
+    old.next_steps.options('degree:btech', 2)
+    old.next_steps.options('variant:bipc', 2)  # reaches career:doctor through course:mbbs
+    old.route_planner.routes('variant:mpc', 'career:civil_servant', 1, 'balanced')
+    old.route_planner.routes('education:class_10', 'career:doctor', 1, 'balanced')
+
+    new = CareerData(old.base)
+    new.build_reachability_index()
+    new.carry_over_caches(old, diff_datasets(old, new))
+    assert 'degree:btech' in new.next_steps._cache and 'variant:bipc' not in new.next_steps._cache
+    assert list(new.route_planner._memo) == [('variant:mpc', 'career:civil_servant', 1, 'balanced')]
+    (_, path), = new.route_planner.routes('education:class_10', 'career:doctor', 1, 'balanced')
+    assert 'course:mbbs' not in path
+
+
+def test_data_diff_endpoint():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    body = client.get('/admin/data-diff?from=v1&to=v2').json()
+    assert body['summary']['records']['removed'] == len(body['records']['removed']) > 0
+    assert body['summary']['nodes'] == {'added': 0, 'removed': 0, 'changed': 0}
+    assert client.get('/admin/data-diff?from=v1&to=v9').status_code == 404
+
+
+def test_lazy_reload_does_not_parse_every_node(monkeypatch):
+    import main
+
+    old, new = CareerData(lazy=True), CareerData(lazy=True)
+    parsed = old.nodes.get_stats()['misses'], new.nodes.get_stats()['misses']
+    monkeypatch.setattr(main, 'loader', old)
+    monkeypatch.setattr(main, '_build_loader', lambda: new)
+    assert main._build_dataset()[0] is new
+    assert (old.nodes.get_stats()['misses'], new.nodes.get_stats()['misses']) == parsed
@@ -0,0 +1,78 @@
+from llm_cache import LLMCache, rank_cache_key
+
+
+def test_tiers_ttl_and_eviction(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = LLMCache(path, capacity=1)
+    cache.set('a', {'ranked': [1]})
+    cache.set('b', {'ranked': [2]})  # evicts 'a' from L1
+    assert cache.get('b') == {'ranked': [2]} and cache.get('a') == {'ranked': [1]}
+    assert cache.get('missing') is None
+    stats = cache.get_stats()
+    assert (stats['l1_hits'], stats['l2_hits'], stats['misses'], stats['disk_items']) == (1, 1, 1, 2)
+
+    assert LLMCache(path).get('b') == {'ranked': [2]}  # survives a restart
+    expired = LLMCache(str(tmp_path / 'ttl.sqlite3'), ttl_seconds=0)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+
+def test_rank_key_is_canonical():
+    key = rank_cache_key('m', {'interests': ['b', 'a'], 'board': 'cbse'}, ['career:y', 'career:x'])
+    assert key == rank_cache_key('m', {'board': 'cbse', 'interests': ['a', 'b', 'a']}, ['career:x', 'career:y'])
+    assert key != rank_cache_key('m', {'interests': ['a', 'b'], 'board': 'icse'}, ['career:x', 'career:y'])
+    assert key != rank_cache_key('other', {'interests': ['a', 'b'], 'board': 'cbse'}, ['career:x', 'career:y'])
+
+
+def test_requests_sharing_a_rank_key_send_the_same_prompt():
+    import main
+
+    first = main.RankRequest(user_profile={'interests': ['biology', 'math', 'biology']},
+                             variant_ids=['bipc', 'mpc'])
+    second = main.RankRequest(user_profile={'interests': ['math', 'biology']}, variant_ids=['mpc', 'bipc'])
+    _, payload, key = main._prepare_rank(first, True)
+    _, other_payload, other_key = main._prepare_rank(second, True)
+    assert key == other_key and payload == other_payload
+
+
+def test_rank_answers_cached_across_requests_and_restarts(fake_openai, monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    import main
+
+    path = str(tmp_path / 'cache.sqlite3')
+    monkeypatch.setattr(main, 'llm_cache', LLMCache(path))
+    with TestClient(main.app) as client:  # the lifespan opens and closes the shared LLM client
+        first = client.post('/ai/rank', json={'user_profile': {'interests': ['code', 'math']},
+                                              'variant_ids': ['mpc']}).json()
+        assert first['ranked'][0]['reason'] == 'fake' and fake_openai.calls == 1
+        again = client.post('/ai/rank', json={'user_profile': {'interests': ['math', 'code']},
+                                              'variant_ids': ['mpc']}).json()
+        assert again == first and fake_openai.calls == 1
+
+        monkeypatch.setattr(main, 'llm_cache', LLMCache(path))  # a restarted worker: empty L1, same file
+        assert client.post('/ai/rank', json={'user_profile': {'interests': ['code', 'math']},
+                                             'variant_ids': ['mpc']}).json() == first
+        assert fake_openai.calls == 1
+        assert client.get('/admin/llm-status').json()['rank_cache']['l2_hits'] == 1
+
+        client.post('/ai/rank', json={'user_profile': {'interests': ['code']}, 'variant_ids': ['mpc']})
+        assert fake_openai.calls == 2
+
+
+def test_rank_survives_a_failing_cache(fake_openai, monkeypatch):
+    import sqlite3
+    from fastapi.testclient import TestClient
+    import main
+
+    class LockedCache:
+        def get(self, key):
+            raise sqlite3.OperationalError('database is locked')
+
+        def set(self, key, value):
+            raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(main, 'llm_cache', LockedCache())
+    with TestClient(main.app) as client:
+        resp = client.post('/ai/rank', json={'user_profile': {'interests': ['code']}, 'variant_ids': ['mpc']})
+    assert resp.status_code == 200 and resp.json()['ranked'][0]['reason'] == 'fake'
+    assert fake_openai.calls == 1
@@ -0,0 +1,178 @@
+import time
+import asyncio
+
+import pytest
+
+from llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+
+PAYLOAD = {'model': 'm', 'messages': [{'role': 'system', 'content': ''}, {'role': 'user', 'content': 'hi'}]}
+
+
+def prompt(text):
+    return {'model': 'm', 'messages': [{'role': 'system', 'content': ''}, {'role': 'user', 'content': text}]}
+
+
+def later(seconds=5):
+    return time.monotonic() + seconds
+
+
+def test_calls_share_pooled_connections(fake_openai):
+    async def run():
+        client = LLMClient()
+        for _ in range(5):
+            assert await client.chat(PAYLOAD, 'key', later()) == 'Rewritten by the fake model.'
+        await asyncio.gather(*(client.chat(prompt(f'hi {i}'), 'key', later()) for i in range(5)))
+        await client.aclose()
+        return client
+
+    client = asyncio.run(run())
+    assert fake_openai.calls == 10 and client.get_stats()['calls'] == 10
+    assert len(fake_openai.clients) <= 5  # the sequential calls reused one keep-alive connection
+
+
+def test_failures_raise_and_are_counted(monkeypatch):
+    monkeypatch.setenv('OPENAI_BASE_URL', 'http://127.0.0.1:9/v1')  # nothing listens on the discard port
+
+    async def run():
+        client = LLMClient()
+        with pytest.raises(Exception):
+            await client.chat({'model': 'm', 'messages': []}, 'key', later(1))
+        return client
+
+    assert asyncio.run(run()).get_stats()['failures'] == 1
+
+
+def test_chatbot_rewrites_through_shared_client(fake_openai):
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:  # runs the lifespan, which opens the shared client
+        body = client.post('/chatbot/ask', json={'question': 'Give me an overview of doctor career'}).json()
+        stats = client.get('/admin/llm-status').json()['client']
+    assert body['type'] == 'career_card' and body['answer'] == 'Rewritten by the fake model.'
+    assert fake_openai.calls == 1 and stats['open'] and stats['calls'] >= 1
+
+
+def test_client_refuses_a_second_event_loop(fake_openai):
+    client = LLMClient()
+
+    async def call_and_close():
+        answer = await client.chat(prompt('first loop'), 'key', later())
+        await client.aclose()
+        return answer
+    assert asyncio.run(call_and_close()) == 'Rewritten by the fake model.'
+    asyncio.run(client.chat(PAYLOAD, 'key', later()))  # closed clients reopen on the next loop
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.chat(prompt('again'), 'key', later()))  # still open on the previous one
+
+
+def test_deadline_raises_llm_unavailable(fake_openai):
+    fake_openai.delay = 1.0
+
+    async def run():
+        client = LLMClient()
+        start = time.monotonic()
+        with pytest.raises(LLMUnavailable):
+            await client.chat(PAYLOAD, 'key', later(0.2))
+        return client, time.monotonic() - start
+
+    client, elapsed = asyncio.run(run())
+    assert elapsed < 0.8 and client.get_stats()['timeouts'] == 1
+
+
+def test_concurrency_is_bounded_and_queue_wait_measured(fake_openai):
+    fake_openai.delay = 0.1
+
+    async def run():
+        client = LLMClient(max_concurrency=2)
+        await asyncio.gather(*(client.chat(prompt(f'hi {i}'), 'key', later()) for i in range(6)))
+        return client
+
+    queue = asyncio.run(run()).get_stats()['queue']
+    assert fake_openai.max_in_flight == 2
+    assert queue['max_wait_ms'] >= 150 and queue['waiting'] == 0 and queue['in_flight'] == 0
+
+
+def test_full_queue_and_spent_budget_leave_the_breaker_closed(fake_openai):
+    fake_openai.delay = 0.5
+
+    async def run():
+        client = LLMClient(max_concurrency=1, breaker=CircuitBreaker(failure_threshold=1))
+        slow = asyncio.ensure_future(client.chat(prompt('slow'), 'key', later()))
+        await asyncio.sleep(0.1)  # the one slot is taken
+        with pytest.raises(LLMUnavailable):
+            await client.chat(prompt('queued'), 'key', later(0.1))
+        with pytest.raises(LLMUnavailable):
+            await client.chat(prompt('late'), 'key', time.monotonic() - 1)
+        await slow
+        await client.aclose()
+        return client
+
+    stats = asyncio.run(run()).get_stats()
+    assert fake_openai.calls == 1
+    assert stats['queue']['timeouts'] == 1 and stats['expired'] == 1 and stats['timeouts'] == 0
+    assert stats['breaker']['state'] == 'closed' and stats['breaker']['consecutive_failures'] == 0
+
+
+def test_breaker_opens_after_failures_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=lambda: now[0])
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] = 11
+    assert breaker.state == 'half_open'
+    assert breaker.allow() and not breaker.allow()  # one trial call at a time
+    breaker.record_failure()
+    assert breaker.state == 'open' and breaker.get_stats()['times_opened'] == 2
+
+    now[0] = 22
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_open_breaker_skips_the_llm(fake_openai):
+    async def run():
+        client = LLMClient(breaker=CircuitBreaker(failure_threshold=1))
+        client.breaker.record_failure()
+        with pytest.raises(LLMUnavailable):
+            await client.chat(PAYLOAD, 'key', later())
+        return client
+
+    stats = asyncio.run(run()).get_stats()
+    assert fake_openai.calls == 0
+    assert stats['rejected'] == 1 and stats['fallback_rate'] == '100.0%' and stats['breaker']['state'] == 'open'
+
+
+def test_rank_falls_back_to_heuristic_when_budget_is_spent(fake_openai, monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    fake_openai.delay = 2.0
+    monkeypatch.setattr(main, 'LLM_RANK_BUDGET_SECONDS', 0.3)
+    monkeypatch.setattr(main, 'llm_cache', None)
+    monkeypatch.setattr(main, 'llm_client', LLMClient())
+
+    with TestClient(main.app) as client:
+        start = time.monotonic()
+        body = client.post('/ai/rank', json={'user_profile': {'interests': ['engineer']},
+                                             'variant_ids': ['mpc']}).json()
+        assert time.monotonic() - start < 1.5
+    assert body['ranked'] and all(r['reason'] != 'fake' for r in body['ranked'])
+    assert main.llm_client.get_stats()['timeouts'] == 1
+
+
+def test_identical_calls_in_flight_share_one_request(fake_openai):
+    fake_openai.delay = 0.1
+
+    async def run():
+        client = LLMClient()
+        answers = await asyncio.gather(*(client.chat(PAYLOAD, 'key', later()) for _ in range(10)))
+        return client, answers
+
+    client, answers = asyncio.run(run())
+    assert set(answers) == {'Rewritten by the fake model.'} and fake_openai.calls == 1
+    assert client.get_stats()['coalescing']['coalesced'] == 9
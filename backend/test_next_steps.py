@@ -0,0 +1,49 @@
+from data_loader import CareerData
+from next_steps import NextSteps
+
+loader = CareerData()
+
+
+def test_program_files_load_as_typed_edges():
+    assert loader.nodes['degree:btech']['type'] == 'degree' and 'pg:mba' in loader.nodes
+    types = {e['type'] for e in loader.edges_from('degree:btech')}
+    assert {'degree_to_career', 'pg_path', 'lateral_entry'} <= types
+    assert any(e['to'] == 'degree:btech' for e in loader.edges_from('variant:mpc'))
+    lateral = [e for e in loader.edges_from('degree:btech') if e['to'] == 'career:civil_servant']
+    assert lateral[0]['via_exam'] == 'exam:upsc'
+
+    lazy = CareerData(loader.base, lazy=True, lazy_cache_size=4)
+    assert lazy.nodes.get('degree:btech') == loader.nodes['degree:btech']
+    assert len(lazy.edges) == len(loader.edges)
+
+
+def test_options_bounded_nearest_first_and_memoised():
+    steps = NextSteps(loader)
+    one = steps.options('degree:btech', 1)
+    two = steps.options('degree:btech', 2)
+    assert all(len(path) == 1 for _, path, _ in one)
+    assert {t for t, _, _ in one} < {t for t, _, _ in two}
+    assert [len(path) for _, path, _ in two] == sorted(len(path) for _, path, _ in two)
+    assert ('career:research_engineer', ('pg:mtech', 'career:research_engineer')) in [
+        (t, path) for t, path, _ in two]
+
+    hits = steps.get_stats()['hits']
+    assert steps.options('degree:btech', 2) is two
+    assert steps.get_stats()['hits'] == hits + 1
+    assert steps.options('degree:btech', 0) == ()
+
+
+def test_next_steps_endpoint_and_reload():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    body = client.get('/next-steps?from=degree:btech&depth=2').json()
+    assert body['total_options'] == len(body['options']) > 0
+    upsc = [o for o in body['options'] if o['id'] == 'career:civil_servant'][0]
+    assert upsc['via'] == 'lateral_entry' and upsc['via_exam'] == 'exam:upsc'
+    assert client.get('/next-steps?from=degree:nope').status_code == 404
+
+    reloaded = CareerData(loader.base)
+    assert reloaded.next_steps is not loader.next_steps
+    assert reloaded.next_steps.get_stats()['cached_items'] == 0
@@ -0,0 +1,38 @@
+import json
+import pickle
+
+import pytest
+
+from data_loader import CareerData
+from node_models import Career, Node, Variant, make_node
+
+loader = CareerData()
+
+
+def test_records_keep_json_shape_and_order():
+    raw = {'id': 'software_engineer', 'display_name': 'Software Engineer',
+           'skills': ['python'], 'icon': 'laptop'}
+    node = make_node(raw, 'career:software_engineer')
+    assert isinstance(node, Career)
+    assert list(node) == ['id', 'display_name', 'skills', 'icon']
+    assert node['id'] == 'career:software_engineer' and node.get('icon') == 'laptop'
+    assert node.get('attributes', {}) == {} and 'attributes' not in node
+    assert json.dumps(node.to_dict()) == json.dumps(dict(raw, id='career:software_engineer'))
+    with pytest.raises(KeyError):
+        node['attributes']
+
+
+def test_records_are_immutable():
+    node = loader.nodes['variant:mpc']
+    assert isinstance(node, Variant)
+    with pytest.raises(TypeError):
+        node['display_name'] = 'x'
+    with pytest.raises(AttributeError):
+        node.display_name = 'x'
+
+
+def test_records_pickle_round_trip():
+    for node in loader.nodes.values():
+        clone = pickle.loads(pickle.dumps(node))
+        assert type(clone) is type(node) and list(clone) == list(node) and clone == node
+    assert isinstance(loader.nodes['education:class_10'], Node)
@@ -0,0 +1,143 @@
+import json
+import random
+
+import ranking
+from ranking import extract_candidates, heuristic_rank, rank_batch
+
+
+def reference_rank(user, candidates):
+    """The nested-loop heuristic /ai/rank used before vectorisation."""
+    interests = set((user.get('interests') or []))
+    seen = {}
+    for c in candidates:
+        seen.setdefault(c['career_id'], c)
+    ranked = []
+    for c in seen.values():
+        score = 0
+        name = (c.get('career_name') or '').lower()
+        for it in interests:
+            if it.lower() in name:
+                score += 3
+        for s in c.get('skills', []):
+            for it in interests:
+                if it.lower() in s.lower():
+                    score += 2
+        if score > 0:
+            ranked.append({'career_id': c['career_id'], 'career_name': c['career_name'], 'score': score,
+                           'reason': f"Matches your interests in {', '.join(interests)}"})
+    if not ranked:
+        for c in list(seen.values())[:5]:
+            ranked.append({'career_id': c['career_id'], 'career_name': c['career_name'], 'score': 0,
+                           'reason': "General career path available to you"})
+    ranked.sort(key=lambda x: -x['score'])
+    return {'ranked': ranked[:15]}
+
+
+WORDS = ['Data', 'data', 'SCIENCE', 'art', 'Medicine', 'law', 'Ärzt', 'code', '']
+
+
+def random_candidates(rng):
+    return [{'career_id': f'career:c{rng.randrange(40)}',
+             'career_name': rng.choice([None, ' '.join(rng.sample(WORDS, 2))]),
+             'skills': [''.join(rng.sample(WORDS, 2)) for _ in range(rng.randrange(4))]}
+            for _ in range(rng.randrange(60))]
+
+
+def random_user(rng):
+    return {'interests': rng.sample(WORDS + ['nothing', 'ÄRZT'], rng.randrange(5))}
+
+
+def test_vectorised_scores_match_nested_loops():
+    rng = random.Random(3)
+    for _ in range(50):
+        candidates = random_candidates(rng)
+        user = random_user(rng)
+        assert heuristic_rank(user, candidates) == reference_rank(user, candidates)
+
+
+def test_batch_matches_one_profile_at_a_time(monkeypatch):
+    rng = random.Random(5)
+    for _ in range(10):
+        candidates = random_candidates(rng)
+        profiles = [random_user(rng) for _ in range(rng.randrange(1, 30))]
+        expected = [heuristic_rank(p, candidates) for p in profiles]
+        assert list(rank_batch(profiles, candidates)) == expected
+    monkeypatch.setattr(ranking, 'BATCH_CELLS', 1)  # one profile per pass
+    assert list(rank_batch(profiles, candidates)) == expected
+    with ranking.batch_pool(2) as pool:
+        # two batches on one pool, each with its own candidates
+        other = random_candidates(rng)
+        assert list(rank_batch(profiles, candidates, pool)) == expected
+        assert list(rank_batch(profiles, other, pool)) == [heuristic_rank(p, other) for p in profiles]
+
+
+def test_rank_endpoint_uses_heuristic_without_api_key(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    client = TestClient(main.app)
+    paths = client.get('/paths?variant=mpc').json()['paths']
+    user = {'interests': ['engineer', 'software']}
+    body = client.post('/ai/rank', json={'user_profile': user, 'valid_paths': paths}).json()
+    assert body == reference_rank(user, extract_candidates(paths))
+    assert body['ranked'] and body['ranked'][0]['score'] >= body['ranked'][-1]['score'] > 0
+
+
+def test_rank_resolves_candidates_from_ids(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    from ranking import resolve_paths
+
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    client = TestClient(main.app)
+    user = {'interests': ['doctor', 'medical']}
+    paths = client.get('/paths?variant=bipc').json()['paths']
+    by_paths = client.post('/ai/rank', json={'user_profile': user, 'valid_paths': paths}).json()
+    assert client.post('/ai/rank', json={'user_profile': user, 'variant_ids': ['bipc']}).json() == by_paths
+
+    resolved, unknown = resolve_paths(main.loader, course_ids=['mbbs'], career_ids=['career:doctor', 'nope'])
+    assert unknown == ['nope']
+    assert resolved[0]['course']['id'] == 'course:mbbs'
+    assert any(p['course'].get('id') == 'course:mbbs' and p['careers'][0]['id'] == 'career:doctor'
+               for p in resolved[1:])
+    body = client.post('/ai/rank', json={'user_profile': user, 'career_ids': ['doctor']}).json()
+    assert body['ranked'][0]['career_id'] == 'career:doctor'
+    assert client.post('/ai/rank', json={'user_profile': user, 'variant_ids': ['nope']}).status_code == 404
+
+
+def test_batch_endpoint_streams_one_line_per_profile(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    client = TestClient(main.app)
+    profiles = [{'id': 's1', 'interests': ['doctor']}, {'interests': ['pharma', 'lab']}, {'interests': []}]
+    resp = client.post('/ai/rank/batch', json={'profiles': profiles, 'variant_ids': ['bipc']})
+    assert resp.headers['content-type'].startswith('application/x-ndjson')
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line['index'] for line in lines] == [0, 1, 2] and lines[0]['id'] == 's1' and 'id' not in lines[1]
+    for profile, line in zip(profiles, lines):
+        single = client.post('/ai/rank', json={'user_profile': profile, 'variant_ids': ['bipc']}).json()
+        assert line['ranked'] == single['ranked']
+
+    assert client.post('/ai/rank/batch', json={'profiles': profiles, 'variant_ids': ['nope']}).status_code == 404
+    monkeypatch.setattr(main, 'BATCH_RANK_MAX_PROFILES', 2)
+    assert client.post('/ai/rank/batch', json={'profiles': profiles, 'variant_ids': ['bipc']}).status_code == 413
+
+
+def test_batch_endpoint_turns_away_batches_beyond_the_cap(monkeypatch):
+    import threading
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setattr(main, 'batch_slots', threading.BoundedSemaphore(1))
+    client = TestClient(main.app)
+    body = {'profiles': [{'interests': ['doctor']}], 'variant_ids': ['bipc']}
+    main.batch_slots.acquire()  # a batch in progress
+    resp = client.post('/ai/rank/batch', json=body)
+    assert resp.status_code == 429 and resp.headers['retry-after'] == '1'
+    main.batch_slots.release()
+    for _ in range(3):  # each finished batch frees its slot
+        assert client.post('/ai/rank/batch', json=body).status_code == 200
+    assert main.batch_slots.acquire(blocking=False)
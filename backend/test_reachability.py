@@ -0,0 +1,60 @@
+from data_loader import CareerData
+from reachability import ReachabilityIndex
+
+loader = CareerData()
+
+
+def _bfs(start, forward=True):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        if forward:
+            nxt = [e['to'] for e in loader.edges_from(node, allowed_only=True)]
+        else:
+            nxt = [e['from'] for e in loader.edges_to(node) if loader._is_transition_allowed(e['from'], node)]
+        for n in nxt:
+            if n not in seen:
+                seen.add(n)
+                stack.append(n)
+    return seen
+
+
+def test_bitsets_match_bfs_with_rules():
+    index = ReachabilityIndex(loader)
+    for node_id in index.ids:
+        assert set(index.decode(index.query(reachable_from=[node_id]))) == _bfs(node_id)
+        assert set(index.decode(index.query(can_reach=[node_id]))) == _bfs(node_id, forward=False)
+    assert 'variant:hec' not in index.decode(index.query(can_reach=['course:mbbs']))  # r2 blocks arts -> mbbs
+
+
+def test_and_or_queries():
+    index = ReachabilityIndex(loader)
+    both = set(index.decode(index.query(['variant:mpc', 'variant:pcmb'], kind='career')))
+    either = set(index.decode(index.query(['variant:mpc', 'variant:pcmb'], mode='any', kind='career')))
+    mpc = {n for n in _bfs('variant:mpc') if n.startswith('career:')}
+    pcmb = {n for n in _bfs('variant:pcmb') if n.startswith('career:')}
+    assert both == mpc & pcmb and either == mpc | pcmb
+    assert sorted(index.decode(index.query(can_reach=['career:doctor'], kind='variant'))) == [
+        'variant:bipc', 'variant:pcmb']
+
+
+def test_loader_rejects_unknown_ids():
+    import pytest
+
+    assert 'career:doctor' in loader.reachable(['variant:bipc'], kind='career')
+    with pytest.raises(ValueError, match='career:nope'):
+        loader.reachable(['variant:bipc'], ['career:nope'])
+
+
+def test_reachability_batch_endpoint():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    body = client.post('/graph/reachability', json={'queries': [
+        {'can_reach': ['career:doctor'], 'kind': 'variant'},
+        {'reachable_from': ['variant:mpc'], 'can_reach': ['career:software_engineer'], 'kind': 'course'},
+    ]}).json()
+    assert sorted(body['results'][0]['nodes']) == ['variant:bipc', 'variant:pcmb']
+    assert body['results'][1]['nodes'] == ['course:engineering_btech']
+    assert client.post('/graph/reachability', json={'queries': [{'can_reach': ['career:nope']}]}).status_code == 404
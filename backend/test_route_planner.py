@@ -0,0 +1,39 @@
+from data_loader import CareerData
+from route_planner import RoutePlanner
+
+loader = CareerData()
+
+
+def test_k_shortest_routes_sorted_memoised_and_rule_filtered():
+    planner = RoutePlanner(loader)
+    routes = planner.routes('education:class_10', 'career:doctor', 5, 'balanced')
+    costs = [cost for cost, _ in routes]
+    assert costs == sorted(costs) and len(routes) <= 5
+    assert len({path for _, path in routes}) == len(routes)
+    assert all(path[0] == 'education:class_10' and path[-1] == 'career:doctor' for _, path in routes)
+    assert not any('variant:hec' in path for _, path in routes)  # r2 blocks arts -> mbbs
+    assert len(planner.routes('education:class_10', 'career:doctor', 1, 'balanced')) == 1
+
+    planner.routes('education:class_10', 'career:doctor', 5, 'balanced')
+    assert planner.get_stats()['hits'] == 1
+
+
+def test_lateral_transitions_join_the_graph():
+    planner = RoutePlanner(loader)
+    routes = planner.routes('variant:mpc', 'career:civil_servant', 3, 'balanced')
+    assert routes and all(path[-1] == 'career:civil_servant' for _, path in routes)
+    hops = [planner.describe(path, 'balanced') for _, path in routes]
+    lateral = [h for route in hops for h in route if h['type'] == 'lateral_entry']
+    assert lateral and lateral[0]['from'] == 'degree:btech' and lateral[0]['exams'] == 1
+
+
+def test_route_endpoint():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    body = client.get('/route?from=education:class_10&to=career:doctor&k=2&profile=fastest').json()
+    assert body['total_routes'] == 2 and body['routes'][0]['cost'] <= body['routes'][1]['cost']
+    assert body['routes'][0]['steps'][-1]['id'] == 'career:doctor'
+    assert client.get('/route?from=education:class_10&to=career:doctor&profile=cheapest').status_code == 400
+    assert client.get('/route?from=career:nope&to=career:doctor').status_code == 404
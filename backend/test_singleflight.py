@@ -0,0 +1,83 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_threads_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+    release = threading.Event()
+
+    def compute():
+        runs.append(1)
+        release.wait(5)
+        return {'answer': 42}
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, 'k', compute) for _ in range(8)]
+        while flight.get_stats()['calls'] < 8:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(runs) == 1 and all(r is results[0] for r in results)
+    stats = flight.get_stats()
+    assert stats['executions'] == 1 and stats['coalesced'] == 7 and stats['in_flight'] == 0
+    assert flight.do('k', lambda: 'fresh') == 'fresh'  # nothing is kept after the call
+
+
+def test_thread_errors_reach_every_caller():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('upstream down')
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(flight.do, 'k', fail)
+        started.wait(5)
+        others = [pool.submit(flight.do, 'k', fail) for _ in range(3)]
+        for future in [first] + others:
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.get_stats()['executions'] == 1
+
+
+def test_async_duplicates_await_the_first_call_and_keys_stay_apart():
+    flight = AsyncSingleFlight()
+    runs = []
+
+    async def compute(key):
+        runs.append(key)
+        await asyncio.sleep(0.05)
+        return key.upper()
+
+    async def run():
+        return await asyncio.gather(*(flight.do(key, lambda key=key: compute(key)) for key in ['a'] * 5 + ['b'] * 5))
+
+    assert asyncio.run(run()) == ['A'] * 5 + ['B'] * 5
+    assert sorted(runs) == ['a', 'b'] and flight.get_stats()['coalesced'] == 8
+
+
+def test_cancelled_caller_leaves_the_shared_call_running():
+    flight = AsyncSingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    async def run():
+        first = asyncio.ensure_future(flight.do('k', compute))
+        second = asyncio.ensure_future(flight.do('k', compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ('done', True)
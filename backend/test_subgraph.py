@@ -0,0 +1,55 @@
+import json
+
+from data_loader import CareerData
+from subgraph import bfs, iter_subgraph_json
+
+loader = CareerData()
+
+
+def test_subgraph_filters_types_and_fields():
+    body = json.loads(''.join(iter_subgraph_json(loader, 'variant:mpc', 2, {'course', 'career'},
+                                                 ['display_name'])))
+    assert body['root'] == 'variant:mpc' and body['nodes']
+    assert all(n.split(':')[0] in ('course', 'career') for n in body['nodes'])
+    # program files also name careers the catalogue does not define; those have nothing to project
+    assert all(set(node) == {'id', 'display_name'} for node_id, node in body['nodes'].items()
+               if node_id in loader.nodes)
+    assert 'career:software_engineer' in body['nodes']
+    assert all(e['from'] in body['nodes'] and e['to'] in body['nodes'] for e in body['edges'])
+
+    order, _ = bfs(loader, 'variant:mpc', 1)
+    assert 'career:software_engineer' not in order  # two hops away
+
+
+def test_subgraph_endpoint_matches_graph():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    full = client.get('/graph').json()
+    sub = client.get('/graph/subgraph?root=education:class_10&depth=10&fields=*').json()
+    assert sub['nodes']['career:doctor'] == full['nodes']['career:doctor']
+    assert len(sub['edges']) == len({(e['from'], e['to'], e['type']) for e in full['edges']
+                                     if e['from'] in sub['nodes'] and e['to'] in sub['nodes']})
+    assert client.get('/graph/subgraph?root=career:nope').status_code == 404
+
+
+def test_chart_query_matches_graph_chart():
+    """VisualChart's root=* request draws the same nodes and edges it drew from /graph."""
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    chart_types = {'education_level', 'stream', 'stream_variant', 'course', 'career'}
+    full = client.get('/graph').json()
+    sub = client.get('/graph/subgraph?root=*&types=' + ','.join(sorted(chart_types))
+                     + '&fields=id,type,display_name').json()
+    drawn = {node_id for node_id, node in full['nodes'].items() if node.get('type') in chart_types}
+    assert {'career:civil_services', 'course:llb', 'course:mba'} <= drawn <= set(sub['nodes'])
+    # the rest are career files saved without a 'type', typed by their id prefix here
+    assert all(node['type'] == 'career' and not full['nodes'][node_id].get('type')
+               for node_id, node in sub['nodes'].items() if node_id not in drawn)
+
+    def edge_set(edges):
+        return {(e['from'], e['to'], e['type']) for e in edges if e['from'] in drawn and e['to'] in drawn}
+    assert edge_set(sub['edges']) == edge_set(full['edges'])
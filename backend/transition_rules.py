@@ -0,0 +1,91 @@
+"""
+Transition Rule Engine
+Compiles rules/transition_rules.json into per-node allow/deny sets
+"""
+
+from typing import Dict, List, Any, Optional, Set, FrozenSet, Tuple
+
+# Edge types that define the education -> stream -> variant hierarchy, child side first
+HIERARCHY_EDGE_TYPES = ('stream_to_variant', 'education_to_stream')
+
+
+class TransitionRules:
+    """
+    Compiled transition rules
+
+    Each rule with `allow_to_types` / `disallow_to_types` is folded into the
+    allow/deny sets of its `from` node. A node inherits the decisions of its
+    parents (variant -> stream -> education); a decision made closer to the
+    node wins, and when parents disagree the deny wins. After compilation a
+    check is a single set lookup.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], parents: Dict[str, List[str]]):
+        self.parents = parents
+        self._own: Dict[str, Dict[str, Tuple[bool, Dict[str, Any]]]] = {}
+        for r in rules:
+            from_id = r.get('from')
+            if not from_id:
+                continue
+            decisions = self._own.setdefault(from_id, {})
+            for to_id in r.get('allow_to_types', []):
+                # a deny on the same node takes precedence over an allow
+                if to_id not in decisions:
+                    decisions[to_id] = (True, r)
+            for to_id in r.get('disallow_to_types', []):
+                decisions[to_id] = (False, r)
+
+        self._resolved: Dict[str, Dict[str, Tuple[bool, Dict[str, Any]]]] = {}
+        self.allowed: Dict[str, FrozenSet[str]] = {}
+        self.denied: Dict[str, FrozenSet[str]] = {}
+        for node_id in set(self._own) | set(parents):
+            self._resolve(node_id, set())
+        for node_id, decisions in self._resolved.items():
+            self.allowed[node_id] = frozenset(t for t, (ok, _) in decisions.items() if ok)
+            self.denied[node_id] = frozenset(t for t, (ok, _) in decisions.items() if not ok)
+
+    def _resolve(self, node_id: str, visiting: Set[str]) -> Dict[str, Tuple[bool, Dict[str, Any]]]:
+        if node_id in self._resolved:
+            return self._resolved[node_id]
+        if node_id in visiting:
+            return {}
+        visiting.add(node_id)
+
+        inherited: Dict[str, Tuple[bool, Dict[str, Any]]] = {}
+        for parent_id in self.parents.get(node_id, []):
+            for to_id, decision in self._resolve(parent_id, visiting).items():
+                current = inherited.get(to_id)
+                if current is None or (current[0] and not decision[0]):
+                    inherited[to_id] = decision
+        inherited.update(self._own.get(node_id, {}))
+
+        visiting.discard(node_id)
+        self._resolved[node_id] = inherited
+        return inherited
+
+    def is_allowed(self, from_id: str, to_id: str) -> bool:
+        """True unless the node (or an ancestor) disallows the target."""
+        return to_id not in self.denied.get(from_id, ())
+
+    def rule_for(self, from_id: str, to_id: str) -> Optional[Dict[str, Any]]:
+        """The rule that decides this transition, if any (for difficulty/notes)."""
+        decision = self._resolved.get(from_id, {}).get(to_id)
+        return decision[1] if decision else None
+
+
+def hierarchy_parents(reverse_adjacency: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                      nodes: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Map each stream/variant to its parents using hierarchy edges and `stream_id`."""
+    parents: Dict[str, List[str]] = {}
+    for node_id, by_type in reverse_adjacency.items():
+        for edge_type in HIERARCHY_EDGE_TYPES:
+            for e in by_type.get(edge_type, []):
+                parents.setdefault(node_id, []).append(e['from'])
+    for node_id in nodes:
+        # only variants carry stream_id; skipping the rest avoids touching lazily loaded nodes
+        if not node_id.startswith('variant:'):
+            continue
+        stream_id = nodes[node_id].get('stream_id')
+        if stream_id and stream_id not in parents.get(node_id, []):
+            parents.setdefault(node_id, []).append(stream_id)
+    return parents
@@ -1,6 +1,14 @@
 import React, {useEffect, useState, useMemo} from 'react'
 import { API_BASE } from '../utils/apiConfig'
 
+// only what the chart draws and the details card shows, not every roadmap and tip in the dataset;
+// root=* takes every node of these types, as /graph did, including ones no BFS from class 10 reaches
+const SUBGRAPH_QUERY = new URLSearchParams({
+  root: '*',
+  types: 'education_level,stream,stream_variant,course,career',
+  fields: 'id,type,display_name,short_description,subjects,attributes',
+}).toString()
+
 function groupNodesByType(nodes){
   const groups = {education:[], stream:[], stream_variant:[], course:[], career:[]}
   Object.values(nodes).forEach(n => {
@@ -23,7 +31,7 @@ export default function VisualChart({onSelect, onCareerClick}){
     setLoading(true)
     setError(null)
     console.log('VisualChart: Fetching graph from', API_BASE)
-    fetch(`${API_BASE}/graph`)
+    fetch(`${API_BASE}/graph/subgraph?${SUBGRAPH_QUERY}`)
       .then(r=>{
         console.log('Graph response:', r.ok, r.status)
         if(!r.ok) throw new Error(`HTTP ${r.status}`)
@@ -179,9 +179,9 @@ export default function Onboarding(){
     }, 300)
   }
 
-  async function fetchAllPaths(){
+  async function fetchAllVariants(){
     try {
-      console.log('Fetching paths from API_BASE:', API_BASE)
+      console.log('Fetching variants from API_BASE:', API_BASE)
 
       // 1) Get streams for class 10
       const streamsResp = await fetch(`${API_BASE}/streams?class=10`)
@@ -212,40 +212,12 @@ export default function Onboarding(){
       }))).flat()
 
       if(variants.length === 0){
-        console.error('No variants discovered; cannot fetch paths')
-        return []
-      }
-
-      // 3) Fetch paths for each discovered variant
-      const results = await Promise.all(variants.map(async v => {
-        try {
-          const url = `${API_BASE}/paths?variant=${encodeURIComponent(v)}`
-          console.log('Fetching:', url)
-          const r = await fetch(url)
-          console.log(`Response for ${v}:`, r.status, r.ok)
-          if(!r.ok) {
-            const errorText = await r.text()
-            console.error(`Error response for ${v}:`, errorText)
-            return {paths: []}
-          }
-          const data = await r.json()
-          console.log(`Paths for ${v}:`, data.paths?.length || 0)
-          return data
-        } catch(err) {
-          console.error(`Error fetching paths for variant ${v}:`, err)
-          return {paths: []}
-        }
-      }))
-      
-      // 4) Flatten paths arrays
-      const valid_paths = results.flatMap(r => r.paths || [])
-      console.log('Total valid paths collected:', valid_paths.length)
-      if(valid_paths.length > 0) {
-        console.log('Sample path:', valid_paths[0])
+        console.error('No variants discovered; cannot rank paths')
       }
-      return valid_paths
+      // /ai/rank resolves each variant's paths on the server
+      return variants
     } catch(err){
-      console.error('fetchAllPaths error:', err)
+      console.error('fetchAllVariants error:', err)
       return []
     }
   }
@@ -263,23 +235,23 @@ export default function Onboarding(){
       console.log('API_BASE:', API_BASE)
       console.log('User Profile:', userProfile)
       
-      const valid_paths = await fetchAllPaths()
-      console.log('Total paths collected:', valid_paths.length)
+      const variant_ids = await fetchAllVariants()
+      console.log('Total variants collected:', variant_ids.length)
       
-      if(!valid_paths || valid_paths.length === 0){
-        console.error('No career paths available after fetch')
+      if(!variant_ids || variant_ids.length === 0){
+        console.error('No stream variants available after fetch')
         setError('No career paths available. Please check your internet connection and try again.')
         setLoading(false)
         return
       }
       console.log('Submitting with user_profile:', userProfile)
-      console.log('And valid_paths:', valid_paths)
+      console.log('And variant_ids:', variant_ids)
       
       console.log('Calling /ai/rank endpoint...')
       const resp = await fetch(`${API_BASE}/ai/rank`, {
         method: 'POST',
         headers: { 'Content-Type':'application/json' },
-        body: JSON.stringify({ user_profile: userProfile, valid_paths })
+        body: JSON.stringify({ user_profile: userProfile, variant_ids })
       })
       
       if(!resp.ok) {
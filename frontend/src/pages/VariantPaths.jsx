@@ -100,7 +100,7 @@ export default function VariantPaths(){
     fetch(`${API_BASE}/ai/rank`, {
       method: 'POST',
       headers: {'Content-Type':'application/json'},
-      body: JSON.stringify({user_profile, valid_paths: paths.paths})
+      body: JSON.stringify({user_profile, variant_ids: [paths.variant]})
     }).then(r=>r.json()).then(data=>{
       setRanked(data.ranked || data)
     }).catch(err=>console.error(err)).finally(()=>setRanking(false))
@@ -20,7 +20,8 @@ if not "%SKIP_BACKEND%"=="1" (
 
   echo [2/4] Starting backend (FastAPI @ http://127.0.0.1:8000)
   REM Run backend in the SAME terminal (no new windows)
-  start "" /b cmd /c "cd /d %ROOT%backend && python -m uvicorn main:app --reload --host 127.0.0.1 --port 8000"
+  REM HOT_RELOAD=1 swaps in edited career-data without a restart (off by default in production)
+  start "" /b cmd /c "cd /d %ROOT%backend && set HOT_RELOAD=1&& python -m uvicorn main:app --reload --host 127.0.0.1 --port 8000"
 ) else (
   echo [1/4] SKIP_BACKEND=1 detected; skipping backend install/start.
 )